@@ -2,12 +2,17 @@
 """
 LFL 파일 구조 분석 - SMAP chunk 찾기
 """
+import sys
 import struct
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+from lfl_reader import xor_decrypt
 
 # XOR decrypt
 with open('01.LFL', 'rb') as f:
     encrypted = f.read()
-decrypted = bytes([b ^ 0xFF for b in encrypted])
+decrypted = xor_decrypt(encrypted)
 
 print("🔍 LFL 파일 구조 분석\n" + "="*60)
 print(f"파일 크기: {len(decrypted)} bytes\n")
@@ -2,11 +2,16 @@
 """
 SCUMM v3 (LOOM) SMAP 분석 - small header 포맷
 """
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+from lfl_reader import xor_decrypt
 
 # XOR decrypt
 with open('01.LFL', 'rb') as f:
     encrypted = f.read()
-decrypted = bytes([b ^ 0xFF for b in encrypted])
+decrypted = xor_decrypt(encrypted)
 
 print("🔍 SCUMM v3 SMAP 분석 (small header)\n" + "="*60)
 
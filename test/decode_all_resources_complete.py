@@ -4,132 +4,34 @@ LOOM 모든 리소스 디코딩 및 재구성
 - 이미지: 재구성된 포맷 (width, height, strip offset table, strip data)
 - 사운드/스크립트/기타: 원본 데이터 그대로
 """
+import sys
 import os
 import json
+import argparse
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+from lfl_reader import read_lfl
+from room import rebuild_room_image
+from room_cache import load_room
+from parallel import add_jobs_argument, map_rooms
+from profiling import profiled
+from manifest import write_manifest
+from store import RoomOutputs
 
-def xor_decrypt(data):
-    """XOR 0xFF 복호화"""
-    return bytearray([b ^ 0xFF for b in data])
 
-
-def extract_room_image(room_data):
-    """Room에서 배경 이미지 데이터 추출 및 재구성"""
-    if len(room_data) < 10:
-        return None
-
-    # Room 헤더 파싱
-    width = room_data[4] | (room_data[5] << 8)
-    height = room_data[6] | (room_data[7] << 8)
-
-    # SMAP = Resource 0 (리소스 테이블 첫 번째)
-    resource_table_start = 0x0A
-    smap_ptr = room_data[resource_table_start] | (room_data[resource_table_start + 1] << 8)
-
-    if smap_ptr >= len(room_data):
-        return None
-
-    # Strip offset 읽기 (16-color: SMAP+2부터)
-    strip_offsets = []
-    max_strips = min(200, (width + 7) // 8)
-
-    for i in range(max_strips):
-        offset_pos = smap_ptr + 2 + i * 2
-        if offset_pos + 1 >= len(room_data):
-            break
-
-        strip_offset = room_data[offset_pos] | (room_data[offset_pos + 1] << 8)
-
-        # 0이거나 범위 벗어나면 끝
-        if strip_offset == 0 or smap_ptr + strip_offset >= len(room_data):
-            break
-
-        # SMAP 기준 상대 주소 → 절대 주소
-        abs_offset = smap_ptr + strip_offset
-        strip_offsets.append(abs_offset)
-
-    if len(strip_offsets) == 0:
-        return None
-
-    # 새로운 이미지 데이터 재구성
-    header_size = 4  # width + height
-    new_table_size = len(strip_offsets) * 2
-    total_strip_data_size = 0
-
-    # 각 strip 크기 계산
-    strip_sizes = []
-    for i in range(len(strip_offsets)):
-        strip_start = strip_offsets[i]
-        strip_end = strip_offsets[i + 1] if i < len(strip_offsets) - 1 else len(room_data)
-        strip_size = strip_end - strip_start
-        strip_sizes.append(strip_size)
-        total_strip_data_size += strip_size
-
-    # 새 데이터 버퍼 생성
-    new_data = bytearray(header_size + new_table_size + total_strip_data_size)
-
-    # Width & height
-    new_data[0] = width & 0xFF
-    new_data[1] = (width >> 8) & 0xFF
-    new_data[2] = height & 0xFF
-    new_data[3] = (height >> 8) & 0xFF
-
-    # 새 offset table 작성 (상대 주소, headerSize 기준)
-    current_offset = header_size + new_table_size
-    for i in range(len(strip_offsets)):
-        table_pos = header_size + i * 2
-        new_data[table_pos] = current_offset & 0xFF
-        new_data[table_pos + 1] = (current_offset >> 8) & 0xFF
-        current_offset += strip_sizes[i]
-
-    # Strip 데이터 복사
-    write_pos = header_size + new_table_size
-    for i in range(len(strip_offsets)):
-        strip_start = strip_offsets[i]
-        strip_size = strip_sizes[i]
-        strip_data = room_data[strip_start:strip_start + strip_size]
-        new_data[write_pos:write_pos + strip_size] = strip_data
-        write_pos += strip_size
-
-    return bytes(new_data), width, height, len(strip_offsets)
-
-
-def extract_all_resources(room_data):
+def extract_all_resources(room_data, room):
     """Room의 모든 리소스 추출"""
     if len(room_data) < 10:
         return []
 
-    width = room_data[4] | (room_data[5] << 8)
-    height = room_data[6] | (room_data[7] << 8)
-
-    # 리소스 테이블 읽기
-    resource_table_start = 0x0A
-    resource_offsets = []
-
-    for i in range(50):  # 최대 50개 리소스
-        pos = resource_table_start + i * 2
-        if pos + 1 >= len(room_data):
-            break
-        offset = room_data[pos] | (room_data[pos + 1] << 8)
-        if offset == 0:
-            break
-        resource_offsets.append((i, offset))
-
-    # 중복 제거 (같은 offset을 가리키는 리소스들)
-    unique_offsets = {}
-    for idx, offset in resource_offsets:
-        if offset not in unique_offsets:
-            unique_offsets[offset] = []
-        unique_offsets[offset].append(idx)
-
-    sorted_offsets = sorted(unique_offsets.items())
-
+    # 리소스 범위 (Room 모델: 같은 offset은 합치고 offset 순 정렬)
     resources = []
-    for i, (offset, indices) in enumerate(sorted_offsets):
-        next_offset = sorted_offsets[i + 1][0] if i < len(sorted_offsets) - 1 else len(room_data)
-        size = next_offset - offset
-        resource_data = bytes(room_data[offset:next_offset])
+    for span in room.resources:
+        indices = span.indices
+        offset = span.offset
+        size = span.size
+        resource_data = bytes(room_data[offset:offset + size])
 
         # 리소스 타입 추정
         if indices[0] == 0:
@@ -160,106 +62,114 @@ def extract_all_resources(room_data):
             'data': resource_data
         })
 
-    return resources, width, height
+    return resources, room.width, room.height
 
 
-def process_all_rooms():
-    """모든 Room 처리"""
-    decoded_dir = Path('decoded')
-    decoded_dir.mkdir(exist_ok=True)
+DECODED_DIR = Path('decoded')
 
-    all_rooms = {}
 
-    # LFL 파일 찾기 (01-99)
-    for room_num in range(1, 100):
-        lfl_file = Path(f'{room_num:02d}.LFL')
-        if not lfl_file.exists():
-            continue
-
-        print(f'\n📂 {lfl_file.name} 처리 중...')
-
-        # XOR 복호화
-        with open(lfl_file, 'rb') as f:
-            encrypted = f.read()
-        decrypted = xor_decrypt(encrypted)
-
-        # Room 정보
-        width = decrypted[4] | (decrypted[5] << 8)
-        height = decrypted[6] | (decrypted[7] << 8)
-        print(f'   Room: {width}×{height}px')
-
-        # Room 디렉토리 생성
-        room_dir = decoded_dir / f'room_{room_num:02d}'
-        room_dir.mkdir(exist_ok=True)
-
-        # 모든 리소스 추출
-        resources, room_width, room_height = extract_all_resources(decrypted)
-        print(f'   리소스: {len(resources)}개 발견')
-
-        room_info = {
-            'room_number': room_num,
-            'width': room_width,
-            'height': room_height,
-            'resources': []
-        }
+@profiled('room', room=lambda room_num: f'{room_num:02d}')
+def process_room(room_num):
+    """Room 하나 처리 → room_info (병렬 worker에서도 호출)"""
+    lfl_file = Path(f'{room_num:02d}.LFL')
 
-        # 각 리소스 처리
-        for res in resources:
-            res_type = res['type']
-            res_subtype = res['subtype']
-
-            # 타입별 디렉토리
-            type_dir = room_dir / res_type
-            type_dir.mkdir(exist_ok=True)
-
-            # 파일명
-            if res['indices'][0] == 0:
-                # 배경 이미지 - 재구성
-                filename = 'background.bin'
-                try:
-                    reconstructed, img_width, img_height, num_strips = extract_room_image(decrypted)
-                    if reconstructed:
-                        filepath = type_dir / filename
-                        filepath.write_bytes(reconstructed)
-                        print(f'   ✅ [{res["indices"][0]}] {res_type}/{filename} - {len(reconstructed)} bytes (재구성됨: {img_width}×{img_height}, {num_strips} strips)')
-
-                        room_info['resources'].append({
-                            'id': res['indices'][0],
-                            'type': res_type,
-                            'subtype': res_subtype,
-                            'filename': filename,
-                            'path': f'room_{room_num:02d}/{res_type}/{filename}',
-                            'size': len(reconstructed),
-                            'original_size': res['size'],
-                            'width': img_width,
-                            'height': img_height,
-                            'strips': num_strips,
-                            'reconstructed': True
-                        })
-                        continue
-                except Exception as e:
-                    print(f'   ⚠️  배경 이미지 재구성 실패: {e}')
-
-            # 일반 리소스 (원본 그대로 또는 미지원 타입)
-            idx_str = '_'.join(str(idx) for idx in res['indices'])
-            filename = f'res_{idx_str:0>3s}.bin'
-
-            filepath = type_dir / filename
-            filepath.write_bytes(res['data'])
-
-            print(f'   📦 [{idx_str}] {res_type}/{filename} - {res["size"]} bytes')
-
-            room_info['resources'].append({
-                'id': res['indices'][0],
-                'indices': res['indices'],
-                'type': res_type,
-                'subtype': res_subtype,
-                'filename': filename,
-                'path': f'room_{room_num:02d}/{res_type}/{filename}',
-                'size': res['size'],
-                'reconstructed': False
-            })
+    print(f'\n📂 {lfl_file.name} 처리 중...')
+
+    # XOR 복호화 + 파싱된 Room 모델 (캐시)
+    decrypted = read_lfl(lfl_file)
+    room = load_room(lfl_file)
+
+    # Room 정보
+    width = room.width
+    height = room.height
+    print(f'   Room: {width}×{height}px')
+
+    # Room 디렉토리 생성
+    room_dir = DECODED_DIR / f'room_{room_num:02d}'
+    room_dir.mkdir(exist_ok=True)
+    outputs = RoomOutputs('decoded', f'{room_num:02d}', DECODED_DIR)
 
+    # 모든 리소스 추출
+    resources, room_width, room_height = extract_all_resources(decrypted, room)
+    print(f'   리소스: {len(resources)}개 발견')
+
+    room_info = {
+        'room_number': room_num,
+        'width': room_width,
+        'height': room_height,
+        'resources': []
+    }
+
+    # 각 리소스 처리
+    for res in resources:
+        res_type = res['type']
+        res_subtype = res['subtype']
+
+        # 타입별 디렉토리
+        type_dir = room_dir / res_type
+        type_dir.mkdir(exist_ok=True)
+
+        # 파일명
+        if res['indices'][0] == 0:
+            # 배경 이미지 - 재구성
+            filename = 'background.bin'
+            try:
+                reconstructed, img_width, img_height, num_strips = rebuild_room_image(decrypted, room)
+                if reconstructed:
+                    filepath = type_dir / filename
+                    outputs.write(filepath, reconstructed)
+                    print(f'   ✅ [{res["indices"][0]}] {res_type}/{filename} - {len(reconstructed)} bytes (재구성됨: {img_width}×{img_height}, {num_strips} strips)')
+
+                    room_info['resources'].append({
+                        'id': res['indices'][0],
+                        'type': res_type,
+                        'subtype': res_subtype,
+                        'filename': filename,
+                        'path': f'room_{room_num:02d}/{res_type}/{filename}',
+                        'size': len(reconstructed),
+                        'original_size': res['size'],
+                        'width': img_width,
+                        'height': img_height,
+                        'strips': num_strips,
+                        'reconstructed': True
+                    })
+                    continue
+            except Exception as e:
+                print(f'   ⚠️  배경 이미지 재구성 실패: {e}')
+
+        # 일반 리소스 (원본 그대로 또는 미지원 타입)
+        idx_str = '_'.join(str(idx) for idx in res['indices'])
+        filename = f'res_{idx_str:0>3s}.bin'
+
+        filepath = type_dir / filename
+        outputs.write(filepath, res['data'])
+
+        print(f'   📦 [{idx_str}] {res_type}/{filename} - {res["size"]} bytes')
+
+        room_info['resources'].append({
+            'id': res['indices'][0],
+            'indices': res['indices'],
+            'type': res_type,
+            'subtype': res_subtype,
+            'filename': filename,
+            'path': f'room_{room_num:02d}/{res_type}/{filename}',
+            'size': res['size'],
+            'reconstructed': False
+        })
+
+    outputs.save()
+    return room_info
+
+
+def process_all_rooms(jobs=1):
+    """모든 Room 처리 (jobs > 1이면 병렬, 결과는 Room 번호 순)"""
+    DECODED_DIR.mkdir(exist_ok=True)
+
+    # LFL 파일 찾기 (01-99)
+    room_nums = [room_num for room_num in range(1, 100) if Path(f'{room_num:02d}.LFL').exists()]
+
+    all_rooms = {}
+    for room_num, room_info in zip(room_nums, map_rooms(process_room, room_nums, jobs)):
         all_rooms[f'{room_num:02d}'] = room_info
 
     return all_rooms
@@ -312,16 +222,21 @@ def create_resources_json(all_rooms, output_path):
     # JSON 저장
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(resources_data, f, indent=2, ensure_ascii=False)
+    write_manifest(resources_data, output_path.with_suffix('.bin'))
 
     return resources_data
 
 
 def main():
+    parser = argparse.ArgumentParser(description='LOOM 모든 리소스 디코딩 → decoded/')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
     print('🎮 LOOM 모든 리소스 디코딩 시작')
     print('=' * 70)
 
     # 모든 Room 처리
-    all_rooms = process_all_rooms()
+    all_rooms = process_all_rooms(args.jobs)
 
     # resources.json 생성
     print('\n📊 resources.json 생성 중...')
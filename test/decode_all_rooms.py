@@ -2,10 +2,14 @@
 """
 모든 Room 디코딩
 """
+import sys
 import struct
 from PIL import Image
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+from lfl_reader import xor_decrypt
+
 EGA_PALETTE = [
     (0x00, 0x00, 0x00), (0x00, 0x00, 0xAA), (0x00, 0xAA, 0x00), (0x00, 0xAA, 0xAA),
     (0xAA, 0x00, 0x00), (0xAA, 0x00, 0xAA), (0xAA, 0x55, 0x00), (0xAA, 0xAA, 0xAA),
@@ -67,7 +71,7 @@ def decode_room(lfl_file, output_png):
     """Room 디코딩"""
     with open(lfl_file, 'rb') as f:
         encrypted = f.read()
-    decrypted = bytes([b ^ 0xFF for b in encrypted])
+    decrypted = xor_decrypt(encrypted)
 
     # Room dimensions
     room_width = decrypted[4] | (decrypted[5] << 8)
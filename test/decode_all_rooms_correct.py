@@ -2,74 +2,20 @@
 """
 모든 Room 올바른 디코딩 - SMAP 방식
 """
+import sys
 from PIL import Image
 from pathlib import Path
 
-EGA_PALETTE = [
-    (0x00, 0x00, 0x00), (0x00, 0x00, 0xAA), (0x00, 0xAA, 0x00), (0x00, 0xAA, 0xAA),
-    (0xAA, 0x00, 0x00), (0xAA, 0x00, 0xAA), (0xAA, 0x55, 0x00), (0xAA, 0xAA, 0xAA),
-    (0x55, 0x55, 0x55), (0x55, 0x55, 0xFF), (0x55, 0xFF, 0x55), (0x55, 0xFF, 0xFF),
-    (0xFF, 0x55, 0x55), (0xFF, 0x55, 0xFF), (0xFF, 0xFF, 0x55), (0xFF, 0xFF, 0xFF),
-]
-
-def drawStripEGA(src, height):
-    """ScummVM drawStripEGA"""
-    pixels = [[0 for _ in range(8)] for _ in range(height)]
-    color, run, x, y, src_idx = 0, 0, 0, 0, 0
-
-    while x < 8 and src_idx < len(src):
-        color = src[src_idx]
-        src_idx += 1
-
-        if color & 0x80:
-            run = color & 0x3F
-            if color & 0x40:  # Two-color dithering
-                if src_idx >= len(src): break
-                color = src[src_idx]
-                src_idx += 1
-                if run == 0:
-                    if src_idx >= len(src): break
-                    run = src[src_idx]
-                    src_idx += 1
-                for z in range(run):
-                    if x >= 8: break
-                    if y < height:
-                        pixel_color = (color & 0xF) if (z & 1) else (color >> 4)
-                        pixels[y][x] = pixel_color
-                    y += 1
-                    if y >= height: y, x = 0, x + 1
-            else:  # Repeat previous
-                if run == 0:
-                    if src_idx >= len(src): break
-                    run = src[src_idx]
-                    src_idx += 1
-                for z in range(run):
-                    if x >= 8: break
-                    if y < height:
-                        pixels[y][x] = pixels[y][x - 1] if x > 0 else 0
-                    y += 1
-                    if y >= height: y, x = 0, x + 1
-        else:  # Single color
-            run = color >> 4
-            if run == 0:
-                if src_idx >= len(src): break
-                run = src[src_idx]
-                src_idx += 1
-            pixel_color = color & 0xF
-            for z in range(run):
-                if x >= 8: break
-                if y < height:
-                    pixels[y][x] = pixel_color
-                y += 1
-                if y >= height: y, x = 0, x + 1
-
-    return pixels
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+from lfl_reader import xor_decrypt
+from ega import render_strips
+from png_writer import save_indexed_png
 
 def decode_room(lfl_file, output_png):
     """Room 디코딩"""
     with open(lfl_file, 'rb') as f:
         encrypted = f.read()
-    decrypted = bytes([b ^ 0xFF for b in encrypted])
+    decrypted = xor_decrypt(encrypted)
 
     # Room dimensions
     width = decrypted[4] | (decrypted[5] << 8)
@@ -101,38 +47,16 @@ def decode_room(lfl_file, output_png):
     print(f"{lfl_file}:")
     print(f"  크기: {width}×{height}, SMAP: 0x{smap_ptr:04X}, Strips: {num_strips}")
 
-    # Decode strips
-    full_pixels = [[0 for _ in range(width)] for _ in range(height)]
-
-    for strip_idx in range(min(num_strips, width // 8)):
-        strip_offset = strip_offsets[strip_idx]
-        next_offset = strip_offsets[strip_idx + 1] if strip_idx < num_strips - 1 else len(decrypted)
-        strip_data = decrypted[strip_offset:next_offset]
-
-        strip_pixels = drawStripEGA(strip_data, height)
-
-        if strip_pixels:
-            strip_x = strip_idx * 8
-            for y in range(height):
-                for x in range(8):
-                    pixel_x = strip_x + x
-                    if pixel_x < width and y < len(strip_pixels):
-                        full_pixels[y][pixel_x] = strip_pixels[y][x]
+    # 모든 strip을 하나의 프레임 버퍼에 디코딩
+    frame = render_strips(decrypted, strip_offsets, width, height)
 
     # Count non-zero pixels
-    non_zero = sum(1 for y in range(height) for x in range(width) if full_pixels[y][x] != 0)
+    non_zero = frame.count_nonzero()
     pct = non_zero * 100 / (width * height)
     print(f"  Non-zero: {non_zero}/{width * height} ({pct:.2f}%)")
 
     # Save PNG
-    img = Image.new('RGB', (width, height))
-    for y in range(height):
-        for x in range(width):
-            color_idx = full_pixels[y][x]
-            rgb = EGA_PALETTE[color_idx]
-            img.putpixel((x, y), rgb)
-
-    img.save(output_png)
+    img = save_indexed_png(frame.buf, width, height, output_png)
     
     # 4x upscale
     upscaled = img.resize((width * 4, height * 4), Image.NEAREST)
@@ -2,8 +2,13 @@
 """
 전체 Room 이미지 디코딩 (Y offset 버전)
 """
+import sys
 import struct
 from PIL import Image
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+from lfl_reader import xor_decrypt
 
 EGA_PALETTE = [
     (0x00, 0x00, 0x00),  # 0: Black
@@ -117,7 +122,7 @@ def decodeStripWithOffset(src, height):
 # Read and decrypt LFL
 with open('01.LFL', 'rb') as f:
     encrypted = f.read()
-decrypted = bytes([b ^ 0xFF for b in encrypted])
+decrypted = xor_decrypt(encrypted)
 
 # Room dimensions
 width = decrypted[4] | (decrypted[5] << 8)
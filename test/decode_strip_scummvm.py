@@ -2,9 +2,13 @@
 """
 ScummVM drawStripEGA() 함수 정확한 포팅
 """
+import sys
 from pathlib import Path
 from PIL import Image
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+from lfl_reader import xor_decrypt
+
 EGA_PALETTE = [
     (0x00, 0x00, 0x00),  # 0: Black
     (0x00, 0x00, 0xAA),  # 1: Blue
@@ -139,7 +143,7 @@ def drawStripEGA(src, height):
 
 # Read LFL
 data = Path('01.LFL').read_bytes()
-decrypted = bytes([b ^ 0xFF for b in data])
+decrypted = xor_decrypt(data)
 
 # Get first strip
 strip_offset = 0x438b
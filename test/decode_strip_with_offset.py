@@ -5,9 +5,13 @@
 - Byte[4]: Y offset 또는 skip count
 - Byte[5-]: 실제 RLE 데이터
 """
+import sys
 from pathlib import Path
 from PIL import Image
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+from lfl_reader import xor_decrypt
+
 EGA_PALETTE = [
     (0x00, 0x00, 0x00),  # 0: Black
     (0x00, 0x00, 0xAA),  # 1: Blue
@@ -143,7 +147,7 @@ def drawStripWithOffset(src, height):
 
 # Read LFL
 data = Path('01.LFL').read_bytes()
-decrypted = bytes([b ^ 0xFF for b in data])
+decrypted = xor_decrypt(data)
 
 # Test first 3 strips
 strip_offsets = [0x438b, 0x439e, 0x43b1]
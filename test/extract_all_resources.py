@@ -2,8 +2,14 @@
 """
 LFL 모든 리소스 추출
 """
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+from lfl_reader import xor_decrypt
+from room import parse_room
+
+
 def analyze_resource(data, offset, next_offset, idx):
     """리소스 분석"""
     size = next_offset - offset
@@ -48,27 +54,19 @@ def extract_resources(lfl_file):
     # XOR decrypt
     with open(lfl_file, 'rb') as f:
         encrypted = f.read()
-    decrypted = bytes([b ^ 0xFF for b in encrypted])
+    decrypted = xor_decrypt(encrypted)
 
     print(f"🎮 {lfl_file} 리소스 분석")
     print(f"  파일 크기: {len(decrypted)} bytes")
 
-    # Room info
-    width = decrypted[4] | (decrypted[5] << 8)
-    height = decrypted[6] | (decrypted[7] << 8)
+    # Room info (공용 Room 파서)
+    room = parse_room(decrypted)
+    width = room.width
+    height = room.height
     print(f"  Room 크기: {width}×{height}")
 
-    # Resource table
-    resourceTableStart = 0x0A
-    resourceOffsets = []
-    for i in range(20):
-        pos = resourceTableStart + i * 2
-        if pos + 1 >= len(decrypted):
-            break
-        offset = decrypted[pos] | (decrypted[pos + 1] << 8)
-        if offset == 0:
-            break
-        resourceOffsets.append(offset)
+    # Resource table (앞 20개)
+    resourceOffsets = list(room.resource_offsets[:20])
 
     print(f"  리소스 개수: {len(resourceOffsets)}")
 
@@ -2,52 +2,42 @@
 """
 LFL 모든 리소스 추출 (수정)
 """
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+from lfl_reader import xor_decrypt
+from room import group_resource_spans, parse_room
+
+
 def extract_resources(lfl_file):
     """모든 리소스 추출"""
     # XOR decrypt
     with open(lfl_file, 'rb') as f:
         encrypted = f.read()
-    decrypted = bytes([b ^ 0xFF for b in encrypted])
+    decrypted = xor_decrypt(encrypted)
 
     print(f"🎮 {lfl_file}")
     print(f"  크기: {len(decrypted)} bytes")
 
-    # Room info
-    width = decrypted[4] | (decrypted[5] << 8)
-    height = decrypted[6] | (decrypted[7] << 8)
+    # Room info (공용 Room 파서)
+    room = parse_room(decrypted)
+    width = room.width
+    height = room.height
     print(f"  Room: {width}×{height}\n")
 
-    # Resource table
-    resourceTableStart = 0x0A
-    resourceOffsets = []
-    for i in range(20):
-        pos = resourceTableStart + i * 2
-        if pos + 1 >= len(decrypted):
-            break
-        offset = decrypted[pos] | (decrypted[pos + 1] << 8)
-        if offset == 0:
-            break
-        resourceOffsets.append((i, offset))
-
-    # 중복 제거 및 정렬
-    unique_offsets = {}
-    for idx, offset in resourceOffsets:
-        if offset not in unique_offsets:
-            unique_offsets[offset] = []
-        unique_offsets[offset].append(idx)
-
-    sorted_offsets = sorted(unique_offsets.items())
+    # Resource table (앞 20개, 중복 제거 및 정렬)
+    spans = group_resource_spans(room.resource_offsets[:20], len(decrypted))
 
     # Analyze each unique resource
     output_dir = Path('resources') / Path(lfl_file).stem
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    for i, (offset, indices) in enumerate(sorted_offsets):
-        next_offset = sorted_offsets[i + 1][0] if i < len(sorted_offsets) - 1 else len(decrypted)
-        size = next_offset - offset
-        resource_data = decrypted[offset:next_offset]
+    for span in spans:
+        indices = span.indices
+        offset = span.offset
+        size = span.size
+        resource_data = decrypted[offset:offset + size]
 
         # 첫 20바이트
         header_hex = ' '.join(f'{b:02X}' for b in resource_data[:min(20, len(resource_data))])
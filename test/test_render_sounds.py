@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Room 하나의 사운드를 WAV로 렌더링해서 테스트 (PC 스피커 + AdLib 음악 트랙)
+저장소 루트에서 실행 (00.LFL, 70.LFL 필요)
+
+    python3 test/test_render_sounds.py [Room 번호]
+"""
+import io
+import sys
+import wave
+from array import array
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+from lfl_reader import LFLFile
+from render_sounds_wav import sound_jobs
+from resource_index import load_index
+from sound_v3 import read_sound
+from synth import SAMPLE_RATE, render_adlib, render_speaker
+
+room = int(sys.argv[1]) if len(sys.argv) > 1 else 70
+
+
+def check_wav(wav, meta):
+    """WAV 헤더/길이/무음 여부 확인 → 오류 메시지 목록"""
+    errors = []
+    with wave.open(io.BytesIO(wav)) as reader:
+        if (reader.getnchannels(), reader.getsampwidth(), reader.getframerate()) != (1, 2, SAMPLE_RATE):
+            errors.append(f'포맷 {reader.getparams()}')
+        frames = reader.getnframes()
+        pcm = array('h', reader.readframes(frames))
+    if sys.byteorder == 'big':
+        pcm.byteswap()
+    if not frames:
+        errors.append('프레임 없음')
+    if abs(frames / SAMPLE_RATE - meta['seconds']) > 0.01:
+        errors.append(f'길이 {frames / SAMPLE_RATE:.3f}초 ≠ {meta["seconds"]}초')
+    if not any(pcm):
+        errors.append('무음')
+    return errors
+
+
+jobs = sound_jobs(load_index(), 'fm', {room})
+if not jobs:
+    print(f'❌ Room {room}: 사운드 없음 (또는 LFL 없음)')
+    sys.exit(1)
+
+_, lfl_path, sounds, _ = jobs[0]
+print(f'🔊 Room {room}: 사운드 {len(sounds)}개 ({lfl_path})')
+
+failed = 0
+rendered = {'speaker': 0, 'adlib': 0}
+with LFLFile(lfl_path) as lfl:
+    for sound_id, offset in sounds:
+        chunks = read_sound(lfl, offset)
+        if chunks is None:
+            print(f'   ❌ sound {sound_id:03d}: WA 청크 없음')
+            failed += 1
+            continue
+
+        wa, ad = chunks
+        results = [('speaker', render_speaker(wa))]
+        if ad is not None:
+            results.append(('adlib', render_adlib(ad, voice='sine')))
+
+        for name, (wav, meta) in results:
+            if wav is None:
+                print(f'   ⏭️  sound {sound_id:03d} {name}: {meta["error"]}')
+                continue
+            errors = check_wav(wav, meta)
+            if errors:
+                print(f'   ❌ sound {sound_id:03d} {name}: {", ".join(errors)}')
+                failed += 1
+                continue
+            rendered[name] += 1
+            print(f'   ✅ sound {sound_id:03d} {name}: {meta["seconds"]:.2f}초')
+
+print(f'\nPC 스피커 {rendered["speaker"]}개, AdLib {rendered["adlib"]}개, 실패 {failed}개')
+if failed or not rendered['speaker']:
+    print('❌ 실패')
+    sys.exit(1)
+print('✅ 통과')
@@ -2,9 +2,13 @@
 """
 첫 번째 strip 하나만 수동 디코딩해서 테스트
 """
+import sys
 from pathlib import Path
 from PIL import Image
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+from lfl_reader import xor_decrypt
+
 EGA_PALETTE = [
     (0x00, 0x00, 0x00),  # 0: Black
     (0x00, 0x00, 0xAA),  # 1: Blue
@@ -120,7 +124,7 @@ def decode_strip_debug(data, height):
 
 # Read LFL
 data = Path('01.LFL').read_bytes()
-decrypted = bytes([b ^ 0xFF for b in data])
+decrypted = xor_decrypt(data)
 
 # Get first strip
 strip_offset = 0x438b
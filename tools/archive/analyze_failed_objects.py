@@ -2,14 +2,13 @@
 """
 실패한 오브젝트 패턴 분석
 """
+import sys
 import json
 from pathlib import Path
 from collections import Counter
 
-
-def xor_decrypt(data):
-    """XOR 0xFF 복호화"""
-    return bytearray([b ^ 0xFF for b in data])
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lfl_reader import xor_decrypt
 
 
 def analyze_failed_patterns():
@@ -5,37 +5,36 @@ LOOM 리소스 포맷 분석
 - 스크립트 간단 분석
 """
 import json
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from sound_format import scan_sound
 
-def identify_sound_format(data):
-    """사운드 포맷 식별"""
-    if len(data) < 8:
-        return 'unknown', 'Too small'
 
-    # SCUMM v5+ 포맷 확인 (블록 헤더)
-    try:
-        header = data[:4].decode('ascii', errors='ignore').strip()
-        if header in ['SPK', 'ADL', 'ROL']:
-            formats = {
-                'SPK': ('PC Speaker', 'PC Speaker beeps (MIDI-based)'),
-                'ADL': ('AdLib', 'FM synthesis (OPL2 chip, MIDI-based)'),
-                'ROL': ('Roland MT-32', 'MIDI data for external device')
-            }
-            return formats[header]
-    except:
-        pass
+# sound_format 판별 결과 → (표시 이름, 설명)
+TAG_NAMES = {
+    'SPK': ('PC Speaker', 'PC Speaker beeps (MIDI-based)'),
+    'ADL': ('AdLib', 'FM synthesis (OPL2 chip, MIDI-based)'),
+    'ROL': ('Roland MT-32', 'MIDI data for external device'),
+}
+FORMAT_NAMES = {
+    'adlib': ('AdLib (v3)', 'FM synthesis data (no header)'),
+    'pc_speaker': ('PC Speaker (v3)', 'Simple beep data (no header)'),
+    'roland': ('Roland MT-32 (v3)', 'RO event stream (no header)'),
+}
+UNKNOWN_NAME = ('Unknown', 'Cannot identify format')
 
-    # SCUMM v3 포맷 분석 (휴리스틱)
-    # 0xBD = AdLib register command
-    if 0xBD in data[:20]:
-        return 'AdLib (v3)', 'FM synthesis data (no header)'
 
-    # 반복 패턴 확인 (PC Speaker일 가능성)
-    if len(set(data[:20])) < 5:
-        return 'PC Speaker (v3)', 'Simple beep data (no header)'
+def identify_sound_format(data):
+    """사운드 포맷 식별 → (표시 이름, 설명) (tools/sound_format.py 시그니처)"""
+    if len(data) < 8:
+        return 'unknown', 'Too small'
 
-    return 'Unknown', 'Cannot identify format'
+    signature = scan_sound(data)
+    if signature.tag:
+        return TAG_NAMES[signature.tag]
+    return FORMAT_NAMES.get(signature.format, UNKNOWN_NAME)
 
 
 def analyze_script_header(data):
@@ -129,7 +128,7 @@ def analyze_all_resources():
     print(f'\n\n📜 스크립트 분석 (총 {total_scripts}개)')
     print('-' * 70)
     print('   ⚠️  SCUMM v3 바이트코드 (opcode + 파라미터)')
-    print('   해결: ScummVM descumm 도구 필요')
+    print('   해결: tools/scumm_v3.py 디코더 (disassemble_scripts.py)')
     print('   참고: SCUMM_V3_포맷_분석.md')
 
     # 권장사항
@@ -137,8 +136,7 @@ def analyze_all_resources():
     print('=' * 70)
     print('1. 🎮 게임 플레이: ScummVM 사용 (완전한 사운드 재생)')
     print('2. 🔊 사운드 추출: MIDI 변환 구현 필요 (고급)')
-    print('3. 📜 스크립트 읽기: descumm 도구 사용')
-    print('   https://github.com/scummvm/scummvm-tools')
+    print('3. 📜 스크립트 읽기: python3 tools/disassemble_scripts.py')
 
 
 if __name__ == '__main__':
@@ -2,9 +2,13 @@
 """
 실패한 오브젝트의 OBIM/OBCD 관계 확인
 """
+import sys
 import json
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lfl_reader import xor_decrypt
+
 
 def check_failed_types():
     """실패한 오브젝트가 실제로 OBIM인지 확인"""
@@ -94,9 +98,6 @@ def check_failed_types():
         '04': '04.LFL'
     }
 
-    def xor_decrypt(data):
-        return bytearray([b ^ 0xFF for b in data])
-
     text_objects = [
         ('03', 12),  # "The view from the cliff"
         ('04', 36),  # "hole"
@@ -4,95 +4,16 @@ LOOM 모든 리소스 디코딩 및 재구성 (개선 버전)
 - 이미지: 재구성된 포맷
 - 사운드/스크립트/기타: extract_resources.py의 분류 사용
 """
+import sys
 import os
 import json
 from pathlib import Path
 
-
-def xor_decrypt(data):
-    """XOR 0xFF 복호화"""
-    return bytearray([b ^ 0xFF for b in data])
-
-
-def extract_room_image(room_data):
-    """Room에서 배경 이미지 데이터 추출 및 재구성"""
-    if len(room_data) < 10:
-        return None
-
-    # Room 헤더 파싱
-    width = room_data[4] | (room_data[5] << 8)
-    height = room_data[6] | (room_data[7] << 8)
-
-    # SMAP = Resource 0 (리소스 테이블 첫 번째)
-    resource_table_start = 0x0A
-    smap_ptr = room_data[resource_table_start] | (room_data[resource_table_start + 1] << 8)
-
-    if smap_ptr >= len(room_data):
-        return None
-
-    # Strip offset 읽기 (16-color: SMAP+2부터)
-    strip_offsets = []
-    max_strips = min(200, (width + 7) // 8)
-
-    for i in range(max_strips):
-        offset_pos = smap_ptr + 2 + i * 2
-        if offset_pos + 1 >= len(room_data):
-            break
-
-        strip_offset = room_data[offset_pos] | (room_data[offset_pos + 1] << 8)
-
-        # 0이거나 범위 벗어나면 끝
-        if strip_offset == 0 or smap_ptr + strip_offset >= len(room_data):
-            break
-
-        # SMAP 기준 상대 주소 → 절대 주소
-        abs_offset = smap_ptr + strip_offset
-        strip_offsets.append(abs_offset)
-
-    if len(strip_offsets) == 0:
-        return None
-
-    # 새로운 이미지 데이터 재구성
-    header_size = 4  # width + height
-    new_table_size = len(strip_offsets) * 2
-    total_strip_data_size = 0
-
-    # 각 strip 크기 계산
-    strip_sizes = []
-    for i in range(len(strip_offsets)):
-        strip_start = strip_offsets[i]
-        strip_end = strip_offsets[i + 1] if i < len(strip_offsets) - 1 else len(room_data)
-        strip_size = strip_end - strip_start
-        strip_sizes.append(strip_size)
-        total_strip_data_size += strip_size
-
-    # 새 데이터 버퍼 생성
-    new_data = bytearray(header_size + new_table_size + total_strip_data_size)
-
-    # Width & height
-    new_data[0] = width & 0xFF
-    new_data[1] = (width >> 8) & 0xFF
-    new_data[2] = height & 0xFF
-    new_data[3] = (height >> 8) & 0xFF
-
-    # 새 offset table 작성 (상대 주소, headerSize 기준)
-    current_offset = header_size + new_table_size
-    for i in range(len(strip_offsets)):
-        table_pos = header_size + i * 2
-        new_data[table_pos] = current_offset & 0xFF
-        new_data[table_pos + 1] = (current_offset >> 8) & 0xFF
-        current_offset += strip_sizes[i]
-
-    # Strip 데이터 복사
-    write_pos = header_size + new_table_size
-    for i in range(len(strip_offsets)):
-        strip_start = strip_offsets[i]
-        strip_size = strip_sizes[i]
-        strip_data = room_data[strip_start:strip_start + strip_size]
-        new_data[write_pos:write_pos + strip_size] = strip_data
-        write_pos += strip_size
-
-    return bytes(new_data), width, height, len(strip_offsets)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lfl_reader import xor_decrypt
+from room import parse_room, rebuild_room_image
+from manifest import write_manifest
+from store import RoomOutputs, default_store
 
 
 def process_all_rooms():
@@ -105,6 +26,7 @@ def process_all_rooms():
         original_summary = json.load(f)
 
     all_rooms = {}
+    store = default_store()
 
     # 각 LFL 파일 처리
     for file_info in original_summary['files']:
@@ -122,14 +44,19 @@ def process_all_rooms():
             encrypted = f.read()
         decrypted = xor_decrypt(encrypted)
 
-        # Room 정보
-        width = decrypted[4] | (decrypted[5] << 8)
-        height = decrypted[6] | (decrypted[7] << 8)
+        # Room 파싱 (헤더 + SMAP strip 테이블)
+        room = parse_room(decrypted)
+        width = room.width
+        height = room.height
         print(f'   Room: {width}×{height}px')
 
         # Room 디렉토리 생성
         room_dir = decoded_dir / f'room_{room_num_str}'
         room_dir.mkdir(exist_ok=True)
+        outputs = RoomOutputs('decoded2', room_num_str, decoded_dir)
+
+        # out/ 파일의 저장소 객체 (extract_resources.py 매니페스트)
+        source = store.load_manifest('out', room_num_str) or {'files': {}}
 
         room_info = {
             'room_number': room_num,
@@ -140,12 +67,12 @@ def process_all_rooms():
 
         # 배경 이미지 재구성
         try:
-            reconstructed, img_width, img_height, num_strips = extract_room_image(decrypted)
+            reconstructed, img_width, img_height, num_strips = rebuild_room_image(decrypted, room)
             if reconstructed:
                 type_dir = room_dir / 'background'
                 type_dir.mkdir(exist_ok=True)
                 filepath = type_dir / 'background.bin'
-                filepath.write_bytes(reconstructed)
+                outputs.write(filepath, reconstructed)
 
                 print(f'   ✅ [0] background/background.bin - {len(reconstructed)} bytes (재구성됨: {img_width}×{img_height}, {num_strips} strips)')
 
@@ -173,8 +100,6 @@ def process_all_rooms():
             if not src_path.exists():
                 continue
 
-            data = src_path.read_bytes()
-
             # 타입별 디렉토리
             type_dir = room_dir / res_type
             type_dir.mkdir(exist_ok=True)
@@ -182,7 +107,16 @@ def process_all_rooms():
             # 파일명 (out/의 파일명 사용)
             filename = src_path.name
             filepath = type_dir / filename
-            filepath.write_bytes(data)
+
+            # out/ 파일이 저장소 객체 그대로면 읽지 않고 연결
+            stored = source['files'].get(res['path'])
+            if stored and store.is_materialized(stored[0], src_path):
+                size = stored[1]
+                outputs.link(filepath, stored[0], size)
+            else:
+                data = src_path.read_bytes()
+                size = len(data)
+                outputs.write(filepath, data)
 
             # 타입 이모지
             type_emoji = {
@@ -192,18 +126,19 @@ def process_all_rooms():
                 'unknown': '❓'
             }.get(res_type, '📦')
 
-            print(f'   {type_emoji} [{res_id}] {res_type}/{filename} - {len(data)} bytes')
+            print(f'   {type_emoji} [{res_id}] {res_type}/{filename} - {size} bytes')
 
             room_info['resources'].append({
                 'id': res_id,
                 'type': res_type,
                 'filename': filename,
                 'path': f'room_{room_num_str}/{res_type}/{filename}',
-                'size': len(data),
+                'size': size,
                 'entropy': res['entropy'],
                 'reconstructed': False
             })
 
+        outputs.save()
         all_rooms[room_num_str] = room_info
 
     return all_rooms
@@ -258,6 +193,7 @@ def create_resources_json(all_rooms, output_path):
     # JSON 저장
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(resources_data, f, indent=2, ensure_ascii=False)
+    write_manifest(resources_data, output_path.with_suffix('.bin'))
 
     return resources_data
 
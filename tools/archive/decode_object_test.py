@@ -3,8 +3,14 @@
 SCUMM v3 오브젝트 이미지 디코딩 테스트
 ScummVM gfx.cpp의 drawStripEGA() 구현
 """
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lfl_reader import xor_decrypt
+from ega import decode_strip_into
+from png_writer import save_indexed_png
+
 try:
     from PIL import Image
     PIL_AVAILABLE = True
@@ -14,128 +20,6 @@ except ImportError:
     exit(1)
 
 
-# EGA 16색 팔레트 (RGB)
-EGA_PALETTE = [
-    (0x00, 0x00, 0x00),  # 0: Black
-    (0x00, 0x00, 0xAA),  # 1: Blue
-    (0x00, 0xAA, 0x00),  # 2: Green
-    (0x00, 0xAA, 0xAA),  # 3: Cyan
-    (0xAA, 0x00, 0x00),  # 4: Red
-    (0xAA, 0x00, 0xAA),  # 5: Magenta
-    (0xAA, 0x55, 0x00),  # 6: Brown
-    (0xAA, 0xAA, 0xAA),  # 7: Light Gray
-    (0x55, 0x55, 0x55),  # 8: Dark Gray
-    (0x55, 0x55, 0xFF),  # 9: Light Blue
-    (0x55, 0xFF, 0x55),  # 10: Light Green
-    (0x55, 0xFF, 0xFF),  # 11: Light Cyan
-    (0xFF, 0x55, 0x55),  # 12: Light Red
-    (0xFF, 0x55, 0xFF),  # 13: Light Magenta
-    (0xFF, 0xFF, 0x55),  # 14: Yellow
-    (0xFF, 0xFF, 0xFF),  # 15: White
-]
-
-
-def xor_decrypt(data):
-    """XOR 0xFF 복호화"""
-    return bytearray([b ^ 0xFF for b in data])
-
-
-def decode_strip_ega(data, pixels, strip_x, width, height):
-    """ScummVM drawStripEGA 구현"""
-    if len(data) == 0:
-        return
-
-    # 8×height 픽셀 스트립 버퍼
-    dst = [[0 for _ in range(8)] for _ in range(height)]
-
-    color = 0
-    run = 0
-    x = 0
-    y = 0
-    offset = 0
-
-    while x < 8 and offset < len(data):
-        color = data[offset]
-        offset += 1
-
-        if color & 0x80:  # RLE mode
-            run = color & 0x3F
-
-            if color & 0x40:  # Two-color dithering
-                if offset >= len(data):
-                    break
-                color = data[offset]
-                offset += 1
-
-                if run == 0:
-                    if offset >= len(data):
-                        break
-                    run = data[offset]
-                    offset += 1
-
-                for z in range(run):
-                    if x >= 8:
-                        break
-                    if y < height:
-                        pixel_color = (color & 0xF) if (z & 1) else (color >> 4)
-                        dst[y][x] = pixel_color
-
-                    y += 1
-                    if y >= height:
-                        y = 0
-                        x += 1
-
-            else:  # Repeat previous pixel
-                if run == 0:
-                    if offset >= len(data):
-                        break
-                    run = data[offset]
-                    offset += 1
-
-                for z in range(run):
-                    if x >= 8:
-                        break
-                    if y < height:
-                        if x > 0:
-                            dst[y][x] = dst[y][x - 1]
-                        else:
-                            dst[y][x] = 0
-
-                    y += 1
-                    if y >= height:
-                        y = 0
-                        x += 1
-
-        else:  # Single color run
-            run = color >> 4
-            if run == 0:
-                if offset >= len(data):
-                    break
-                run = data[offset]
-                offset += 1
-
-            pixel_color = color & 0xF
-            for z in range(run):
-                if x >= 8:
-                    break
-                if y < height:
-                    dst[y][x] = pixel_color
-
-                y += 1
-                if y >= height:
-                    y = 0
-                    x += 1
-
-    # Copy to main buffer
-    for row in range(height):
-        for col in range(8):
-            pixel_x = strip_x + col
-            if pixel_x < width:
-                pixel_index = row * width + pixel_x
-                if pixel_index < len(pixels):
-                    pixels[pixel_index] = dst[row][col]
-
-
 def decode_object_image(obim_data, width=None, height=None):
     """
     SCUMM v3 OBIM 디코딩
@@ -192,7 +76,7 @@ def decode_object_image(obim_data, width=None, height=None):
         strip_size = len(strip_data) // remaining_strips if remaining_strips > 0 else len(strip_data)
         strip_size = min(strip_size, len(strip_data))
 
-        decode_strip_ega(strip_data[:strip_size], pixels, strip_idx * 8, width, height)
+        decode_strip_into(strip_data[:strip_size], pixels, strip_idx * 8, width, height)
 
         strip_data = strip_data[strip_size:]
 
@@ -200,17 +84,8 @@ def decode_object_image(obim_data, width=None, height=None):
 
 
 def save_as_png(pixels, width, height, output_path):
-    """PNG로 저장"""
-    # RGB 이미지 생성
-    img = Image.new('RGB', (width, height))
-    rgb_data = []
-
-    for pixel in pixels:
-        r, g, b = EGA_PALETTE[pixel & 0x0F]
-        rgb_data.extend([r, g, b])
-
-    img.putdata(list(zip(rgb_data[0::3], rgb_data[1::3], rgb_data[2::3])))
-    img.save(output_path)
+    """PNG로 저장 (EGA 팔레트 인덱스 PNG)"""
+    save_indexed_png(pixels, width, height, output_path)
     return True
 
 
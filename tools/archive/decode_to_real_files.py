@@ -5,11 +5,18 @@ LOOM 리소스를 실제 파일 포맷으로 변환
 - 사운드 → WAV
 - 스크립트 → TXT (hex dump + 디스어셈블)
 """
+import sys
 import os
 import json
 import struct
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from ega import decode_strip_into
+from png_writer import save_indexed_png
+from sound_v3 import read_sound
+from synth import render_speaker
+
 try:
     from PIL import Image
     PIL_AVAILABLE = True
@@ -18,38 +25,6 @@ except ImportError:
     print("⚠️  PIL 없음 - 이미지는 raw 파일로만 저장됩니다")
     print("   설치: pip3 install Pillow")
 
-try:
-    import wave
-    WAVE_AVAILABLE = True
-except ImportError:
-    WAVE_AVAILABLE = False
-
-
-# EGA 16색 팔레트 (RGB)
-EGA_PALETTE = [
-    (0x00, 0x00, 0x00),  # 0: Black
-    (0x00, 0x00, 0xAA),  # 1: Blue
-    (0x00, 0xAA, 0x00),  # 2: Green
-    (0x00, 0xAA, 0xAA),  # 3: Cyan
-    (0xAA, 0x00, 0x00),  # 4: Red
-    (0xAA, 0x00, 0xAA),  # 5: Magenta
-    (0xAA, 0x55, 0x00),  # 6: Brown
-    (0xAA, 0xAA, 0xAA),  # 7: Light Gray
-    (0x55, 0x55, 0x55),  # 8: Dark Gray
-    (0x55, 0x55, 0xFF),  # 9: Light Blue
-    (0x55, 0xFF, 0x55),  # 10: Light Green
-    (0x55, 0xFF, 0xFF),  # 11: Light Cyan
-    (0xFF, 0x55, 0x55),  # 12: Light Red
-    (0xFF, 0x55, 0xFF),  # 13: Light Magenta
-    (0xFF, 0xFF, 0x55),  # 14: Yellow
-    (0xFF, 0xFF, 0xFF),  # 15: White
-]
-
-
-def xor_decrypt(data):
-    """XOR 0xFF 복호화"""
-    return bytearray([b ^ 0xFF for b in data])
-
 
 def decode_scumm_image(data):
     """재구성된 SCUMM 이미지 디코딩"""
@@ -88,144 +63,35 @@ def decode_scumm_image(data):
         next_offset = offsets[strip_idx + 1] if strip_idx < len(offsets) - 1 else len(data)
         strip_data = data[strip_offset:next_offset]
 
-        decode_strip_ega(strip_data, pixels, strip_idx * 8, width, height)
+        decode_strip_into(strip_data, pixels, strip_idx * 8, width, height)
 
     return width, height, bytes(pixels)
 
 
-def decode_strip_ega(data, pixels, strip_x, width, height):
-    """ScummVM drawStripEGA 구현"""
-    if len(data) == 0:
-        return
-
-    # 8×height 픽셀 스트립 버퍼
-    dst = [[0 for _ in range(8)] for _ in range(height)]
-
-    color = 0
-    run = 0
-    x = 0
-    y = 0
-    offset = 0
-
-    while x < 8 and offset < len(data):
-        color = data[offset]
-        offset += 1
-
-        if color & 0x80:  # RLE mode
-            run = color & 0x3F
-
-            if color & 0x40:  # Two-color dithering
-                if offset >= len(data):
-                    break
-                color = data[offset]
-                offset += 1
-
-                if run == 0:
-                    if offset >= len(data):
-                        break
-                    run = data[offset]
-                    offset += 1
-
-                for z in range(run):
-                    if x >= 8:
-                        break
-                    if y < height:
-                        pixel_color = (color & 0xF) if (z & 1) else (color >> 4)
-                        dst[y][x] = pixel_color
-
-                    y += 1
-                    if y >= height:
-                        y = 0
-                        x += 1
-
-            else:  # Repeat previous pixel
-                if run == 0:
-                    if offset >= len(data):
-                        break
-                    run = data[offset]
-                    offset += 1
-
-                for z in range(run):
-                    if x >= 8:
-                        break
-                    if y < height:
-                        if x > 0:
-                            dst[y][x] = dst[y][x - 1]
-                        else:
-                            dst[y][x] = 0
-
-                    y += 1
-                    if y >= height:
-                        y = 0
-                        x += 1
-
-        else:  # Single color run
-            run = color >> 4
-            if run == 0:
-                if offset >= len(data):
-                    break
-                run = data[offset]
-                offset += 1
-
-            pixel_color = color & 0xF
-            for z in range(run):
-                if x >= 8:
-                    break
-                if y < height:
-                    dst[y][x] = pixel_color
-
-                y += 1
-                if y >= height:
-                    y = 0
-                    x += 1
-
-    # Copy to main buffer
-    for row in range(height):
-        for col in range(8):
-            pixel_x = strip_x + col
-            if pixel_x < width:
-                pixel_index = row * width + pixel_x
-                if pixel_index < len(pixels):
-                    pixels[pixel_index] = dst[row][col]
-
-
 def save_as_png(pixels, width, height, output_path):
-    """PNG로 저장"""
+    """PNG로 저장 (EGA 팔레트 인덱스 PNG)"""
     if not PIL_AVAILABLE:
         # Raw 파일로 저장
         with open(output_path.with_suffix('.raw'), 'wb') as f:
             f.write(pixels)
         return False
 
-    # RGB 이미지 생성
-    img = Image.new('RGB', (width, height))
-    rgb_data = []
-
-    for pixel in pixels:
-        r, g, b = EGA_PALETTE[pixel & 0x0F]
-        rgb_data.extend([r, g, b])
-
-    img.putdata(list(zip(rgb_data[0::3], rgb_data[1::3], rgb_data[2::3])))
-    img.save(output_path)
+    save_indexed_png(pixels, width, height, output_path)
     return True
 
 
 def convert_sound_to_wav(data, output_path):
-    """사운드 데이터를 WAV로 변환 (추정)"""
-    # SCUMM v3 사운드는 여러 포맷이 있음:
-    # - PC Speaker beeps
-    # - AdLib music
-    # - Raw PCM samples
-
-    # 간단한 PCM으로 가정 (8-bit unsigned, 11025 Hz)
-    sample_rate = 11025
-
-    with wave.open(str(output_path), 'wb') as wav:
-        wav.setnchannels(1)  # Mono
-        wav.setsampwidth(1)  # 8-bit
-        wav.setframerate(sample_rate)
-        wav.writeframes(data)
-
+    """사운드 데이터를 WAV로 변환 (WA 청크 PC 스피커 스크립트 → 구형파, synth.py)
+
+    decoded2의 휴리스틱 블록은 대부분 WA 청크가 아니므로 ValueError (호출하는 쪽에서 .bin으로 저장)
+    """
+    chunks = read_sound(data, 0)
+    if chunks is None:
+        raise ValueError('WA 청크 아님')
+    wav, meta = render_speaker(chunks[0])
+    if wav is None:
+        raise ValueError(meta['error'])
+    Path(output_path).write_bytes(wav)
     return True
 
 
@@ -2,13 +2,11 @@
 """
 OBIM에서 IMHD 태그 검색
 """
+import sys
 from pathlib import Path
 
-
-def xor_decrypt(data):
-    """XOR 0xFF 복호화"""
-    return bytearray([b ^ 0xFF for b in data])
-
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lfl_reader import xor_decrypt
 
 # LFL 파일 읽기
 lfl_path = Path('01.LFL')
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+디코더/변환기 벤치마크
+실제 LFL 전체를 대상으로 단계별 처리량(bytes/s, 단위/s)과 최대 메모리를 측정하고
+tools/benchmark_baseline.json과 비교해서 느려지면 실패 (exit 1)
+
+단계마다 한 번의 측정이 MIN_SAMPLE_SECONDS 이상 걸리도록 여러 번 반복 실행하고 (timeit 방식),
+그런 측정 repeat회 중 가장 빠른 값을 쓴다 - 수 ms짜리 단계의 타이머/스케줄러 잡음으로 실패하지 않도록.
+처리량은 같은 실행에서 잰 기준 커널(저장소 코드와 무관한 고정 작업) 속도로 나눠서 비교하므로
+기준선을 다른 머신에서 기록했어도 머신 속도 차이는 상쇄된다. 기준선의 머신 정보가 다르면 경고하고,
+기준 커널이 없는 기준선은 같은 머신일 때만 처리량을, 같은 Python일 때만 메모리를 비교한다.
+
+    python3 tools/benchmark.py                    # 측정 + 기준선 비교
+    python3 tools/benchmark.py --update-baseline  # 기준선 갱신
+    python3 tools/benchmark.py room_render png_save
+"""
+import argparse
+import io
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from lfl_reader import read_lfl, xor_decrypt
+from room import parse_room, render_room
+from ega import STRIP_WIDTH, decode_strip_ega
+from extract_resources import iter_classified_blocks
+from decode_objects_v3 import decode_object_smart
+from convert_to_standard_midi import create_standard_midi
+from png_writer import PIL_AVAILABLE, save_indexed_png
+from resource_index import load_index
+from roland import RolandEvents, parse_roland
+from sound_v3 import adlib_notes, read_sound, speaker_runs
+
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'benchmark_baseline.json'
+
+# 기준선 대비 허용 범위 (처리량 30% 이상 감소 / 메모리 30% 이상 증가 → 실패)
+DEFAULT_TOLERANCE = 0.30
+# 이보다 작은 메모리 증가는 무시 (측정 잡음)
+MEMORY_SLACK = 64 * 1024
+# 측정 1회의 최소 시간 (이보다 짧은 단계는 여러 번 반복해서 한 번으로 잼)
+MIN_SAMPLE_SECONDS = 0.2
+
+# 기준 커널 입력 (256 KiB)
+REFERENCE_DATA = bytes(range(256)) * 1024
+
+
+class Corpus:
+    """벤치마크 입력 (LFL 전체를 한 번만 읽고 미리 파싱)"""
+
+    def __init__(self, lfl_dir='.'):
+        self.paths = sorted(Path(lfl_dir).glob('*.LFL'))
+        self.raw = [path.read_bytes() for path in self.paths]
+
+        # SMAP strip이 있는 Room만 (00.LFL 인덱스 등 제외)
+        self.rooms = []
+        for raw in self.raw:
+            data = xor_decrypt(raw)
+            room = parse_room(data)
+            if room.strips:
+                self.rooms.append((data, room))
+
+        self.strips = []
+        self.objects = []
+        for data, room in self.rooms:
+            for strip in room.strips[:room.width // STRIP_WIDTH]:
+                self.strips.append((data[strip.offset:strip.offset + strip.size], room.height))
+            for obj in room.objects:
+                if obj.obim_size not in (0, 19):
+                    self.objects.append(data[obj.obim_offset:obj.obim_offset + obj.obim_size])
+
+        # RO 검증을 통과하는 사운드만 MIDI 변환 입력 (나머지는 raw 래핑으로 바로 끝나서 변환기를 재지 못함)
+        self.sounds = [block for data, _ in self.rooms
+                       for _, _, block, _, res_type in iter_classified_blocks(data)
+                       if res_type == 'sounds' and not parse_roland(block, RolandEvents()).error]
+
+        # 00.LFL 사운드 디렉토리의 실제 v3 사운드 (WA, AD 청크)
+        self.sound_chunks = []
+        index = load_index(lfl_dir) if (Path(lfl_dir) / '00.LFL').exists() else None
+        by_room = {}
+        for _, room, offset in index.directory('sound') if index else ():
+            path = index.room_path(room)
+            if path.exists():
+                by_room.setdefault(room, []).append(offset)
+        for room, offsets in sorted(by_room.items()):
+            data = read_lfl(index.room_path(room))
+            self.sound_chunks += [chunks for chunks in (read_sound(data, offset) for offset in offsets) if chunks]
+
+        self.frames = [render_room(data, room) for data, room in self.rooms]
+
+
+# ---------------------------------------------------------------------------
+# 단계: corpus → (처리 단위 수, 처리 bytes)
+# ---------------------------------------------------------------------------
+
+def bench_read_decrypt(corpus):
+    total = 0
+    for path in corpus.paths:
+        total += len(read_lfl(path))
+    return len(corpus.paths), total
+
+
+def bench_room_parse(corpus):
+    total = 0
+    for data, _ in corpus.rooms:
+        parse_room(data)
+        total += len(data)
+    return len(corpus.rooms), total
+
+
+def bench_strip_decode(corpus):
+    total = 0
+    for src, height in corpus.strips:
+        decode_strip_ega(src, height)
+        total += len(src)
+    return len(corpus.strips), total
+
+
+def bench_room_render(corpus):
+    total = 0
+    for data, room in corpus.rooms:
+        render_room(data, room)
+        total += room.size
+    return len(corpus.rooms), total
+
+
+def bench_object_decode(corpus):
+    total = 0
+    for obim in corpus.objects:
+        decode_object_smart(obim)
+        total += len(obim)
+    return len(corpus.objects), total
+
+
+def bench_png_save(corpus):
+    total = 0
+    for frame in corpus.frames:
+        out = io.BytesIO()
+        save_indexed_png(frame.buf, frame.width, frame.height, out)
+        total += len(frame.buf)
+    return len(corpus.frames), total
+
+
+def bench_midi_convert(corpus):
+    total = 0
+    for sound in corpus.sounds:
+        create_standard_midi(sound)
+        total += len(sound)
+    return len(corpus.sounds), total
+
+
+def bench_sound_parse(corpus):
+    """WA 스피커 스크립트 실행 + AD 음악 트랙 파싱 (sound_v3)"""
+    total = 0
+    for wa, ad in corpus.sound_chunks:
+        for parse, chunk in ((speaker_runs, wa), (adlib_notes, ad)):
+            if chunk is None:
+                continue
+            try:
+                parse(chunk)
+            except ValueError:
+                pass
+            total += len(chunk)
+    return len(corpus.sound_chunks), total
+
+
+def bench_reference(corpus):
+    """머신 속도 기준 커널: 순수 Python byte 루프 + dict (저장소 코드가 바뀌어도 같은 작업)"""
+    acc = 0
+    counts = {}
+    for b in REFERENCE_DATA:
+        acc = (acc * 31 + (b ^ 0xFF)) & 0xFFFFFFFF
+        counts[b & 0x0F] = counts.get(b & 0x0F, 0) + 1
+    return 1, len(REFERENCE_DATA)
+
+
+# (이름, 단위, 함수)
+BENCHMARKS = [
+    ('read_decrypt', 'files', bench_read_decrypt),
+    ('room_parse', 'rooms', bench_room_parse),
+    ('strip_decode', 'strips', bench_strip_decode),
+    ('room_render', 'rooms', bench_room_render),
+    ('object_decode', 'objects', bench_object_decode),
+    ('png_save', 'rooms', bench_png_save),
+    ('midi_convert', 'sounds', bench_midi_convert),
+    ('sound_parse', 'sounds', bench_sound_parse),
+]
+
+# 벤치마크 → 입력이 있는지 (없으면 건너뜀)
+INPUTS = {
+    'midi_convert': lambda corpus: corpus.sounds,
+    'sound_parse': lambda corpus: corpus.sound_chunks,
+}
+
+
+def time_loops(func, corpus, loops):
+    """func를 loops번 실행 → (1회당 시간, 처리 단위 수, 처리 bytes)"""
+    start = time.perf_counter()
+    for _ in range(loops):
+        units, nbytes = func(corpus)
+    return (time.perf_counter() - start) / loops, units, nbytes
+
+
+def run_benchmark(func, corpus, repeat):
+    """최소 시간 (MIN_SAMPLE_SECONDS 이상 걸리는 측정 repeat회) + tracemalloc 최대 메모리 (1회, 시간 측정과 분리)
+
+    첫 측정으로 반복 횟수(loops)를 정하고, 그 측정도 repeat회에 포함
+    """
+    loops = 1
+    best, units, nbytes = time_loops(func, corpus, loops)
+    while best * loops < MIN_SAMPLE_SECONDS:
+        loops = max(loops * 2, math.ceil(MIN_SAMPLE_SECONDS / max(best, 1e-9)))
+        best, units, nbytes = time_loops(func, corpus, loops)
+
+    for _ in range(repeat - 1):
+        best = min(best, time_loops(func, corpus, loops)[0])
+
+    tracemalloc.start()
+    func(corpus)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = max(best, 1e-9)
+    return {
+        'seconds': round(best, 6),
+        'loops': loops,
+        'units': units,
+        'bytes': nbytes,
+        'units_per_s': round(units / best, 1),
+        'bytes_per_s': round(nbytes / best, 1),
+        'peak_bytes': peak,
+    }
+
+
+def machine_info():
+    """기준선에 기록하는 머신 정보 (Python, 플랫폼, CPU 모델)"""
+    cpu = platform.processor()
+    try:
+        with open('/proc/cpuinfo', 'r') as f:
+            cpu = next((line.split(':', 1)[1].strip() for line in f if line.startswith('model name')), cpu)
+    except OSError:
+        pass
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu': cpu,
+    }
+
+
+def speed_ratio(result, base, scale):
+    """기준선 대비 처리량 비율 (scale = 이번 기준 커널 속도 / 기준선 기준 커널 속도)"""
+    if not base['units_per_s']:
+        return 1.0
+    return result['units_per_s'] / (base['units_per_s'] * scale)
+
+
+def compare(results, baseline, tolerance, scale=1.0, check_memory=True):
+    """기준선 대비 회귀 목록 [(이름, 설명)]
+
+    scale이 None이면 처리량은 비교하지 않음 (다른 머신 + 기준 커널 없음)
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+
+        if scale is not None:
+            ratio = speed_ratio(result, base, scale)
+            if ratio < 1.0 - tolerance:
+                regressions.append((name, f'처리량 {ratio:.2f}x ({result["units_per_s"]:,.0f} < '
+                                          f'{base["units_per_s"] * scale:,.0f}/s, 기준 커널로 보정)'))
+
+        grown = result['peak_bytes'] - base['peak_bytes']
+        if (check_memory and grown > MEMORY_SLACK
+                and result['peak_bytes'] > base['peak_bytes'] * (1.0 + tolerance)):
+            regressions.append((name, f'메모리 {result["peak_bytes"] / 1024:,.0f} KiB '
+                                      f'(기준 {base["peak_bytes"] / 1024:,.0f} KiB)'))
+    return regressions
+
+
+def load_baseline(path):
+    if not path.exists():
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, reference):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'machine': machine_info(),
+            'reference': reference,
+            'benchmarks': results,
+        }, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LOOM 디코더/변환기 벤치마크')
+    parser.add_argument('benchmarks', nargs='*', metavar='NAME',
+                        help='실행할 벤치마크 (기본: 전체): ' + ', '.join(b[0] for b in BENCHMARKS))
+    parser.add_argument('--repeat', type=int, default=5, help='반복 횟수 (최소 시간 사용, 기본 5)')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'허용 감소 비율 (기본 {DEFAULT_TOLERANCE})')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help='기준선 JSON 경로')
+    parser.add_argument('--update-baseline', action='store_true', help='측정 결과를 기준선으로 저장')
+    parser.add_argument('--json', type=Path, help='측정 결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    names = {b[0] for b in BENCHMARKS}
+    unknown = set(args.benchmarks) - names
+    if unknown:
+        parser.error(f'알 수 없는 벤치마크: {", ".join(sorted(unknown))}')
+
+    selected = [b for b in BENCHMARKS if not args.benchmarks or b[0] in args.benchmarks]
+    if not PIL_AVAILABLE:
+        print('⚠️  PIL 없음: png_save 건너뜀')
+        selected = [b for b in selected if b[0] != 'png_save']
+
+    print('⏱️  LOOM 벤치마크')
+    print('=' * 78)
+
+    corpus = Corpus()
+    if not corpus.paths:
+        print('❌ LFL 파일을 찾을 수 없습니다!')
+        return 1
+
+    print(f'   LFL {len(corpus.paths)}개, Room {len(corpus.rooms)}개, strip {len(corpus.strips)}개, '
+          f'오브젝트 {len(corpus.objects)}개, RO 사운드 {len(corpus.sounds)}개, '
+          f'v3 사운드 {len(corpus.sound_chunks)}개')
+
+    empty = [b[0] for b in selected if b[0] in INPUTS and not INPUTS[b[0]](corpus)]
+    if empty:
+        print(f'   ⚠️  입력 없음, 건너뜀: {", ".join(empty)}')
+        selected = [b for b in selected if b[0] not in empty]
+    print()
+
+    baseline_data = load_baseline(args.baseline) or {}
+    baseline = baseline_data.get('benchmarks', {})
+
+    # 머신 속도 보정: 같은 실행의 기준 커널 / 기준선의 기준 커널
+    # (벤치마크 앞뒤로 재고 빠른 쪽을 사용 → 한쪽만 느리게 잡혀도 보정이 흔들리지 않음)
+    reference = run_benchmark(bench_reference, corpus, args.repeat)
+    base_reference = baseline_data.get('reference')
+    machine = machine_info()
+    base_machine = baseline_data.get('machine', {})
+    mismatched = [key for key in machine if base_machine.get(key) != machine[key]] if baseline else []
+    same_python = all(key not in mismatched for key in ('python', 'implementation'))
+
+    if mismatched:
+        print(f'   ⚠️  기준선과 다른 머신: {", ".join(mismatched)}')
+        for key in mismatched:
+            print(f'      {key}: {base_machine.get(key)} → {machine[key]}')
+        if not base_reference:
+            print('   ⚠️  기준선에 기준 커널이 없어 처리량 비교 건너뜀 (--update-baseline으로 다시 기록)')
+        if not same_python:
+            print('   ⚠️  Python이 달라 메모리 비교 건너뜀')
+    print()
+
+    print(f'   {"benchmark":15s} {"units/s":>14s} {"MB/s":>9s} {"peak KiB":>10s} {"vs base":>8s}')
+    print('   ' + '-' * 60)
+
+    results = {}
+    for name, unit, func in selected:
+        result = run_benchmark(func, corpus, args.repeat)
+        results[name] = result
+
+    after = run_benchmark(bench_reference, corpus, args.repeat)
+    if after['seconds'] < reference['seconds']:
+        reference = after
+
+    if base_reference:
+        scale = reference['bytes_per_s'] / base_reference['bytes_per_s']
+    else:
+        scale = None if mismatched else 1.0
+
+    for name, unit, _ in selected:
+        result = results[name]
+        base = baseline.get(name)
+        vs = f'{speed_ratio(result, base, scale):.2f}x' if base and scale is not None else '-'
+        rate = f'{result["units_per_s"]:,.0f} {unit}'
+        print(f'   {name:15s} {rate:>14s} {result["bytes_per_s"] / 1e6:9.2f} '
+              f'{result["peak_bytes"] / 1024:10,.0f} {vs:>8s}')
+
+    print('   ' + '-' * 60)
+    print(f'   {"reference":15s} {reference["bytes_per_s"] / 1e6:24.2f}'
+          + (f'   (기준선 대비 {scale:.2f}x, 처리량 비교에 반영)' if base_reference else ''))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    print('=' * 78)
+
+    if args.update_baseline:
+        # 다른 머신에서 잰 이전 결과는 이번 기준 커널과 짝이 맞지 않으므로 버림
+        merged = dict(baseline) if not mismatched else {}
+        merged.update(results)
+        for name in empty:
+            merged.pop(name, None)
+        save_baseline(args.baseline, merged, reference)
+        print(f'✅ 기준선 갱신: {args.baseline}')
+        return 0
+
+    if not baseline:
+        print(f'⚠️  기준선 없음: {args.baseline} (--update-baseline으로 생성)')
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance, scale, same_python)
+    if regressions:
+        print(f'❌ 성능 회귀 {len(regressions)}건 (허용 {args.tolerance:.0%}):')
+        for name, message in regressions:
+            print(f'   {name}: {message}')
+        return 1
+
+    print(f'✅ 기준선 대비 회귀 없음 (허용 {args.tolerance:.0%})')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+LOOM 추출 파이프라인 증분 빌드
+단계별/Room별 입력 해시(LFL 바이트, 상위 단계 결과, 디코더 소스)와 산출물을
+.loom_cache/build_state.json에 기록하고, 바뀐 Room/단계만 다시 만든다.
+
+    python3 tools/build.py                # 전체 파이프라인 (바뀐 것만)
+    python3 tools/build.py objects_png    # 특정 단계만
+    python3 tools/build.py --force        # 전체 재생성
+
+단계 출력은 저장소(store.py) 객체의 복사본이라 그대로 수정/커밋해도 된다.
+LOOM_STORE_HARDLINK=1 python3 tools/build.py는 복사 대신 hard link로 디스크를 아끼지만
+출력이 읽기 전용 저장소 객체를 공유하므로 git이 추적하는 sounds_midi/, sounds_standard_midi/에는 쓰지 말 것
+"""
+import abc
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent
+REPO_DIR = TOOLS_DIR.parent
+sys.path.insert(0, str(REPO_DIR / 'test'))
+
+from parallel import add_jobs_argument, map_rooms
+from profiling import span
+from room_cache import CACHE_ROOT
+from store import default_store
+
+
+# 상태 파일 형식이 바뀌면 올림
+BUILD_VERSION = 1
+STATE_PATH = CACHE_ROOT / 'build_state.json'
+
+
+# ---------------------------------------------------------------------------
+# 해시 (stat이 같으면 이전 해시 재사용)
+# ---------------------------------------------------------------------------
+
+class FileHasher:
+    """(size, mtime_ns)가 같으면 이전 빌드의 해시를 재사용하는 파일 해셔"""
+
+    def __init__(self, cache):
+        self.cache = cache      # path → [size, mtime_ns, digest]
+        self.seen = {}
+        self.dirty = False      # 새로 해시한 파일이 있으면 상태 저장 필요
+
+    def file(self, path):
+        key = str(path)
+        if key in self.seen:
+            return self.seen[key]
+
+        st = os.stat(path)
+        cached = self.cache.get(key)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            digest = cached[2]
+        else:
+            digest = hashlib.blake2b(Path(path).read_bytes(), digest_size=16).hexdigest()
+            self.cache[key] = [st.st_size, st.st_mtime_ns, digest]
+            self.dirty = True
+
+        self.seen[key] = digest
+        return digest
+
+    def tree(self, paths, root=Path('.')):
+        """파일/디렉토리 목록 (root 기준 상대 경로) → 하나의 해시 (없는 경로는 '-')"""
+        h = hashlib.blake2b(digest_size=16)
+        for path in paths:
+            path = root / path
+            if path.is_dir():
+                files = sorted(p for p in path.rglob('*') if p.is_file())
+            elif path.exists():
+                files = [path]
+            else:
+                h.update(f'{path.relative_to(root)}\0-\0'.encode())
+                continue
+            for file in files:
+                h.update(f'{file.relative_to(root)}\0{self.file(file)}\0'.encode())
+        return h.hexdigest()
+
+    def sources(self, names):
+        """디코더 소스 파일 (tools/ 기준) 해시 = 디코더 버전"""
+        return self.tree(names, TOOLS_DIR)
+
+
+def combine(*parts):
+    return hashlib.blake2b('\0'.join(parts).encode(), digest_size=16).hexdigest()
+
+
+def lfl_files():
+    return sorted(Path('.').glob('*.LFL'))
+
+
+# ---------------------------------------------------------------------------
+# Room 단위 단계
+# ---------------------------------------------------------------------------
+
+class RoomStage(abc.ABC):
+    """Room별로 다시 만들 수 있는 단계
+
+    units()      → [(unit_id, unit, 입력 해시)]
+    run(unit)    → JSON 직렬화 가능한 결과 (map_rooms로 병렬 실행)
+    artifacts()  → 결과가 만든 파일 목록 (오래된 산출물 정리용)
+    merge()      → 모든 Room 결과로 합친 출력 (summary/resources.json 등) 작성
+    """
+
+    kind = 'room'
+
+    def __init__(self, name, sources, outputs):
+        self.name = name
+        self.sources = sources
+        self.outputs = outputs
+
+    @abc.abstractmethod
+    def units(self, hasher):
+        ...
+
+    @abc.abstractmethod
+    def run(self, unit):
+        ...
+
+    def artifacts(self, result):
+        return []
+
+    @abc.abstractmethod
+    def merge(self, results):
+        ...
+
+
+class ResourcesStage(RoomStage):
+    """extract_resources: LFL → out/<type>/XX_resNNN.bin + out/_summary.json"""
+
+    def units(self, hasher):
+        return [(lfl.stem, str(lfl), hasher.file(lfl)) for lfl in lfl_files()]
+
+    def run(self, unit):
+        from extract_resources import extract_lfl_resources
+        return extract_lfl_resources(Path(unit), Path('out'))
+
+    def artifacts(self, result):
+        return [f'out/{res["path"]}' for res in result]
+
+    def merge(self, results):
+        from extract_resources import create_summary
+        create_summary(results, Path('out'))
+
+
+class DecodedStage(RoomStage):
+    """decode_all_resources_complete: LFL → decoded/room_XX/ + decoded/resources.json"""
+
+    def units(self, hasher):
+        return [(lfl.stem, int(lfl.stem), hasher.file(lfl))
+                for lfl in lfl_files() if lfl.stem.isdigit() and 1 <= int(lfl.stem) <= 99]
+
+    def run(self, unit):
+        from decode_all_resources_complete import DECODED_DIR, process_room
+        DECODED_DIR.mkdir(exist_ok=True)
+        return process_room(unit)
+
+    def artifacts(self, result):
+        return [f'decoded/{res["path"]}' for res in result['resources']]
+
+    def merge(self, results):
+        from decode_all_resources_complete import DECODED_DIR, create_resources_json
+        create_resources_json(results, DECODED_DIR / 'resources.json')
+
+
+class ObjectsStage(RoomStage):
+    """extract_objects_v3: 처음 5개 LFL → analyze/objects_analysis.json"""
+
+    def units(self, hasher):
+        return [(lfl.stem, str(lfl), hasher.file(lfl)) for lfl in lfl_files()[:5]]
+
+    def run(self, unit):
+        from extract_objects_v3 import extract_objects_from_room
+        return extract_objects_from_room(Path(unit))
+
+    def merge(self, results):
+        from extract_objects_v3 import save_objects_analysis
+        save_objects_analysis([info for info in results.values() if info])
+
+
+class ObjectsPngStage(RoomStage):
+    """decode_objects_v3: objects_analysis.json의 Room → objects_png_v3/ + 결과 JSON"""
+
+    def units(self, hasher):
+        from decode_objects_v3 import ANALYSIS_PATH, MAX_ROOMS
+        if not ANALYSIS_PATH.exists():
+            return []
+        with open(ANALYSIS_PATH, 'r') as f:
+            analysis = json.load(f)
+
+        units = []
+        for room in analysis['rooms'][:MAX_ROOMS]:
+            lfl = Path(f'{room["room"]}.LFL')
+            lfl_hash = hasher.file(lfl) if lfl.exists() else '-'
+            units.append((room['room'], room, combine(lfl_hash, json.dumps(room, sort_keys=True))))
+        return units
+
+    def run(self, unit):
+        from decode_objects_v3 import OUTPUT_DIR, decode_room_objects
+        OUTPUT_DIR.mkdir(exist_ok=True)
+        return decode_room_objects(unit)
+
+    def artifacts(self, result):
+        return [obj['file'] for obj in result['objects']] if result else []
+
+    def merge(self, results):
+        from decode_objects_v3 import merge_object_results, save_object_results
+        stats, all_results = merge_object_results(results.values())
+        save_object_results(stats, all_results)
+
+
+# ---------------------------------------------------------------------------
+# 스크립트 단위 단계 (입력 디렉토리 전체가 바뀌면 다시 실행)
+# ---------------------------------------------------------------------------
+
+class ScriptStage:
+    """스크립트 하나를 실행하는 단계
+
+    스크립트가 파일을 리소스별로 덮어쓰므로 출력 디렉토리를 지우지 않는다.
+    manifest가 있으면 (RoomOutputs 이름) 이번 실행에서 저장된 매니페스트의 파일을 산출물로 기록하고,
+    이전 실행의 산출물 중 이번에 만들지 않은 파일만 삭제한다.
+    """
+
+    kind = 'script'
+
+    def __init__(self, name, script, inputs, outputs, sources=(), manifest=None):
+        self.name = name
+        self.script = script
+        self.inputs = inputs
+        self.outputs = outputs
+        self.sources = (script,) + tuple(sources)
+        self.manifest = manifest
+
+    def key(self, hasher):
+        return combine(hasher.sources(self.sources), hasher.tree(self.inputs))
+
+    def run(self):
+        started = time.time()
+        subprocess.run([sys.executable, str(TOOLS_DIR / self.script)], check=True)
+        return self.artifacts(started)
+
+    def artifacts(self, since):
+        """since 이후에 저장된 매니페스트의 출력 파일 목록 (나머지 Room 매니페스트는 삭제)"""
+        if not self.manifest:
+            return []
+        store = default_store()
+        files = []
+        for path in sorted((store.manifests_dir / self.manifest).glob('room_*.json')):
+            if path.stat().st_mtime < since:
+                path.unlink()
+                continue
+            manifest = json.loads(path.read_text())
+            files.extend(str(Path(manifest['base']) / rel_path) for rel_path in manifest['files'])
+        return files
+
+
+STAGES = [
+    ResourcesStage('resources', ['extract_resources.py', 'lfl_reader.py', 'store.py'],
+                   ['out/_summary.json']),
+    ScriptStage('decoded2', 'archive/decode_all_resources_fixed.py',
+                inputs=['out'] + [str(lfl) for lfl in lfl_files()],
+                outputs=['decoded2'],
+                sources=['lfl_reader.py', 'room.py', 'ega.py', 'store.py'],
+                manifest='decoded2'),
+    DecodedStage('decoded', ['../test/decode_all_resources_complete.py', 'lfl_reader.py',
+                             'room.py', 'room_cache.py', 'ega.py', 'store.py'],
+                 ['decoded/resources.json']),
+    ObjectsStage('objects', ['extract_objects_v3.py', 'room.py', 'room_cache.py',
+                             'lfl_reader.py', 'ega.py'],
+                 ['analyze/objects_analysis.json']),
+    ObjectsPngStage('objects_png', ['decode_objects_v3.py', 'lfl_reader.py', 'ega.py',
+                                    'png_writer.py', 'store.py'],
+                    ['analyze/objects_png_v3_results.json']),
+    ScriptStage('sounds_midi', 'convert_sounds_to_midi.py',
+                inputs=['decoded2'], outputs=['sounds_midi'],
+                sources=['sound_format.py', 'roland.py', 'store.py'],
+                manifest='sounds_midi'),
+    ScriptStage('sounds_standard_midi', 'convert_to_standard_midi.py',
+                inputs=['decoded2'], outputs=['sounds_standard_midi'],
+                sources=['sound_format.py', 'roland.py', 'store.py'],
+                manifest='sounds_standard_midi'),
+    ScriptStage('sounds_wav', 'render_sounds_wav.py',
+                inputs=[str(lfl) for lfl in lfl_files()], outputs=['sounds_wav'],
+                sources=['sound_v3.py', 'synth.py', 'resource_index.py', 'lfl_reader.py',
+                         'parallel.py', 'store.py'],
+                manifest='sounds_wav'),
+    ScriptStage('disassembled', 'disassemble_scripts.py',
+                inputs=['decoded2'], outputs=['disassembled'],
+                sources=['scumm_v3.py']),
+    ScriptStage('script_xref', 'script_xref.py',
+                inputs=[str(lfl) for lfl in lfl_files()], outputs=['analyze/script_xref.json'],
+                sources=['scumm_v3.py', 'resource_index.py', 'room.py', 'lfl_reader.py',
+                         'extract_indexed_resources.py']),
+    ScriptStage('catalog', 'create_resource_catalog.py',
+                inputs=['decoded2/resources.json', 'objects_png_v3',
+                        'disassembled', 'sounds_standard_midi', 'analyze/script_xref.json'],
+                outputs=['resource_catalog.html'],
+                sources=['script_xref.py']),
+]
+
+
+# ---------------------------------------------------------------------------
+# 상태 파일
+# ---------------------------------------------------------------------------
+
+def load_state():
+    if STATE_PATH.exists():
+        try:
+            with open(STATE_PATH, 'r') as f:
+                state = json.load(f)
+            if state.get('version') == BUILD_VERSION:
+                return state
+        except (OSError, ValueError):
+            pass
+    return {'version': BUILD_VERSION, 'files': {}, 'stages': {}}
+
+
+def save_state(state):
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = STATE_PATH.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, STATE_PATH)
+
+
+def _remove_files(paths):
+    """오래된 산출물 삭제 (비게 된 디렉토리도 삭제)"""
+    for path in paths:
+        try:
+            os.remove(path)
+            os.rmdir(os.path.dirname(path))
+        except OSError:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# 단계 실행
+# ---------------------------------------------------------------------------
+
+def build_room_stage(stage, state, hasher, force, jobs):
+    """바뀐 Room만 다시 실행하고, 하나라도 바뀌었으면 합친 출력 재작성
+
+    Returns: 다시 만든 Room 수
+    """
+    stage_state = state['stages'].setdefault(stage.name, {'units': {}})
+    old_units = stage_state['units']
+    source_hash = hasher.sources(stage.sources)
+
+    units = stage.units(hasher)
+    todo = []
+    for unit_id, unit, input_hash in units:
+        key = combine(source_hash, input_hash)
+        entry = old_units.get(unit_id)
+        if (force or entry is None or entry['key'] != key
+                or not all(os.path.exists(p) for p in entry['artifacts'])):
+            todo.append((unit_id, unit, key))
+
+    # 사라진 Room의 산출물 정리
+    unit_ids = {unit_id for unit_id, _, _ in units}
+    removed = [unit_id for unit_id in old_units if unit_id not in unit_ids]
+    for unit_id in removed:
+        _remove_files(old_units.pop(unit_id)['artifacts'])
+
+    for (unit_id, _, key), result in zip(todo, map_rooms(stage.run, [u for _, u, _ in todo], jobs)):
+        artifacts = stage.artifacts(result)
+        old = old_units.get(unit_id)
+        if old:
+            _remove_files(set(old['artifacts']) - set(artifacts))
+        old_units[unit_id] = {'key': key, 'result': result, 'artifacts': artifacts}
+
+    if todo or removed or not all(os.path.exists(p) for p in stage.outputs):
+        results = {unit_id: old_units[unit_id]['result'] for unit_id, _, _ in units}
+        stage.merge(results)
+
+    return len(todo)
+
+
+def build_script_stage(stage, state, hasher, force):
+    """입력/소스 해시가 바뀌었거나 산출물이 없으면 스크립트 재실행
+
+    Returns: 실행했으면 1
+    """
+    key = stage.key(hasher)
+    stage_state = state['stages'].get(stage.name, {})
+    if (not force and stage_state.get('key') == key
+            and all(os.path.exists(p) for p in stage.outputs)):
+        return 0
+
+    artifacts = stage.run()
+    # 이전 실행에서 만들었지만 이번에는 만들지 않은 파일만 정리
+    _remove_files(set(stage_state.get('artifacts', [])) - set(artifacts))
+    # 실행 후 입력이 바뀌었을 수 있으므로 (같은 단계가 입력도 씀) 다시 계산
+    state['stages'][stage.name] = {'key': stage.key(hasher), 'artifacts': artifacts}
+    return 1
+
+
+def build(stage_names=None, force=False, jobs=1):
+    state = load_state()
+    hasher = FileHasher(state['files'])
+    selected = [s for s in STAGES if not stage_names or s.name in stage_names]
+
+    for stage in selected:
+        start = time.perf_counter()
+        with span('stage', name=stage.name):
+            if stage.kind == 'room':
+                rebuilt = build_room_stage(stage, state, hasher, force, jobs)
+                label = f'{rebuilt}개 Room 재생성' if rebuilt else '최신'
+            else:
+                rebuilt = build_script_stage(stage, state, hasher, force)
+                label = '재실행' if rebuilt else '최신'
+
+        # 이후 단계가 이 단계 출력의 새 해시를 보도록 캐시 무효화
+        hasher.seen.clear()
+        if rebuilt or hasher.dirty:
+            save_state(state)
+            hasher.dirty = False
+
+        emoji = '🔨' if rebuilt else '⏭️ '
+        print(f'{emoji} {stage.name:22s} {label} ({time.perf_counter() - start:.2f}s)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LOOM 추출 파이프라인 증분 빌드')
+    parser.add_argument('stages', nargs='*', metavar='STAGE',
+                        help='실행할 단계 (기본: 전체): ' + ', '.join(s.name for s in STAGES))
+    parser.add_argument('--force', action='store_true', help='해시와 관계없이 전체 재생성')
+    parser.add_argument('--pack', type=Path, metavar='PATH',
+                        help='빌드 후 출력 디렉토리를 무압축 zip 하나로 패킹 (tools/pack.py)')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    unknown = set(args.stages) - {s.name for s in STAGES}
+    if unknown:
+        parser.error(f'알 수 없는 단계: {", ".join(sorted(unknown))}')
+
+    print('🎮 LOOM 증분 빌드')
+    print('=' * 60)
+
+    start = time.perf_counter()
+    build(args.stages, args.force, args.jobs)
+
+    if args.pack:
+        from pack import collect_pack_entries, write_pack
+        with span('stage', name='pack'):
+            count, total = write_pack(collect_pack_entries(), args.pack)
+        print(f'📦 pack                   {count:,}개 파일, {total:,} bytes → {args.pack}')
+
+    print('=' * 60)
+    print(f'✅ 완료 ({time.perf_counter() - start:.2f}s)')
+
+
+if __name__ == '__main__':
+    main()
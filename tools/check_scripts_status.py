@@ -1,17 +1,23 @@
 #!/usr/bin/env python3
 """
-스크립트 디스어셈블 상태 확인
+스크립트 디스어셈블 상태 확인 + 참조 인덱스 질의 (script_xref.py)
+
+    python3 tools/check_scripts_status.py
+    python3 tools/check_scripts_status.py --sound 18 --opcode startSound   # 사운드 18을 시작하는 스크립트
 """
-import json
+import argparse
 from pathlib import Path
 
+from manifest import open_manifest
+from scumm_v3 import ERROR_MARKER
+from script_xref import REF_KINDS, build_xref, collect_scripts, load_xref
+
 
 def check_scripts():
     """스크립트 디스어셈블 상태 확인"""
 
-    # resources.json 읽기
-    with open('decoded2/resources.json', 'r') as f:
-        resources = json.load(f)
+    # 스크립트 레코드만 읽기 (resources.bin 인덱스)
+    manifest = open_manifest('decoded2')
 
     print('📜 스크립트 디스어셈블 상태 확인')
     print('=' * 70)
@@ -20,32 +26,27 @@ def check_scripts():
     success = 0
     failed = []
 
-    for room in resources['rooms']:
-        room_num = room['room']
-        scripts = [r for r in room['resources'] if r['type'] == 'scripts']
-
-        if not scripts:
-            continue
+    for script in manifest.records(res_type='scripts'):
+        room_num = script['room']
+        total_scripts += 1
 
-        for script in scripts:
-            total_scripts += 1
+        # 원본 파일
+        src_path = Path('decoded2') / script['path'].replace('room_', 'room_')
 
-            # 원본 파일
-            src_path = Path('decoded2') / script['path'].replace('room_', 'room_')
+        # 디스어셈블된 파일
+        output_name = script['filename'].replace('.bin', '.txt')
+        output_path = Path('disassembled') / f'room_{room_num}' / output_name
 
-            # 디스어셈블된 파일
-            output_name = script['filename'].replace('.bin', '.txt')
-            output_path = Path('disassembled') / f'room_{room_num}' / output_name
-
-            if output_path.exists():
-                success += 1
-            else:
-                failed.append({
-                    'room': room_num,
-                    'filename': script['filename'],
-                    'path': str(src_path),
-                    'size': script['size']
-                })
+        # listing이 있고 디코딩이 중단되지 않았으면 성공
+        if output_path.exists() and ERROR_MARKER not in output_path.read_text(encoding='utf-8'):
+            success += 1
+        else:
+            failed.append({
+                'room': room_num,
+                'filename': script['filename'],
+                'path': str(src_path),
+                'size': script['size']
+            })
 
     print(f'\n총 스크립트: {total_scripts}개')
     print(f'성공: {success}개 ({success*100//total_scripts}%)')
@@ -95,5 +96,48 @@ def check_scripts():
     print('\n' + '=' * 70)
 
 
+def open_xref():
+    """저장된 참조 인덱스 (없으면 LFL에서 바로 생성)"""
+    xref = load_xref()
+    if xref is None:
+        xref, _, _ = build_xref(collect_scripts())
+    return xref
+
+
+def check_xref(xref):
+    """글로벌/Room 스크립트 디코딩 상태 (참조 인덱스 기준)"""
+    print('\n🔗 글로벌/Room 스크립트 (참조 인덱스)')
+    print('-' * 70)
+    print(f'총 스크립트: {len(xref)}개')
+    print(f'끝까지 디코딩: {len(xref) - len(xref.errors)}개')
+    for name, error in xref.errors.items():
+        print(f'  ⚠️  {name:20s} | {error}')
+
+
+def query_xref(xref, kind, value, opcodes=None):
+    """(종류, 값)을 참조하는 스크립트 출력"""
+    refs = [ref for ref in xref.lookup(kind, value) if opcodes is None or ref[2] in opcodes]
+    label = f'{kind} {value}' + (f' ({", ".join(sorted(opcodes))})' if opcodes else '')
+    print(f'\n🔎 {label}: 스크립트 {len(xref.scripts(kind, value, opcodes))}개')
+    for name, offset, opcode in refs:
+        print(f'   {name:20s} [{offset:04X}] {opcode}')
+
+
 if __name__ == '__main__':
-    check_scripts()
+    parser = argparse.ArgumentParser(description='스크립트 디스어셈블 상태 확인 + 참조 질의')
+    for kind in REF_KINDS:
+        parser.add_argument(f'--{kind}', type=int, action='append', default=[],
+                            metavar='N', help=f'{kind} N을 참조하는 스크립트')
+    parser.add_argument('--opcode', action='append', help='이 명령의 참조만 (예: startSound)')
+    args = parser.parse_args()
+
+    queries = [(kind, value) for kind in REF_KINDS for value in getattr(args, kind)]
+    opcodes = set(args.opcode) if args.opcode else None
+
+    if queries:
+        xref = open_xref()
+        for kind, value in queries:
+            query_xref(xref, kind, value, opcodes)
+    else:
+        check_scripts()
+        check_xref(open_xref())
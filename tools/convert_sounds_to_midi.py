@@ -2,15 +2,26 @@
 """
 LOOM 사운드 리소스를 MIDI 형식으로 변환
 Roland MT-32 tagless 포맷 → Standard MIDI File
+sounds_midi/는 git이 추적하므로 출력은 저장소(store.py)에서 복사한 쓰기 가능한 파일
+(LOOM_STORE_HARDLINK=1이면 읽기 전용 hard link가 되어 git 작업 트리가 저장소 객체를 공유함)
 """
 import struct
 from pathlib import Path
 
+from profiling import span
+from sound_format import FORMATS, find_sound_files, scan_sound, scan_sounds
+from store import RoomOutputs, default_store, source_version
+
+
+# 변환 결과 캐시 버전 (이 파일이 바뀌면 다시 변환)
+CONVERTER_VERSION = source_version(__file__)
+
 
 def read_sound_resource(path):
     """사운드 리소스 읽기 (decoded2는 이미 추출된 raw 데이터)"""
-    with open(path, 'rb') as f:
+    with span('read') as s, open(path, 'rb') as f:
         data = f.read()
+        s.add_bytes(len(data))
 
     if len(data) == 0:
         return None, "Empty file"
@@ -48,8 +59,14 @@ def add_ro_tag(roland_data):
     return bytes(tagged)
 
 
-def convert_sound_to_midi(input_path, output_path):
-    """사운드 리소스를 MIDI 파일로 변환"""
+def encode_ro(roland_data):
+    """derive용 변환 함수 → (RO 태그 데이터, 메타데이터 없음)"""
+    with span('encode', nbytes=len(roland_data)):
+        return add_ro_tag(roland_data), None
+
+
+def convert_sound_to_midi(input_path, output_path, outputs):
+    """사운드 리소스를 MIDI 파일로 변환 (같은 내용은 저장소에서 한 번만 변환)"""
     roland_data, error = read_sound_resource(input_path)
 
     if error:
@@ -62,38 +79,25 @@ def convert_sound_to_midi(input_path, output_path):
     # Note: 실제 변환은 복잡하므로, 여기서는 RO 태그를 붙인 raw 데이터를 저장
     # ScummVM iMuse가 이를 해석할 수 있음
 
-    # RO 태그 추가
-    tagged_data = add_ro_tag(roland_data)
+    # RO 태그 추가 (입력 해시로 캐시)
+    digest, _ = default_store().derive('ro', CONVERTER_VERSION, roland_data, encode_ro)
 
     # 간단한 MIDI 래퍼 (ScummVM 호환)
     # 실제로는 이 데이터를 ScummVM에서 재생해야 함
 
     # 원본 Roland 데이터 저장 (.ro 확장자)
     ro_path = output_path.with_suffix('.ro')
-    with open(ro_path, 'wb') as f:
-        f.write(tagged_data)
+    outputs.link(ro_path, digest)
 
     return True, ro_path
 
 
 def analyze_roland_data(roland_data):
-    """Roland 데이터 패턴 분석"""
+    """Roland 데이터 패턴 분석 (sound_format 시그니처 + 앞 32 bytes)"""
     if len(roland_data) == 0:
         return {}
 
-    # 첫 32 bytes 분석
-    preview = roland_data[:32]
-
-    # 통계
-    stats = {
-        'size': len(roland_data),
-        'preview': preview.hex(' '),
-        'unique_bytes': len(set(roland_data)),
-        'null_count': roland_data.count(0),
-        'high_bit_count': sum(1 for b in roland_data if b >= 0x80)
-    }
-
-    return stats
+    return {**scan_sound(roland_data).to_dict(), 'preview': roland_data[:32].hex(' ')}
 
 
 def process_all_sounds():
@@ -105,12 +109,9 @@ def process_all_sounds():
     print('🎵 LOOM 사운드 리소스 MIDI 변환')
     print('=' * 70)
 
-    # 사운드 파일 찾기
-    sound_files = []
-    for room_dir in sorted(decoded_dir.glob('room_*')):
-        sounds_dir = room_dir / 'sounds'
-        if sounds_dir.exists():
-            sound_files.extend(sorted(sounds_dir.glob('*.bin')))
+    # 사운드 파일 찾기 + 포맷 판별 (한 번에)
+    sound_files = find_sound_files(decoded_dir)
+    _, signatures = scan_sounds([sound_file.read_bytes() for sound_file in sound_files])
 
     print(f'\n총 {len(sound_files)}개 사운드 파일 발견\n')
 
@@ -123,9 +124,11 @@ def process_all_sounds():
     }
 
     size_distribution = {}
+    format_distribution = {}
+    room_outputs = {}
 
-    # 각 파일 처리
-    for sound_file in sound_files:
+    # 각 파일 처리 (.ro 태그는 ScummVM이 판별하므로 포맷과 관계없이 모든 사운드)
+    for sound_file, signature in zip(sound_files, signatures):
         # Room 번호와 리소스 ID 추출
         parts = sound_file.stem.split('_')
         room_num = parts[0]
@@ -149,7 +152,12 @@ def process_all_sounds():
         output_path = output_dir / output_name
 
         # 변환
-        success, result = convert_sound_to_midi(sound_file, output_path)
+        outputs = room_outputs.get(room_num)
+        if outputs is None:
+            outputs = room_outputs[room_num] = RoomOutputs('sounds_midi', room_num, output_dir)
+
+        with span('convert', room=room_num):
+            success, result = convert_sound_to_midi(sound_file, output_path, outputs)
 
         if success:
             stats['success'] += 1
@@ -158,6 +166,7 @@ def process_all_sounds():
             size = len(roland_data)
             size_key = f'{size}B' if size < 1000 else f'{size//1024}K'
             size_distribution[size_key] = size_distribution.get(size_key, 0) + 1
+            format_distribution[signature.format] = format_distribution.get(signature.format, 0) + 1
 
             # 진행 상황 (50개마다)
             if stats['success'] % 50 == 0:
@@ -165,6 +174,9 @@ def process_all_sounds():
         else:
             stats['failed'] += 1
 
+    for outputs in room_outputs.values():
+        outputs.save()
+
     # 결과 출력
     print('\n' + '=' * 70)
     print('✅ 변환 완료!')
@@ -178,6 +190,11 @@ def process_all_sounds():
                                       key=lambda x: -x[1])[:10]:
             print(f'      {size_key:>6s}: {count:3d}개')
 
+    if format_distribution:
+        print(f'\n   포맷별 분포 (sound_format.py):')
+        for format_name, count in sorted(format_distribution.items(), key=lambda x: -x[1]):
+            print(f'      {format_name:>10s}: {count:3d}개  {FORMATS[format_name]}')
+
     print(f'\n   출력: {output_dir.absolute()}/')
     print(f'   포맷: Roland MT-32 raw data with RO tag (.ro)')
 
@@ -196,6 +213,7 @@ def process_all_sounds():
         stats_data = analyze_roland_data(roland_data)
 
         print(f'\n[{i+1}] {sound_file.name}')
+        print(f'    포맷: {stats_data["format"]}')
         print(f'    크기: {stats_data["size"]} bytes')
         print(f'    Preview: {stats_data["preview"][:60]}...')
         print(f'    Unique bytes: {stats_data["unique_bytes"]}/256')
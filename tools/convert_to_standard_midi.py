@@ -2,15 +2,28 @@
 """
 LOOM 사운드 리소스를 표준 MIDI 파일(.mid)로 변환
 Roland MT-32 raw 데이터 → Standard MIDI File Format
+RO 이벤트로 검증되면 delta time, 템포, running status를 다시 인코딩 (roland.py),
+검증되지 않는 블록은 이전처럼 raw 데이터를 MTrk에 그대로 감싼다
+sounds_standard_midi/도 git이 추적하므로 기본은 저장소 객체의 복사본 (hard link는 LOOM_STORE_HARDLINK=1일 때만)
 """
 import struct
 from pathlib import Path
 
+from profiling import span
+from roland import RO_PPQN, RO_TEMPO, RolandEvents, encode_smf, parse_roland
+from sound_format import find_sound_files, scan_sounds
+from store import RoomOutputs, default_store, source_version
+
+
+# 변환 결과 캐시 버전 (이 파일이나 RO 파서가 바뀌면 다시 변환)
+CONVERTER_VERSION = source_version(__file__, Path(__file__).resolve().parent / 'roland.py')
+
 
 def read_sound_resource(path):
     """사운드 리소스 읽기"""
-    with open(path, 'rb') as f:
+    with span('read') as s, open(path, 'rb') as f:
         data = f.read()
+        s.add_bytes(len(data))
 
     if len(data) == 0:
         return None, "Empty file"
@@ -18,8 +31,8 @@ def read_sound_resource(path):
     return data, None
 
 
-def create_standard_midi(roland_data):
-    """Roland raw 데이터를 표준 MIDI 파일로 변환"""
+def wrap_raw_midi(roland_data):
+    """RO 이벤트가 아닌 데이터 → raw 데이터를 그대로 담은 MIDI 파일 (PPQN 480)"""
     midi = bytearray()
 
     # MThd 헤더 (14 bytes)
@@ -42,23 +55,50 @@ def create_standard_midi(roland_data):
     return bytes(midi)
 
 
-def convert_sound_to_standard_midi(input_path, output_path):
-    """사운드 리소스를 표준 MIDI 파일로 변환"""
-    roland_data, error = read_sound_resource(input_path)
-
-    if error:
-        return False, error
-
+def create_standard_midi(roland_data):
+    """Roland raw 데이터를 표준 MIDI 파일로 변환 (RO 이벤트 검증 실패 시 raw 래핑)"""
+    events = RolandEvents()
+    track = parse_roland(roland_data, events)
+    if track.error:
+        return wrap_raw_midi(roland_data)
+    return encode_smf(events, track)
+
+
+def encode_standard_midi(roland_data, parsed=None):
+    """derive용 변환 함수 → (MIDI bytes 또는 None, 메타데이터)
+
+    parsed: scan_sounds로 미리 파싱한 (events, track) - 없으면 여기서 파싱
+    """
+    with span('encode', nbytes=len(roland_data)):
+        if parsed is None:
+            events = RolandEvents()
+            parsed = events, parse_roland(roland_data, events)
+        events, track = parsed
+        if track.error:
+            return wrap_raw_midi(roland_data), {'raw': True, 'error': track.error}
+        return encode_smf(events, track), {
+            'events': track.count,
+            'ticks': track.end_tick,
+            'markers': track.markers,
+        }
+
+
+def convert_sound_to_standard_midi(roland_data, output_path, outputs, parsed=None):
+    """사운드 리소스를 표준 MIDI 파일로 변환 (같은 내용은 저장소에서 한 번만 변환)"""
     if len(roland_data) == 0:
         return False, "Empty data"
 
-    # 표준 MIDI 파일 생성
-    midi_data = create_standard_midi(roland_data)
+    # 표준 MIDI 파일 생성 (입력 해시로 캐시)
+    digest, meta = default_store().derive(
+        'mid', CONVERTER_VERSION, roland_data,
+        lambda data: encode_standard_midi(data, parsed))
+
+    if digest is None:
+        return False, meta['error']
 
     # .mid 파일로 저장
     mid_path = output_path.with_suffix('.mid')
-    with open(mid_path, 'wb') as f:
-        f.write(midi_data)
+    outputs.link(mid_path, digest)
 
     return True, mid_path
 
@@ -73,22 +113,28 @@ def process_all_sounds():
     print('=' * 70)
 
     # 사운드 파일 찾기
-    sound_files = []
-    for room_dir in sorted(decoded_dir.glob('room_*')):
-        sounds_dir = room_dir / 'sounds'
-        if sounds_dir.exists():
-            sound_files.extend(sorted(sounds_dir.glob('*.bin')))
+    sound_files = find_sound_files(decoded_dir)
 
     print(f'\n총 {len(sound_files)}개 사운드 파일 발견\n')
 
     stats = {
         'total': len(sound_files),
         'success': 0,
+        'ro_events': 0,
         'failed': 0,
     }
+    errors = {}
+    room_outputs = {}
 
-    # 각 파일 처리
+    # 전체 사운드를 한 번에 읽고 포맷 판별 (RO 이벤트는 하나의 이벤트 배열로 파싱)
+    blocks = []
     for sound_file in sound_files:
+        roland_data, _ = read_sound_resource(sound_file)
+        blocks.append(roland_data or b'')
+    events, signatures = scan_sounds(blocks)
+
+    # 각 파일 처리 (RO 이벤트면 재인코딩, 아니면 raw 래핑이므로 포맷과 관계없이 모든 사운드)
+    for sound_file, roland_data, signature in zip(sound_files, blocks, signatures):
         # Room 번호와 리소스 ID 추출
         parts = sound_file.stem.split('_')
         room_num = parts[0]
@@ -99,23 +145,42 @@ def process_all_sounds():
         output_path = output_dir / output_name
 
         # 변환
-        success, result = convert_sound_to_standard_midi(sound_file, output_path)
+        outputs = room_outputs.get(room_num)
+        if outputs is None:
+            outputs = room_outputs[room_num] = RoomOutputs('sounds_standard_midi', room_num, output_dir)
+
+        with span('convert', room=room_num):
+            success, result = convert_sound_to_standard_midi(roland_data, output_path, outputs,
+                                                             (events, signature.track))
 
         if success:
             stats['success'] += 1
+            if signature.track.error:
+                errors[sound_file.name] = f'{signature.format}: {signature.track.error}'
+            else:
+                stats['ro_events'] += 1
 
             # 진행 상황 (50개마다)
             if stats['success'] % 50 == 0:
                 print(f'   ✅ {stats["success"]}개 완료...')
         else:
             stats['failed'] += 1
+            errors[sound_file.name] = result
+
+    for outputs in room_outputs.values():
+        outputs.save()
 
     # 결과 출력
     print('\n' + '=' * 70)
     print('✅ 변환 완료!')
     print(f'   총 파일: {stats["total"]}개')
     print(f'   성공: {stats["success"]}개 ({stats["success"]*100//stats["total"] if stats["total"] > 0 else 0}%)')
-    print(f'   실패: {stats["failed"]}개')
+    print(f'   RO 이벤트 재인코딩: {stats["ro_events"]}개, 이벤트 {len(events):,}개 '
+          f'(PPQN {RO_PPQN}, 템포 {RO_TEMPO} µs/4분음표)')
+    print(f'   raw 래핑: {stats["success"] - stats["ro_events"]}개 (RO 이벤트가 아닌 블록)')
+    print(f'   실패: {stats["failed"]}개 (빈 파일)')
+    for name, error in list(errors.items())[:5]:
+        print(f'      ⚠️  {name}: {error}')
     print(f'\n   출력: {output_dir.absolute()}/')
     print(f'   포맷: Standard MIDI File (.mid)')
 
@@ -3,44 +3,24 @@
 LOOM 리소스 카탈로그 생성
 모든 추출된 리소스를 HTML로 정리
 """
-import json
+import argparse
 from pathlib import Path
 
-
-def load_resources_json():
-    """resources.json 읽기"""
-    with open('decoded2/resources.json', 'r') as f:
-        return json.load(f)
+from manifest import open_manifest
+from pack import open_outputs
+from profiling import span
+from script_xref import load_xref
 
 
 def count_resources():
-    """리소스 개수 집계"""
-    resources = load_resources_json()
-
-    counts = {
-        'backgrounds': 0,
-        'objects': 0,
-        'scripts': 0,
-        'sounds': 0,
-    }
-
-    for room in resources['rooms']:
-        for res in room['resources']:
-            res_type = res['type']
-            if res_type == 'backgrounds':
-                counts['backgrounds'] += 1
-            elif res_type == 'objects':
-                counts['objects'] += 1
-            elif res_type == 'scripts':
-                counts['scripts'] += 1
-            elif res_type == 'sounds':
-                counts['sounds'] += 1
-
-    return counts
-
-
-def create_html_catalog():
-    """HTML 카탈로그 생성"""
+    """리소스 개수 집계 (매니페스트 인덱스만 사용 - 레코드를 읽지 않음)"""
+    manifest = open_manifest('decoded2')
+    return {res_type: manifest.count(res_type)
+            for res_type in ('backgrounds', 'objects', 'scripts', 'sounds')}
+
+
+def create_html_catalog(outputs):
+    """HTML 카탈로그 생성 (outputs: 출력 디렉토리 또는 PackReader)"""
     counts = count_resources()
 
     # CSS 스타일
@@ -108,9 +88,8 @@ def create_html_catalog():
             <div class="grid grid-3">
 """
 
-    backgrounds_dir = Path('backgrounds')
-    if backgrounds_dir.exists():
-        bg_files = sorted(backgrounds_dir.glob('*.png'))
+    if outputs.exists('backgrounds'):
+        bg_files = outputs.glob('backgrounds/*.png')
         for bg_file in bg_files:
             room_num = bg_file.stem.replace('room_', '')
             html += f"""
@@ -135,9 +114,8 @@ def create_html_catalog():
             <div class="grid grid-4">
 """
 
-    objects_dir = Path('objects_png_v3')
-    if objects_dir.exists():
-        obj_files = sorted(objects_dir.glob('*.png'))[:111]
+    if outputs.exists('objects_png_v3'):
+        obj_files = outputs.glob('objects_png_v3/*.png')[:111]
         for obj_file in obj_files:
             parts = obj_file.stem.split('_')
             room_num = parts[0]
@@ -158,23 +136,19 @@ def create_html_catalog():
 """
 
     # 스크립트 섹션
-    html += """
+    html += f"""
         <div class="section">
-            <h2>📜 스크립트 (Scripts) - 17개</h2>
+            <h2>📜 스크립트 (Scripts) - {counts['scripts']}개</h2>
             <div class="grid grid-2">
 """
 
-    disasm_dir = Path('disassembled')
-    if disasm_dir.exists():
-        script_files = []
-        for room_dir in sorted(disasm_dir.glob('room_*')):
-            for script_file in sorted(room_dir.glob('*.txt')):
-                script_files.append(script_file)
+    if outputs.exists('disassembled'):
+        script_files = outputs.glob('disassembled/room_*/*.txt')
 
         for script_file in script_files:
             room_num = script_file.parent.name.replace('room_', '')
             script_name = script_file.stem
-            size = script_file.stat().st_size
+            size = outputs.size(script_file)
             size_str = f'{size:,} bytes'
 
             html += f"""
@@ -192,6 +166,32 @@ def create_html_catalog():
         </div>
 """
 
+    # 스크립트 참조 섹션 (analyze/script_xref.json - 사운드/Room ID별 참조 스크립트)
+    xref = load_xref()
+    if xref is not None:
+        html += f"""
+        <div class="section">
+            <h2>🔗 스크립트 참조 (Cross-reference) - 글로벌/Room 스크립트 {len(xref)}개</h2>
+            <div class="grid grid-3">
+"""
+        for kind, label in (('sound', 'Sound'), ('room', 'Room')):
+            for value in xref.values(kind):
+                names = xref.scripts(kind, value)
+                shown = ', '.join(names[:5]) + (f' 외 {len(names) - 5}개' if len(names) > 5 else '')
+                html += f"""
+                <div class="list-item">
+                    <div style="flex: 1;">
+                        <div class="card-title">{label} {value}<span class="badge">{len(names)}개 스크립트</span></div>
+                        <div class="card-meta">{shown}</div>
+                    </div>
+                </div>
+"""
+
+        html += """
+            </div>
+        </div>
+"""
+
     # 사운드 섹션
     html += f"""
         <div class="section">
@@ -200,16 +200,15 @@ def create_html_catalog():
             <div class="grid grid-3">
 """
 
-    sounds_dir = Path('sounds_standard_midi')
-    if sounds_dir.exists():
-        sound_files = sorted(sounds_dir.glob('*.mid'))
+    if outputs.exists('sounds_standard_midi'):
+        sound_files = outputs.glob('sounds_standard_midi/*.mid')
 
         # 처음 50개만 표시
         for sound_file in sound_files[:50]:
             parts = sound_file.stem.split('_')
             room_num = parts[0]
             res_id = parts[1]
-            size = sound_file.stat().st_size
+            size = outputs.size(sound_file)
             size_str = f'{size:,} bytes'
 
             html += f"""
@@ -249,7 +248,7 @@ def create_html_catalog():
 
     # HTML 파일 저장
     output_path = Path('resource_catalog.html')
-    with open(output_path, 'w', encoding='utf-8') as f:
+    with span('write', nbytes=len(html)), open(output_path, 'w', encoding='utf-8') as f:
         f.write(html)
 
     return output_path
@@ -257,10 +256,14 @@ def create_html_catalog():
 
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description='LOOM 리소스 HTML 카탈로그 생성')
+    parser.add_argument('--pack', type=Path, help='출력 디렉토리 대신 읽을 아카이브 (tools/pack.py)')
+    args = parser.parse_args()
+
     print('📚 LOOM 리소스 카탈로그 생성')
     print('=' * 70)
 
-    output_path = create_html_catalog()
+    output_path = create_html_catalog(open_outputs(args.pack))
 
     print(f'\n✅ HTML 카탈로그 생성 완료!')
     print(f'   파일: {output_path.absolute()}')
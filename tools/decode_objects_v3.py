@@ -2,142 +2,23 @@
 """
 SCUMM v3 오브젝트 디코딩 v3
 GF_OLD_BUNDLE과 GF_SMALL_HEADER 모두 지원
+PNG는 출력 저장소(store.py)를 거쳐 objects_png_v3/에 복사 (LOOM_STORE_HARDLINK=1이면 hard link)
 """
+import io
 import json
+import argparse
 from pathlib import Path
 
-try:
-    from PIL import Image
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
-    print("⚠️  PIL 필요: pip3 install Pillow")
-    exit(1)
-
-
-# EGA 16색 팔레트
-EGA_PALETTE = [
-    (0x00, 0x00, 0x00),  # 0: Black
-    (0x00, 0x00, 0xAA),  # 1: Blue
-    (0x00, 0xAA, 0x00),  # 2: Green
-    (0x00, 0xAA, 0xAA),  # 3: Cyan
-    (0xAA, 0x00, 0x00),  # 4: Red
-    (0xAA, 0x00, 0xAA),  # 5: Magenta
-    (0xAA, 0x55, 0x00),  # 6: Brown
-    (0xAA, 0xAA, 0xAA),  # 7: Light Gray
-    (0x55, 0x55, 0x55),  # 8: Dark Gray
-    (0x55, 0x55, 0xFF),  # 9: Light Blue
-    (0x55, 0xFF, 0x55),  # 10: Light Green
-    (0x55, 0xFF, 0xFF),  # 11: Light Cyan
-    (0xFF, 0x55, 0x55),  # 12: Light Red
-    (0xFF, 0x55, 0xFF),  # 13: Light Magenta
-    (0xFF, 0xFF, 0x55),  # 14: Yellow
-    (0xFF, 0xFF, 0xFF),  # 15: White
-]
-
-
-def xor_decrypt(data):
-    """XOR 0xFF 복호화"""
-    return bytearray([b ^ 0xFF for b in data])
-
-
-def decode_strip_ega(data, pixels, strip_x, width, height):
-    """ScummVM drawStripEGA 구현"""
-    if len(data) == 0:
-        return
-
-    dst = [[0 for _ in range(8)] for _ in range(height)]
-
-    color = 0
-    run = 0
-    x = 0
-    y = 0
-    offset = 0
-
-    while x < 8 and offset < len(data):
-        color = data[offset]
-        offset += 1
-
-        if color & 0x80:  # RLE mode
-            run = color & 0x3F
-
-            if color & 0x40:  # Two-color dithering
-                if offset >= len(data):
-                    break
-                color = data[offset]
-                offset += 1
-
-                if run == 0:
-                    if offset >= len(data):
-                        break
-                    run = data[offset]
-                    offset += 1
-
-                for z in range(run):
-                    if x >= 8:
-                        break
-                    if y < height:
-                        pixel_color = (color & 0xF) if (z & 1) else (color >> 4)
-                        dst[y][x] = pixel_color
-
-                    y += 1
-                    if y >= height:
-                        y = 0
-                        x += 1
-
-            else:  # Repeat previous pixel
-                if run == 0:
-                    if offset >= len(data):
-                        break
-                    run = data[offset]
-                    offset += 1
-
-                for z in range(run):
-                    if x >= 8:
-                        break
-                    if y < height:
-                        if x > 0:
-                            dst[y][x] = dst[y][x - 1]
-                        else:
-                            dst[y][x] = 0
-
-                    y += 1
-                    if y >= height:
-                        y = 0
-                        x += 1
-
-        else:  # Single color run
-            run = color >> 4
-            if run == 0:
-                if offset >= len(data):
-                    break
-                run = data[offset]
-                offset += 1
-
-            pixel_color = color & 0xF
-            for z in range(run):
-                if x >= 8:
-                    break
-                if y < height:
-                    dst[y][x] = pixel_color
-
-                y += 1
-                if y >= height:
-                    y = 0
-                    x += 1
-
-    # Copy to main buffer
-    for row in range(height):
-        for col in range(8):
-            pixel_x = strip_x + col
-            if pixel_x < width:
-                pixel_index = row * width + pixel_x
-                if pixel_index < len(pixels):
-                    pixels[pixel_index] = dst[row][col]
-
-
-def try_decode_with_header_size(obim_data, header_size, default_height=32):
-    """특정 헤더 크기로 디코딩 시도"""
+from lfl_reader import LFLFile
+from parallel import add_jobs_argument, map_rooms
+from ega import decode_strip_into
+from png_writer import require_pil, save_indexed_png
+from profiling import profiled, span
+from store import RoomOutputs, default_store, source_version
+
+
+def try_decode_with_header_size(obim_data, header_size, default_height=32, decode_strip=decode_strip_into):
+    """특정 헤더 크기로 디코딩 시도 (decode_strip: strip 디코더, golden 기준 디코더 비교용)"""
 
     if len(obim_data) < header_size + 4:
         return None
@@ -205,7 +86,7 @@ def try_decode_with_header_size(obim_data, header_size, default_height=32):
         strip_data = obim_data[strip_offset:strip_end]
 
         if len(strip_data) > 0:
-            decode_strip_ega(strip_data, pixels, strip_idx * 8, width, height)
+            decode_strip(strip_data, pixels, strip_idx * 8, width, height)
 
     return {
         'width': width,
@@ -216,7 +97,7 @@ def try_decode_with_header_size(obim_data, header_size, default_height=32):
     }
 
 
-def decode_object_smart(obim_data, default_height=32):
+def decode_object_smart(obim_data, default_height=32, decode_strip=decode_strip_into):
     """스마트 디코딩: GF_OLD_BUNDLE과 GF_SMALL_HEADER 모두 시도"""
 
     if len(obim_data) < 16:
@@ -231,20 +112,20 @@ def decode_object_smart(obim_data, default_height=32):
         return None
 
     # 1. GF_SMALL_HEADER 시도 (8-byte header)
-    result = try_decode_with_header_size(obim_data, 8, default_height)
+    result = try_decode_with_header_size(obim_data, 8, default_height, decode_strip)
     if result:
         result['format'] = 'GF_SMALL_HEADER'
         return result
 
     # 2. GF_OLD_BUNDLE 시도 (0-byte header)
-    result = try_decode_with_header_size(obim_data, 0, default_height)
+    result = try_decode_with_header_size(obim_data, 0, default_height, decode_strip)
     if result:
         result['format'] = 'GF_OLD_BUNDLE'
         return result
 
     # 3. 다른 헤더 크기 시도 (2, 4, 6 bytes)
     for header_size in [2, 4, 6]:
-        result = try_decode_with_header_size(obim_data, header_size, default_height)
+        result = try_decode_with_header_size(obim_data, header_size, default_height, decode_strip)
         if result:
             result['format'] = f'CUSTOM_{header_size}'
             return result
@@ -253,30 +134,115 @@ def decode_object_smart(obim_data, default_height=32):
 
 
 def save_as_png(pixels, width, height, output_path):
-    """PNG로 저장"""
-    img = Image.new('RGB', (width, height))
-    rgb_data = []
+    """PNG로 저장 (EGA 팔레트 인덱스 PNG)"""
+    save_indexed_png(pixels, width, height, output_path)
 
-    for pixel in pixels:
-        r, g, b = EGA_PALETTE[pixel & 0x0F]
-        rgb_data.extend([r, g, b])
 
-    img.putdata(list(zip(rgb_data[0::3], rgb_data[1::3], rgb_data[2::3])))
-    img.save(output_path)
+def encode_object_png(obim_data):
+    """derive용 변환 함수: OBIM → (PNG bytes, 메타데이터) 또는 (None, None)"""
+    with span('decode', nbytes=len(obim_data)):
+        result = decode_object_smart(obim_data)
 
+    if result is None:
+        return None, None
 
-def process_all_objects_v3():
-    """전체 오브젝트 처리 v3 (개선된 디코더)"""
-    # objects_analysis.json 읽기
-    with open('analyze/objects_analysis.json', 'r') as f:
-        analysis = json.load(f)
+    png = io.BytesIO()
+    save_as_png(result['pixels'], result['width'], result['height'], png)
+    return png.getvalue(), {
+        'width': result['width'],
+        'height': result['height'],
+        'strips': result['num_strips'],
+        'format': result['format'],
+    }
 
-    output_dir = Path('objects_png_v3')
-    output_dir.mkdir(exist_ok=True)
 
-    print('🎮 전체 SCUMM v3 오브젝트 PNG 변환 v3 (개선)')
-    print('=' * 70)
+# 변환 결과 캐시 버전 (디코더/PNG 소스가 바뀌면 다시 변환)
+TOOLS_DIR = Path(__file__).resolve().parent
+DECODER_VERSION = source_version(__file__, TOOLS_DIR / 'ega.py', TOOLS_DIR / 'png_writer.py')
+
+OUTPUT_DIR = Path('objects_png_v3')
+ANALYSIS_PATH = Path('analyze/objects_analysis.json')
+RESULTS_PATH = Path('analyze/objects_png_v3_results.json')
+MAX_ROOMS = 5
+
+
+@profiled('room', room=lambda room: room['room'])
+def decode_room_objects(room):
+    """Room 하나의 오브젝트 디코딩 + PNG 저장 (병렬 worker에서도 호출)
+
+    Returns: {'total', 'empty', 'meta', 'failed', 'formats', 'objects'} 또는 None (LFL 없음)
+    """
+    room_num = room['room']
+    lfl_file = Path(f'{room_num}.LFL')
+
+    if not lfl_file.exists():
+        return None
+
+    # LFL mmap (OBIM 범위만 복호화)
+    room_data = LFLFile(lfl_file)
+
+    print(f'\n📂 Room {room_num} ({len(room["objects"])}개 오브젝트)')
+
+    room_output = OUTPUT_DIR / f'room_{room_num}'
+    room_output.mkdir(exist_ok=True)
+    outputs = RoomOutputs(OUTPUT_DIR.name, room_num, OUTPUT_DIR)
+
+    counts = {'total': 0, 'empty': 0, 'meta': 0, 'failed': 0}
+    formats = {}
+    objects = []
+
+    # 각 오브젝트 처리
+    for obj in room['objects']:
+        counts['total'] += 1
+        obj_id = obj['id']
+        obim_offset = obj['obim_offset']
+        obim_size = obj['obim_size']
+
+        # 빈 오브젝트
+        if obim_size == 0:
+            counts['empty'] += 1
+            continue
+
+        # 19-byte 메타데이터
+        if obim_size == 19:
+            counts['meta'] += 1
+            continue
+
+        obim_data = room_data[obim_offset:obim_offset + obim_size]
+
+        # 스마트 디코딩 + PNG (같은 OBIM은 저장소에서 한 번만 변환)
+        digest, result = default_store().derive('object_png', DECODER_VERSION, obim_data, encode_object_png)
+
+        if digest is None:
+            counts['failed'] += 1
+            continue
+
+        # 포맷 통계
+        fmt = result['format']
+        formats[fmt] = formats.get(fmt, 0) + 1
+
+        # PNG 저장
+        output_path = room_output / f'object_{obj_id:03d}.png'
+        outputs.link(output_path, digest)
+
+        objects.append({
+            'room': room_num,
+            'object_id': obj_id,
+            'width': result['width'],
+            'height': result['height'],
+            'strips': result['strips'],
+            'format': fmt,
+            'file': str(output_path)
+        })
 
+    room_data.close()
+    outputs.save()
+
+    return {**counts, 'formats': formats, 'objects': objects}
+
+
+def merge_object_results(room_results):
+    """Room별 결과 → (stats, 전체 오브젝트 목록) (Room 순서대로 병합)"""
     stats = {
         'total': 0,
         'success': 0,
@@ -288,73 +254,52 @@ def process_all_objects_v3():
 
     all_results = []
 
-    # 각 Room 처리
-    for room in analysis['rooms'][:5]:  # 처음 5개 Room
-        room_num = room['room']
-        lfl_file = Path(f'{room_num}.LFL')
-
-        if not lfl_file.exists():
+    for room_result in room_results:
+        if room_result is None:
             continue
 
-        # LFL 읽기
-        with open(lfl_file, 'rb') as f:
-            encrypted = f.read()
-        room_data = xor_decrypt(encrypted)
+        for key in ('total', 'failed', 'empty', 'meta'):
+            stats[key] += room_result[key]
+        for fmt, count in room_result['formats'].items():
+            stats['formats'][fmt] = stats['formats'].get(fmt, 0) + count
 
-        print(f'\n📂 Room {room_num} ({len(room["objects"])}개 오브젝트)')
-
-        room_output = output_dir / f'room_{room_num}'
-        room_output.mkdir(exist_ok=True)
-
-        # 각 오브젝트 처리
-        for obj in room['objects']:
-            stats['total'] += 1
-            obj_id = obj['id']
-            obim_offset = obj['obim_offset']
-            obim_size = obj['obim_size']
+        for obj_result in room_result['objects']:
+            stats['success'] += 1
 
-            # 빈 오브젝트
-            if obim_size == 0:
-                stats['empty'] += 1
-                continue
+            # 진행 상황 (10개마다)
+            if stats['success'] % 10 == 0:
+                print(f'   ✅ {stats["success"]}개 완료...')
 
-            # 19-byte 메타데이터
-            if obim_size == 19:
-                stats['meta'] += 1
-                continue
+            all_results.append(obj_result)
 
-            obim_data = room_data[obim_offset:obim_offset + obim_size]
+    return stats, all_results
 
-            # 스마트 디코딩
-            result = decode_object_smart(obim_data)
 
-            if result is None:
-                stats['failed'] += 1
-                continue
+def save_object_results(stats, all_results, result_path=RESULTS_PATH):
+    """결과 JSON 저장"""
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'stats': stats,
+            'objects': all_results
+        }, f, indent=2, ensure_ascii=False)
+    return result_path
 
-            # 포맷 통계
-            fmt = result['format']
-            stats['formats'][fmt] = stats['formats'].get(fmt, 0) + 1
 
-            # PNG 저장
-            output_path = room_output / f'object_{obj_id:03d}.png'
-            save_as_png(result['pixels'], result['width'], result['height'], output_path)
+def process_all_objects_v3(jobs=1):
+    """전체 오브젝트 처리 v3 (개선된 디코더, jobs > 1이면 Room 단위 병렬)"""
+    # objects_analysis.json 읽기
+    with open(ANALYSIS_PATH, 'r') as f:
+        analysis = json.load(f)
 
-            stats['success'] += 1
+    output_dir = OUTPUT_DIR
+    output_dir.mkdir(exist_ok=True)
 
-            # 진행 상황 (10개마다)
-            if stats['success'] % 10 == 0:
-                print(f'   ✅ {stats["success"]}개 완료...')
+    print('🎮 전체 SCUMM v3 오브젝트 PNG 변환 v3 (개선)')
+    print('=' * 70)
 
-            all_results.append({
-                'room': room_num,
-                'object_id': obj_id,
-                'width': result['width'],
-                'height': result['height'],
-                'strips': result['num_strips'],
-                'format': fmt,
-                'file': str(output_path)
-            })
+    # 각 Room 처리 → Room 순서대로 병합
+    rooms = analysis['rooms'][:MAX_ROOMS]  # 처음 5개 Room
+    stats, all_results = merge_object_results(map_rooms(decode_room_objects, rooms, jobs))
 
     # 결과 출력
     print('\n' + '=' * 70)
@@ -370,15 +315,15 @@ def process_all_objects_v3():
     print(f'\n   출력: {output_dir.absolute()}/')
 
     # 결과 JSON 저장
-    result_path = Path('analyze/objects_png_v3_results.json')
-    with open(result_path, 'w', encoding='utf-8') as f:
-        json.dump({
-            'stats': stats,
-            'objects': all_results
-        }, f, indent=2, ensure_ascii=False)
+    result_path = save_object_results(stats, all_results)
 
     print(f'   결과: {result_path}')
 
 
 if __name__ == '__main__':
-    process_all_objects_v3()
+    parser = argparse.ArgumentParser(description='SCUMM v3 오브젝트 → PNG (objects_png_v3/)')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    require_pil()
+    process_all_objects_v3(args.jobs)
@@ -1,42 +1,31 @@
 #!/usr/bin/env python3
 """
 SCUMM v3 스크립트 디스어셈블
-descumm 도구를 사용하여 모든 스크립트를 읽을 수 있는 형태로 변환
+scumm_v3.py 디코더로 모든 스크립트를 한 프로세스 안에서 읽을 수 있는 형태로 변환 (descumm 불필요)
 """
-import json
-import subprocess
+from itertools import groupby
 from pathlib import Path
 
-
-DESCUMM_PATH = '/tmp/scummvm-tools/descumm'
+from manifest import open_manifest
+from profiling import span
+from scumm_v3 import disassemble, format_listing
 
 
 def disassemble_script(input_path, output_path):
-    """descumm으로 스크립트 디스어셈블"""
-    try:
-        result = subprocess.run(
-            [DESCUMM_PATH, '-3', '-u', str(input_path)],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-
-        if result.returncode != 0:
-            return False, f'Error: {result.stderr}'
+    """스크립트 디스어셈블 → (성공 여부, 오류)
 
-        # 출력 저장
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(f'// Disassembled from: {input_path.name}\n')
-            f.write(f'// SCUMM v3 script\n')
-            f.write('=' * 70 + '\n\n')
-            f.write(result.stdout)
+    디코딩할 수 없는 명령을 만나면 그때까지의 listing을 저장하고 실패로 보고
+    """
+    lines, error = disassemble(input_path.read_bytes())
+    listing = format_listing(lines, error)
 
-        return True, None
+    with span('write', nbytes=len(listing)), open(output_path, 'w', encoding='utf-8') as f:
+        f.write(f'// Disassembled from: {input_path.name}\n')
+        f.write(f'// SCUMM v3 script\n')
+        f.write('=' * 70 + '\n\n')
+        f.write(listing)
 
-    except subprocess.TimeoutExpired:
-        return False, 'Timeout'
-    except Exception as e:
-        return False, str(e)
+    return error is None, error
 
 
 def disassemble_all():
@@ -45,33 +34,22 @@ def disassemble_all():
     output_dir = Path('disassembled')
     output_dir.mkdir(exist_ok=True)
 
-    # descumm 도구 확인
-    if not Path(DESCUMM_PATH).exists():
-        print(f'❌ descumm 도구를 찾을 수 없습니다: {DESCUMM_PATH}')
-        print('   /tmp/scummvm-tools/descumm이 빌드되어 있어야 합니다.')
-        return
-
     print('📜 SCUMM v3 스크립트 디스어셈블 시작')
     print('=' * 70)
 
-    # resources.json 읽기
-    with open(decoded_dir / 'resources.json', 'r') as f:
-        resources_data = json.load(f)
+    # 스크립트 레코드만 읽기 (resources.bin 인덱스, Room 순)
+    manifest = open_manifest(decoded_dir)
 
     total = 0
     success = 0
     failed = 0
 
-    for room in resources_data['rooms']:
-        room_num = room['room']
-        room_num_int = int(room_num) if isinstance(room_num, str) else room_num
+    for room_num, room_scripts in groupby(manifest.records(res_type='scripts'), key=lambda r: r['room']):
+        room_num_int = int(room_num)
         room_dir = decoded_dir / f'room_{room_num}'
         output_room_dir = output_dir / f'room_{room_num}'
 
-        scripts = [r for r in room['resources'] if r['type'] == 'scripts']
-
-        if not scripts:
-            continue
+        scripts = list(room_scripts)
 
         output_room_dir.mkdir(exist_ok=True)
 
@@ -0,0 +1,180 @@
+"""
+EGA 16색 strip 디코더 (ScummVM Gdi::drawStripEGA)
+RLE 명령 하나를 픽셀 단위가 아닌 열(column) 단위 슬라이스 쓰기로 펼친다
+"""
+from profiling import span
+
+
+# EGA 16색 팔레트
+EGA_PALETTE = [
+    (0x00, 0x00, 0x00),  # 0: Black
+    (0x00, 0x00, 0xAA),  # 1: Blue
+    (0x00, 0xAA, 0x00),  # 2: Green
+    (0x00, 0xAA, 0xAA),  # 3: Cyan
+    (0xAA, 0x00, 0x00),  # 4: Red
+    (0xAA, 0x00, 0xAA),  # 5: Magenta
+    (0xAA, 0x55, 0x00),  # 6: Brown
+    (0xAA, 0xAA, 0xAA),  # 7: Light Gray
+    (0x55, 0x55, 0x55),  # 8: Dark Gray
+    (0x55, 0x55, 0xFF),  # 9: Light Blue
+    (0x55, 0xFF, 0x55),  # 10: Light Green
+    (0x55, 0xFF, 0xFF),  # 11: Light Cyan
+    (0xFF, 0x55, 0x55),  # 12: Light Red
+    (0xFF, 0x55, 0xFF),  # 13: Light Magenta
+    (0xFF, 0xFF, 0x55),  # 14: Yellow
+    (0xFF, 0xFF, 0xFF),  # 15: White
+]
+
+STRIP_WIDTH = 8
+
+
+def draw_strip_ega(src, dst, base, xstep, ystep, height):
+    """strip 하나를 dst에 디코딩
+
+    픽셀 (x, y)는 dst[base + x * xstep + y * ystep]에 쓴다.
+    - strip 버퍼 (column-major): xstep=height, ystep=1
+    - 프레임 버퍼 (row-major, 폭 W): base=strip_x, xstep=1, ystep=W
+    """
+    if height <= 0:
+        return
+
+    size = len(src)
+    x = 0
+    y = 0
+    offset = 0
+
+    while x < STRIP_WIDTH and offset < size:
+        color = src[offset]
+        offset += 1
+
+        if color & 0x80:  # RLE mode
+            run = color & 0x3F
+
+            if color & 0x40:  # Two-color dithering
+                if offset >= size:
+                    break
+                color = src[offset]
+                offset += 1
+                pattern = bytes((color >> 4, color & 0xF))
+                mode = 1
+            else:  # Repeat previous pixel (왼쪽 열)
+                pattern = None
+                mode = 2
+
+            if run == 0:
+                if offset >= size:
+                    break
+                run = src[offset]
+                offset += 1
+
+        else:  # Single color run
+            run = color >> 4
+            if run == 0:
+                if offset >= size:
+                    break
+                run = src[offset]
+                offset += 1
+            pattern = bytes((color & 0xF,))
+            mode = 0
+
+        # run을 열 단위 구간으로 나눠 한 번에 쓰기
+        z = 0
+        while run > 0 and x < STRIP_WIDTH:
+            n = min(run, height - y)
+            start = base + x * xstep + y * ystep
+            stop = start + n * ystep
+
+            if mode == 0:
+                dst[start:stop:ystep] = pattern * n
+            elif mode == 1:
+                phase = z & 1
+                dst[start:stop:ystep] = (pattern * ((n + phase) // 2 + 1))[phase:phase + n]
+            elif x > 0:
+                dst[start:stop:ystep] = dst[start - xstep:stop - xstep:ystep]
+            else:
+                dst[start:stop:ystep] = bytes(n)
+
+            run -= n
+            z += n
+            y += n
+            if y >= height:
+                y = 0
+                x += 1
+
+
+def decode_strip_ega(src, height):
+    """strip 하나 → column-major bytearray (8 × height, 픽셀 (x, y) = [x * height + y])"""
+    dst = bytearray(STRIP_WIDTH * max(height, 0))
+    draw_strip_ega(src, dst, 0, height, 1, height)
+    return dst
+
+
+def blit_strip(strip, pixels, strip_x, width, height):
+    """column-major strip → row-major 이미지 버퍼 (폭 밖의 열은 잘라냄)"""
+    for col in range(STRIP_WIDTH):
+        pixel_x = strip_x + col
+        if pixel_x >= width:
+            break
+        pixels[pixel_x:pixel_x + height * width:width] = strip[col * height:(col + 1) * height]
+
+
+def decode_strip_into(src, pixels, strip_x, width, height):
+    """strip 하나를 row-major 이미지 버퍼(폭 width)의 strip_x 열에 디코딩"""
+    if strip_x + STRIP_WIDTH <= width:
+        draw_strip_ega(src, pixels, strip_x, 1, width, height)
+    else:
+        blit_strip(decode_strip_ega(src, height), pixels, strip_x, width, height)
+
+
+class Frame:
+    """row-major 8-bit 팔레트 인덱스 프레임 버퍼 (height × width)
+
+    `buf`(bytearray)나 `pixels`(memoryview)를 PIL frombuffer 등에 넘기면 복사 없이 사용 가능
+    (Frame 자체는 buffer가 아님: `__buffer__`는 Python 3.12+에서만 동작하므로 정의하지 않음)
+    """
+
+    __slots__ = ('width', 'height', 'buf')
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.buf = bytearray(width * height)
+
+    @property
+    def pixels(self):
+        """1D memoryview (row-major, 픽셀 (x, y) = [y * width + x])"""
+        return memoryview(self.buf)
+
+    def view(self):
+        """2D memoryview (frame.view()[y, x])"""
+        return memoryview(self.buf).cast('B', (self.height, self.width))
+
+    def row(self, y):
+        """y번째 행 memoryview"""
+        return memoryview(self.buf)[y * self.width:(y + 1) * self.width]
+
+    def draw_strip(self, src, strip_x):
+        """strip 하나를 strip_x 열에 디코딩"""
+        decode_strip_into(src, self.buf, strip_x, self.width, self.height)
+
+    def count_nonzero(self):
+        return len(self.buf) - self.buf.count(0)
+
+
+def render_strips(data, strip_offsets, width, height):
+    """strip 절대 offset 목록 → Frame (strip 끝 = 다음 offset 또는 데이터 끝)
+
+    폭 안에 들어가는 strip만 프레임 버퍼의 해당 열에 바로 디코딩한다.
+    """
+    frame = Frame(width, height)
+    data = memoryview(data)
+    num_strips = len(strip_offsets)
+
+    with span('decode') as s:
+        for i in range(min(num_strips, width // STRIP_WIDTH)):
+            start = strip_offsets[i]
+            end = strip_offsets[i + 1] if i < num_strips - 1 else len(data)
+            frame.draw_strip(data[start:end], i * STRIP_WIDTH)
+            s.add_bytes(end - start)
+
+    return frame
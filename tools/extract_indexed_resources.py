@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+LOOM 리소스 추출 (디렉토리 기반)
+00.LFL 디렉토리(코스튬/스크립트/사운드 → Room, offset)와 Room 블록 헤더(entry/exit/로컬 스크립트)로
+정확한 범위와 타입을 얻어 decoded2/resources.json과 같은 스키마로 저장
+(extract_resources.py의 휴리스틱 블록 탐색 + 크기/엔트로피 분류를 사용하지 않음)
+출력 파일 쓰기는 store.py 기본값대로 복사 (LOOM_STORE_HARDLINK=1이면 hard link)
+"""
+import argparse
+import json
+import shutil
+from functools import partial
+from pathlib import Path
+
+from lfl_reader import read_lfl
+from room import parse_room, parse_room_blocks, rebuild_room_image
+from resource_index import RESOURCE_HEADER_SIZE, load_index
+from extract_resources import calculate_entropy
+from parallel import add_jobs_argument, map_rooms
+from profiling import profiled
+from manifest import write_manifest
+from store import RoomOutputs
+
+
+OUTPUT_DIR = Path('decoded2_index')
+
+# 00.LFL 디렉토리 타입 → decoded2 타입 디렉토리
+DIRECTORY_TYPES = {
+    'costume': 'costumes',
+    'script': 'scripts',
+    'sound': 'sounds',
+}
+
+TYPE_EMOJI = {
+    'background': '🖼️ ',
+    'costumes': '🎭',
+    'scripts': '📜',
+    'sounds': '🔊',
+    'unknown': '❓',
+}
+
+
+def collect_room_entries(index):
+    """00.LFL 디렉토리 → {Room 번호: [(타입, 리소스 ID, offset)]} (offset 순)"""
+    rooms = {}
+    for res_type in DIRECTORY_TYPES:
+        for res_id, room, offset in index.directory(res_type):
+            rooms.setdefault(room, []).append((res_type, res_id, offset))
+    for entries in rooms.values():
+        entries.sort(key=lambda entry: entry[2])
+    return rooms
+
+
+def read_block(data, offset, start):
+    """리소스 블록 크기 (헤더의 u16, 헤더 포함) → size 또는 0 (Room 블록 안/파일 밖)"""
+    if offset < start or offset + RESOURCE_HEADER_SIZE > len(data):
+        return 0
+    size = data[offset] | (data[offset + 1] << 8)
+    if size < RESOURCE_HEADER_SIZE or offset + size > len(data):
+        return 0
+    return size
+
+
+def unclaimed_spans(start, end, claimed):
+    """[start, end)에서 claimed 범위 [(offset, size)]가 덮지 않는 구간"""
+    gaps = []
+    pos = start
+    for offset, size in sorted(claimed):
+        if offset > pos:
+            gaps.append((pos, offset - pos))
+        pos = max(pos, offset + size)
+    if pos < end:
+        gaps.append((pos, end - pos))
+    return gaps
+
+
+@profiled('room', room=lambda unit, output_base: unit[0])
+def extract_room(unit, output_base):
+    """Room 하나 추출 → room_info (병렬 worker에서도 호출)
+
+    unit: (Room 번호 문자열, [(디렉토리 타입, 리소스 ID, offset)])
+    """
+    room_num_str, entries = unit
+    lfl_file = Path(f'{room_num_str}.LFL')
+
+    print(f'\n📂 {lfl_file.name} 처리 중...')
+
+    data = read_lfl(lfl_file)
+    room = parse_room(data)
+    blocks = parse_room_blocks(data)
+    if blocks is None:
+        print('   ⚠️  Room 블록 헤더 없음')
+        return None
+
+    print(f'   Room: {room.width}×{room.height}px, 블록 {blocks.block_size:,} / {len(data):,} bytes')
+
+    room_dir = output_base / f'room_{room_num_str}'
+    room_info = {
+        'room_number': int(room_num_str),
+        'width': room.width,
+        'height': room.height,
+        'resources': [],
+        'invalid': 0,
+    }
+    outputs = RoomOutputs(output_base.name, room_num_str, output_base)
+
+    def save(res_type, subtype, res_id, filename, block, offset):
+        type_dir = room_dir / res_type
+        type_dir.mkdir(parents=True, exist_ok=True)
+        outputs.write(type_dir / filename, block)
+
+        print(f'   {TYPE_EMOJI[res_type]} [{res_id}] {res_type}/{filename} - {len(block)} bytes @0x{offset:04X}')
+        room_info['resources'].append({
+            'id': res_id,
+            'type': res_type,
+            'subtype': subtype,
+            'filename': filename,
+            'path': f'room_{room_num_str}/{res_type}/{filename}',
+            'offset': offset,
+            'size': len(block),
+            'entropy': f'{calculate_entropy(block):.3f}',
+            'reconstructed': False
+        })
+
+    # 배경 이미지 재구성 (decoded2와 같은 포맷)
+    rebuilt = rebuild_room_image(data, room)
+    if rebuilt:
+        reconstructed, img_width, img_height, num_strips = rebuilt
+        save('background', 'image', 0, 'background.bin', reconstructed, room.smap_ptr)
+        room_info['resources'][-1].update({
+            'width': img_width,
+            'height': img_height,
+            'strips': num_strips,
+            'reconstructed': True
+        })
+
+    # Room 블록 안의 스크립트 (entry/exit/로컬)
+    for kind, script_id, offset, size in blocks.script_spans():
+        filename = f'{room_num_str}_{kind}.bin' if kind != 'local' else f'{room_num_str}_local{script_id:03d}.bin'
+        save('scripts', kind, script_id, filename, data[offset:offset + size], offset)
+
+    # 00.LFL 디렉토리가 가리키는 글로벌 리소스 (Room 블록 뒤)
+    claimed = []
+    for dir_type, res_id, offset in entries:
+        size = read_block(data, offset, blocks.block_size)
+        if not size:
+            room_info['invalid'] += 1
+            print(f'   ⚠️  {dir_type} {res_id} @0x{offset:04X} - 범위를 벗어난 디렉토리 항목')
+            continue
+        claimed.append((offset, size))
+        save(DIRECTORY_TYPES[dir_type], 'global', res_id, f'{room_num_str}_{dir_type}{res_id:03d}.bin',
+             data[offset:offset + size], offset)
+
+    # 디렉토리에 없는 구간
+    for offset, size in unclaimed_spans(blocks.block_size, len(data), claimed):
+        save('unknown', 'unindexed', 0, f'{room_num_str}_unindexed_{offset:05X}.bin',
+             data[offset:offset + size], offset)
+
+    outputs.save()
+    return room_info
+
+
+def create_resources_json(all_rooms, output_path):
+    """resources.json 생성 (decoded2 스키마 + costumes 개수)"""
+    type_counts = dict.fromkeys(('background', 'graphics', 'costumes', 'sounds', 'scripts',
+                                 'palettes', 'unknown'), 0)
+    total_resources = 0
+    for room_info in all_rooms.values():
+        total_resources += len(room_info['resources'])
+        for res in room_info['resources']:
+            type_counts[res['type']] += 1
+
+    resources_data = {
+        'game': 'LOOM',
+        'version': 'SCUMM v3',
+        'format': 'decoded',
+        'source': '00.LFL directory',
+        'total_rooms': len(all_rooms),
+        'total_resources': total_resources,
+        'background_images': type_counts['background'],
+        'graphics': type_counts['graphics'],
+        'costumes': type_counts['costumes'],
+        'sounds': type_counts['sounds'],
+        'scripts': type_counts['scripts'],
+        'palettes': type_counts['palettes'],
+        'unknown': type_counts['unknown'],
+        'rooms': []
+    }
+
+    for room_num, room_info in sorted(all_rooms.items()):
+        resources_data['rooms'].append({
+            'room': room_num,
+            'width': room_info['width'],
+            'height': room_info['height'],
+            'total_resources': len(room_info['resources']),
+            'resources': room_info['resources']
+        })
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(resources_data, f, indent=2, ensure_ascii=False)
+    write_manifest(resources_data, output_path.with_suffix('.bin'))
+
+    return resources_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LOOM 리소스 추출 (00.LFL 디렉토리 기반)')
+    parser.add_argument('--output', type=Path, default=OUTPUT_DIR,
+                        help=f'출력 디렉토리 (기본 {OUTPUT_DIR}, decoded2로 지정하면 후속 도구가 그대로 사용)')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    print('🎮 LOOM 리소스 추출 (00.LFL 디렉토리 기반)')
+    print('=' * 70)
+
+    if not Path('00.LFL').exists():
+        print('❌ 00.LFL 리소스 인덱스를 찾을 수 없습니다!')
+        return
+
+    index = load_index()
+    room_entries = collect_room_entries(index)
+
+    # 인덱스의 Room 중 LFL 파일이 있는 것만
+    units = []
+    for room_id, _, _ in index.directory('room'):
+        if index.room_path(room_id).exists():
+            units.append((f'{room_id:02d}', room_entries.get(room_id, [])))
+
+    missing = sorted(room for room in room_entries if not index.room_path(room).exists())
+    print(f'\n📁 Room {len(units)}개')
+    if missing:
+        print(f'   ⚠️  LFL 파일이 없는 Room: {", ".join(map(str, missing))}')
+
+    if args.output.exists():
+        shutil.rmtree(args.output)
+    args.output.mkdir(parents=True)
+
+    all_rooms = {}
+    invalid = 0
+    extract = partial(extract_room, output_base=args.output)
+    for (room_num_str, _), room_info in zip(units, map_rooms(extract, units, args.jobs)):
+        if room_info is None:
+            continue
+        invalid += room_info.pop('invalid')
+        all_rooms[room_num_str] = room_info
+
+    print('\n📊 resources.json 생성 중...')
+    resources_data = create_resources_json(all_rooms, args.output / 'resources.json')
+
+    print('\n' + '=' * 70)
+    print('✅ 추출 완료!')
+    print(f'   총 Room: {resources_data["total_rooms"]}개')
+    print(f'   총 리소스: {resources_data["total_resources"]}개')
+    print(f'      🖼️  배경 이미지: {resources_data["background_images"]}개 (재구성됨)')
+    print(f'      🎭 코스튬: {resources_data["costumes"]}개')
+    print(f'      🔊 사운드: {resources_data["sounds"]}개')
+    print(f'      📜 스크립트: {resources_data["scripts"]}개')
+    print(f'      ❓ 디렉토리 밖 구간: {resources_data["unknown"]}개')
+    if invalid:
+        print(f'   ⚠️  범위를 벗어난 디렉토리 항목: {invalid}개')
+    print(f'\n   출력 디렉토리: {args.output}/')
+    print(f'   리소스 맵: {args.output / "resources.json"}')
+
+
+if __name__ == '__main__':
+    main()
@@ -6,112 +6,51 @@ ScummVM object.cpp의 ScummEngine_v3old::resetRoomObjects() 구현
 import json
 from pathlib import Path
 
+from room_cache import load_room
+from profiling import profiled
 
-def xor_decrypt(data):
-    """XOR 0xFF 복호화"""
-    return bytearray([b ^ 0xFF for b in data])
 
+ANALYSIS_PATH = Path('analyze/objects_analysis.json')
 
+
+@profiled('room', room=lambda lfl_path: Path(lfl_path).stem)
 def extract_objects_from_room(lfl_path):
     """SCUMM v3 Room에서 오브젝트 추출"""
-    # LFL 파일 읽기 및 복호화
-    with open(lfl_path, 'rb') as f:
-        encrypted = f.read()
-    data = xor_decrypt(encrypted)
+    # 파싱된 Room 모델 (파일 stat 기반 캐시, 미스일 때도 헤더/테이블 범위만 복호화)
+    room = load_room(lfl_path)
 
-    # Room 헤더 파싱
-    if len(data) < 32:
+    if room.size < 32:
         return None
 
-    width = data[4] | (data[5] << 8)
-    height = data[6] | (data[7] << 8)
+    width = room.width
+    height = room.height
 
     print(f'\n📂 {lfl_path.name}')
     print(f'   Room: {width}×{height}px')
 
     # SCUMM v3: 오브젝트 테이블은 offset 29부터 시작
     # ScummVM object.cpp line 920-921
-    obj_table_offset = 29
-
-    # 먼저 오브젝트 개수를 알아야 함
-    # Resource table에서 추정
-    resource_table_start = 0x0A
-
-    # Resource 0 (SMAP) offset 읽기
-    smap_offset = data[resource_table_start] | (data[resource_table_start + 1] << 8)
-
-    # 오브젝트 테이블은 29 ~ smap_offset 사이
-    # 각 오브젝트: 2 bytes (OBIM offset) + 나중에 2 bytes (OBCD offset)
-    # 총 테이블 크기를 4로 나누면 오브젝트 개수
-
-    # 더 정확한 방법: offset 29에서 시작해서 offset들을 읽어봄
-    ptr = obj_table_offset
-    obim_offsets = []
-    obcd_offsets = []
-
-    # 최대 200개까지 시도
-    for i in range(200):
-        if ptr + 1 >= len(data):
-            break
-
-        offset = data[ptr] | (data[ptr + 1] << 8)
-
-        # Offset이 0이거나 파일 범위를 벗어나면 끝
-        if offset == 0 or offset >= len(data):
-            break
-
-        obim_offsets.append(offset)
-        ptr += 2
-
-    num_objects = len(obim_offsets)
+    num_objects = len(room.objects)
 
     if num_objects == 0:
         print('   ⚠️  오브젝트 없음')
         return None
 
-    # OBCD offsets 읽기
-    for i in range(num_objects):
-        if ptr + 1 >= len(data):
-            break
-        offset = data[ptr] | (data[ptr + 1] << 8)
-        obcd_offsets.append(offset)
-        ptr += 2
-
     print(f'   오브젝트 개수: {num_objects}개')
 
-    # 각 오브젝트 분석
+    # 각 오브젝트 (OBIM 범위는 Room 모델에서 계산됨)
+    # SCUMM v3 GF_OLD_BUNDLE: 헤더 없이 바로 이미지 데이터
+    # GF_SMALL_HEADER: 8바이트 헤더
     objects = []
-    for i in range(num_objects):
-        obim_offset = obim_offsets[i]
-        obcd_offset = obcd_offsets[i] if i < len(obcd_offsets) else 0
-
-        obj_info = {
-            'id': i,
-            'obim_offset': obim_offset,
-            'obcd_offset': obcd_offset,
-        }
-
-        # OBIM 데이터 크기 추정
-        if i < num_objects - 1:
-            # 다음 OBIM 또는 첫 OBCD까지
-            next_offset = obim_offsets[i + 1] if i + 1 < len(obim_offsets) else obcd_offsets[0]
-            obim_size = next_offset - obim_offset
-        else:
-            # 마지막 오브젝트: OBCD까지
-            obim_size = obcd_offset - obim_offset if obcd_offset > obim_offset else 100
-
-        # OBIM 데이터 추출
-        if obim_offset < len(data):
-            obim_data = data[obim_offset:obim_offset + obim_size]
-            obj_info['obim_size'] = len(obim_data)
-
-            # OBIM 구조 간단 분석
-            # SCUMM v3 GF_OLD_BUNDLE: 헤더 없이 바로 이미지 데이터
-            # GF_SMALL_HEADER: 8바이트 헤더
-
-            print(f'   [{i}] OBIM@{obim_offset:04X} ({len(obim_data)} bytes), OBCD@{obcd_offset:04X}')
-
-        objects.append(obj_info)
+    for obj in room.objects:
+        objects.append({
+            'id': obj.id,
+            'obim_offset': obj.obim_offset,
+            'obcd_offset': obj.obcd_offset,
+            'obim_size': obj.obim_size,
+        })
+
+        print(f'   [{obj.id}] OBIM@{obj.obim_offset:04X} ({obj.obim_size} bytes), OBCD@{obj.obcd_offset:04X}')
 
     return {
         'room': lfl_path.stem,
@@ -122,6 +61,18 @@ def extract_objects_from_room(lfl_path):
     }
 
 
+def save_objects_analysis(all_rooms, output_path=ANALYSIS_PATH):
+    """Room별 오브젝트 정보 → objects_analysis.json"""
+    output_path.parent.mkdir(exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'total_rooms': len(all_rooms),
+            'total_objects': sum(room_info['num_objects'] for room_info in all_rooms),
+            'rooms': all_rooms
+        }, f, indent=2, ensure_ascii=False)
+    return output_path
+
+
 def main():
     """모든 Room 처리"""
     print('🎮 SCUMM v3 오브젝트 추출')
@@ -145,14 +96,7 @@ def main():
     print(f'   총 오브젝트: {total_objects}개')
 
     # JSON 저장
-    output_path = Path('analyze/objects_analysis.json')
-    output_path.parent.mkdir(exist_ok=True)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump({
-            'total_rooms': len(all_rooms),
-            'total_objects': total_objects,
-            'rooms': all_rooms
-        }, f, indent=2, ensure_ascii=False)
+    output_path = save_objects_analysis(all_rooms)
 
     print(f'   출력: {output_path}')
 
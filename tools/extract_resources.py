@@ -2,108 +2,184 @@
 """
 LOOM LFL 파일에서 리소스 추출
 브라우저 뷰어에서 사용할 수 있도록 out/ 디렉토리에 추출
+블록 파일은 출력 저장소(store.py)에 한 번 저장하고 out/에는 복사본을 둔다 (LOOM_STORE_HARDLINK=1이면 hard link)
 """
 import os
 import struct
 import json
 import math
+import argparse
 from pathlib import Path
 from collections import Counter
-
-def xor_decrypt(data):
-    """XOR 0xFF 복호화"""
-    return bytearray([b ^ 0xFF for b in data])
-
-def calculate_entropy(data):
-    """엔트로피 계산 (0.0 ~ 1.0)"""
-    if len(data) == 0:
+from functools import partial
+
+from lfl_reader import read_lfl
+from parallel import add_jobs_argument, map_rooms
+from profiling import profiled, span
+from manifest import write_manifest
+from store import RoomOutputs
+
+# 분류 임계값 (엔트로피 0.0 ~ 1.0, 크기 bytes)
+SCRIPT_MAX_ENTROPY = 0.3
+GRAPHICS_MIN_SIZE = 1000
+GRAPHICS_MIN_ENTROPY = 0.7
+SOUND_MAX_SIZE = 2000
+SOUND_MIN_ENTROPY = 0.6
+PALETTE_MAX_SIZE = 100
+
+# c * log2(c) 테이블 (필요한 최대 블록 크기까지 늘림)
+_count_log2 = [0.0]
+
+def count_log2_table(total):
+    """[c * log2(c) for c in 0..total] (심볼마다 log2/나눗셈을 하지 않도록 재사용)"""
+    table = _count_log2
+    if len(table) <= total:
+        table.extend(c * math.log2(c) for c in range(len(table), total + 1))
+    return table
+
+def entropy_from_counts(counts, total):
+    """바이트 히스토그램 → 엔트로피 (0.0 ~ 1.0)
+
+    H = log2(N) - Σ c·log2(c) / N  (c·log2(c)는 테이블 조회)
+    """
+    if total == 0:
         return 0.0
 
-    counter = Counter(data)
-    entropy = 0.0
-    for count in counter.values():
-        p = count / len(data)
-        if p > 0:
-            entropy -= p * math.log2(p)
+    table = count_log2_table(total)
+    entropy = math.log2(total) - sum(table[count] for count in counts) / total
 
-    # 0-8 범위를 0-1로 정규화
+    # 0-8 범위를 0-1로 정규화 (반올림 오차로 생기는 음수는 0)
     max_entropy = 8.0
-    return min(entropy / max_entropy, 1.0)
+    return min(max(entropy, 0.0) / max_entropy, 1.0)
 
-def classify_resource(data, entropy):
-    """리소스 타입 분류"""
-    size = len(data)
+def calculate_entropy(data):
+    """엔트로피 계산 (0.0 ~ 1.0)"""
+    return entropy_from_counts(Counter(data).values(), len(data))
 
+def classify_size_entropy(size, entropy):
+    """크기 + 엔트로피 → 리소스 타입 (블록 데이터 없이 재분류 가능)"""
     # 엔트로피 기반 분류
-    if entropy < 0.3:
+    if entropy < SCRIPT_MAX_ENTROPY:
         return 'scripts'  # 낮은 엔트로피 = 스크립트/텍스트
-    elif size > 1000 and entropy > 0.7:
+    elif size > GRAPHICS_MIN_SIZE and entropy > GRAPHICS_MIN_ENTROPY:
         return 'graphics'  # 큰 크기 + 높은 엔트로피 = 그래픽
-    elif size < 2000 and entropy > 0.6:
+    elif size < SOUND_MAX_SIZE and entropy > SOUND_MIN_ENTROPY:
         return 'sounds'    # 작은 크기 + 중간 엔트로피 = 사운드
-    elif size < 100:
+    elif size < PALETTE_MAX_SIZE:
         return 'palettes'  # 매우 작음 = 팔레트
     else:
         return 'unknown'
 
+def classify_resource(data, entropy):
+    """리소스 타입 분류"""
+    return classify_size_entropy(len(data), entropy)
+
+def classify_blocks(data, blocks):
+    """파일의 모든 블록을 한 번에 분류 (배치 모드)
+
+    Returns: [(offset, size, entropy), ...] 순서대로, 타입은 classify_size_entropy로
+    (임계값을 바꿔 재분류할 때 히스토그램을 다시 계산하지 않도록 엔트로피만 반환)
+    블록마다 decode span (decode_objects_v3.encode_object_png의 오브젝트 단위와 같은 단위)
+    """
+    data = bytes(data)
+    count_log2_table(max((size for _, size in blocks), default=0))
+    classified = []
+    for offset, size in blocks:
+        with span('decode', nbytes=size):
+            entropy = entropy_from_counts(Counter(data[offset:offset + size]).values(), size)
+        classified.append((offset, size, entropy))
+    return classified
+
+def iter_classified_blocks(data):
+    """블록을 찾는 즉시 분류해서 내보내는 스트리밍 모드
+
+    Yields: (offset, size, block_data, entropy, res_type)
+    """
+    data = bytes(data)
+    for offset, size in iter_block_boundaries(data):
+        block_data = data[offset:offset + size]
+        entropy = calculate_entropy(block_data)
+        yield offset, size, block_data, entropy, classify_size_entropy(size, entropy)
+
+# 블록 탐지 파라미터
+WINDOW_SIZE = 50        # 블록 시작 판정 윈도우
+MIN_NON_ZERO = 30       # 윈도우 중 non-zero가 이보다 많으면 블록 시작
+MIN_BLOCK_SIZE = 100    # 최소 블록 크기
+MAX_BLOCK_SCAN = 60000  # 블록 끝 탐색 범위
+ZERO_RUN = 10           # 연속된 0이 이만큼이면 블록 끝
+
 def find_block_boundaries(data):
-    """블록 경계 찾기 (휴리스틱)"""
-    blocks = []
-    i = 0
+    """블록 경계 찾기 (휴리스틱) → [(offset, size), ...]"""
+    return list(iter_block_boundaries(data))
+
+def iter_block_boundaries(data):
+    """블록 경계를 찾는 즉시 (offset, size)로 내보냄 (한 번의 선형 패스)
+
+    - 블록 시작: non-zero 누적 합으로 50바이트 윈도우를 O(1)에 판정
+    - 블록 끝: bytes.find로 다음 0x00 x10 위치 탐색 (파일 끝에서는 남은 바이트가 모두 0이면 끝)
+    """
+    data = bytes(data)
+    n = len(data)
+
+    # non_zero[k] = data[:k]의 non-zero 개수
+    non_zero = [0] * (n + 1)
+    count = 0
+    for k, b in enumerate(data):
+        if b:
+            count += 1
+        non_zero[k + 1] = count
+
+    # 파일 끝의 연속된 0이 시작되는 위치
+    trailing_zero_start = len(data.rstrip(b'\x00'))
+    zero_run = bytes(ZERO_RUN)
 
-    while i < len(data) - 100:
+    i = 0
+    while i < n - MIN_BLOCK_SIZE:
         # 의미있는 데이터가 시작되는 지점 찾기
         # 연속된 0이 아닌 바이트가 많은 구간
-        non_zero_count = sum(1 for b in data[i:i+50] if b != 0)
-
-        if non_zero_count > 30:  # 50바이트 중 30개 이상이 non-zero
+        if non_zero[i + WINDOW_SIZE] - non_zero[i] > MIN_NON_ZERO:
             # 블록 크기 추정
-            block_end = i + 100
-
-            # 다음 0 패턴이나 다른 블록 시작까지 읽기
-            for j in range(i + 100, min(i + 60000, len(data))):
-                # 연속된 0이 10개 이상이면 블록 끝으로 간주
-                if all(data[k] == 0 for k in range(j, min(j + 10, len(data)))):
-                    block_end = j
-                    break
-
-            block_size = block_end - i
-            if block_size >= 100:  # 최소 100 bytes
-                blocks.append((i, block_size))
-                i = block_end
-                continue
+            block_end = i + MIN_BLOCK_SIZE
+            scan_start = i + MIN_BLOCK_SIZE
+            scan_stop = min(i + MAX_BLOCK_SCAN, n)
+
+            # 다음 0 패턴까지 읽기 (scan_stop 전에 시작하는 0 x10)
+            j = data.find(zero_run, scan_start, scan_stop + ZERO_RUN - 1)
+            if j < 0:
+                # 파일 끝에 걸친 짧은 윈도우: 남은 바이트가 모두 0이면 끝
+                j = max(trailing_zero_start, scan_start)
+            if j < scan_stop:
+                block_end = j
+
+            yield i, block_end - i
+            i = block_end
+            continue
 
         i += 1
 
-    return blocks
-
+@profiled('room', room=lambda lfl_path, output_base: Path(lfl_path).stem)
 def extract_lfl_resources(lfl_path, output_base):
     """LFL 파일에서 리소스 추출"""
     lfl_num = Path(lfl_path).stem
 
-    with open(lfl_path, 'rb') as f:
-        encrypted_data = f.read()
-
-    # XOR 복호화
-    data = xor_decrypt(encrypted_data)
+    # LFL 읽기 + XOR 복호화
+    data = read_lfl(lfl_path)
 
     print(f"\n📂 {lfl_path} 처리 중...")
     print(f"   파일 크기: {len(data):,} bytes")
 
     # 블록 경계 찾기
-    blocks = find_block_boundaries(data)
+    with span('parse', nbytes=len(data)):
+        blocks = find_block_boundaries(data)
     print(f"   발견된 블록: {len(blocks)}개")
 
     resources = []
+    outputs = RoomOutputs('out', lfl_num, output_base)
 
-    for idx, (offset, size) in enumerate(blocks, 1):
-        block_data = bytes(data[offset:offset + size])
-
-        # 엔트로피 계산
-        entropy = calculate_entropy(block_data)
-
-        # 타입 분류
-        res_type = classify_resource(block_data, entropy)
+    # 엔트로피 계산 + 타입 분류 (파일 단위 배치)
+    for idx, (offset, size, entropy) in enumerate(classify_blocks(data, blocks), 1):
+        res_type = classify_size_entropy(size, entropy)
+        block_data = data[offset:offset + size]
 
         # 파일 저장
         filename = f"{lfl_num}_res{idx:03d}.bin"
@@ -111,7 +187,7 @@ def extract_lfl_resources(lfl_path, output_base):
         type_dir.mkdir(parents=True, exist_ok=True)
 
         filepath = type_dir / filename
-        filepath.write_bytes(block_data)
+        outputs.write(filepath, block_data)
 
         resources.append({
             'id': idx,
@@ -125,6 +201,8 @@ def extract_lfl_resources(lfl_path, output_base):
 
         print(f"   [{idx:3d}] {filename:20s} {size:8,} bytes  entropy={entropy:.3f}  type={res_type}")
 
+    outputs.save()
+
     return resources
 
 def create_summary(all_files_data, output_base):
@@ -177,10 +255,15 @@ def create_summary(all_files_data, output_base):
     summary_path = output_base / '_summary.json'
     with open(summary_path, 'w', encoding='utf-8') as f:
         json.dump(summary, f, indent=2, ensure_ascii=False)
+    write_manifest(summary, summary_path.with_suffix('.bin'))
 
     return summary
 
 def main():
+    parser = argparse.ArgumentParser(description='LOOM LFL 리소스 추출')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
     print("🎮 LOOM 리소스 추출기")
     print("=" * 60)
 
@@ -211,11 +294,11 @@ def main():
 
     print(f"\n📁 {len(lfl_files)}개 LFL 파일 발견")
 
-    # 각 LFL 파일 처리
+    # 각 LFL 파일 처리 (--jobs: 병렬, 결과는 파일 순서대로 병합)
     all_files_data = {}
 
-    for lfl_file in lfl_files:
-        resources = extract_lfl_resources(lfl_file, output_base)
+    extract = partial(extract_lfl_resources, output_base=output_base)
+    for lfl_file, resources in zip(lfl_files, map_rooms(extract, lfl_files, args.jobs)):
         all_files_data[lfl_file.stem] = resources
 
     # Summary 생성
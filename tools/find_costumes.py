@@ -4,19 +4,14 @@ SCUMM v3 코스튬(Costume) 리소스 찾기
 """
 from pathlib import Path
 
-
-def xor_decrypt(data):
-    """XOR 0xFF 복호화"""
-    return bytearray([b ^ 0xFF for b in data])
+from lfl_reader import read_lfl
+from resource_index import RESOURCE_TYPES, ResourceIndex
 
 
 def find_costumes_in_lfl(lfl_path):
     """LFL 파일에서 코스튬 찾기"""
 
-    with open(lfl_path, 'rb') as f:
-        encrypted = f.read()
-
-    data = xor_decrypt(encrypted)
+    data = read_lfl(lfl_path)
 
     print(f'📂 {lfl_path.name}')
     print(f'   크기: {len(data):,} bytes')
@@ -48,66 +43,33 @@ def find_costumes_in_lfl(lfl_path):
     if lfl_path.name == '00.LFL':
         print('\n   🔍 00.LFL은 리소스 인덱스 파일입니다')
 
-        # Version magic number
-        magic = data[0] | (data[1] << 8)
-        print(f'   Version magic: 0x{magic:04X}')
-
-        # Global objects 읽기 (SCUMM v3: offset 2)
-        ptr = 2
-
-        # 글로벌 오브젝트 테이블
-        num_global_objects = data[ptr]
-        print(f'\n   📦 Global Objects: {num_global_objects}개')
-        ptr += 1
+        index = ResourceIndex(data, lfl_path.parent)
+        print(f'   Version magic: 0x{index.magic:04X}')
 
-        # Global object table 스킵
-        # 각 entry: 1 byte (class data)
-        ptr += num_global_objects
+        # 글로벌 오브젝트 테이블 (u16 개수 + 항목당 4 bytes: class data u24 + owner/state)
+        print(f'\n   📦 Global Objects: {index.num_objects}개')
 
-        # Resource type lists
-        # rtRoom, rtCostume, rtScript, rtSound
+        # Resource type lists: rtRoom, rtCostume, rtScript, rtSound
+        for res_type in RESOURCE_TYPES:
+            directory = index.directory(res_type)
+            rt_name = res_type.capitalize()
+            valid = list(directory)
+            print(f'\n   📚 {rt_name} Resources: {len(directory)}개 (유효 {len(valid)}개)')
 
-        resource_types = ['Room', 'Costume', 'Script', 'Sound']
-
-        for rt_name in resource_types:
-            if ptr >= len(data):
-                break
-
-            # Resource count
-            num_resources = data[ptr]
-            print(f'\n   📚 {rt_name} Resources: {num_resources}개')
-            ptr += 1
-
-            if num_resources == 0:
+            if not valid:
                 continue
 
-            # Room numbers for each resource
+            # Room 번호 + Room 파일 안의 offset (LE 16-bit)
             print(f'      Room assignments:')
-            for i in range(num_resources):
-                if ptr >= len(data):
-                    break
-                room_num = data[ptr]
-                if i < 10 or rt_name == 'Costume':
-                    print(f'         {rt_name} {i:3d} → Room {room_num:3d}')
-                ptr += 1
-
-            if num_resources > 10 and rt_name != 'Costume':
-                print(f'         ... ({num_resources - 10} more)')
-
-            # Offsets for each resource (LE 16-bit in v3!)
-            if rt_name == 'Costume':
-                print(f'\n      Costume Offsets:')
-                for i in range(num_resources):
-                    if ptr + 1 >= len(data):
-                        break
-                    offset = data[ptr] | (data[ptr+1] << 8)
-                    if offset == 0xFFFF:
-                        print(f'         Costume {i:3d} → INVALID')
+            for i, (res_id, room, offset) in enumerate(valid):
+                if i < 10 or res_type == 'costume':
+                    if res_type == 'room':
+                        print(f'         {rt_name} {res_id:3d} → Disk {room:3d}')
                     else:
-                        print(f'         Costume {i:3d} → offset 0x{offset:04X}')
-                    ptr += 2
-            else:
-                ptr += num_resources * 2
+                        print(f'         {rt_name} {res_id:3d} → Room {room:3d}, offset 0x{offset:04X}')
+
+            if len(valid) > 10 and res_type != 'costume':
+                print(f'         ... ({len(valid) - 10} more)')
 
 
 def main():
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+골든 출력 회귀 검사
+모든 Room 배경 픽셀 버퍼, 오브젝트 픽셀 버퍼, .ro / .mid 출력의 내용 해시를
+매니페스트(tools/golden_manifest.json)에 기록하고, 새 디코더 결과와 비트 단위로 비교
+
+매니페스트는 빠른 경로가 아니라 최적화 전 기준 디코더(golden_reference.py)로 기록한다.
+사운드 변환기(.ro / .mid)는 두 경우 모두 같은 변환기를 쓰고, 블록 추출만 기준 구현을 쓴다.
+
+    python3 tools/golden.py --jobs 0              # 현재 디코더 결과를 매니페스트와 비교 (불일치 시 exit 1)
+    python3 tools/golden.py --reference --jobs 0  # 기준 디코더 결과를 매니페스트와 비교
+    python3 tools/golden.py --update --jobs 0     # 기준 디코더로 매니페스트 갱신
+"""
+import argparse
+import hashlib
+import json
+import struct
+import sys
+from pathlib import Path
+
+from lfl_reader import read_lfl
+from room import parse_room, render_room
+from extract_resources import iter_classified_blocks
+from decode_objects_v3 import decode_object_smart
+from convert_sounds_to_midi import add_ro_tag
+from convert_to_standard_midi import create_standard_midi
+from parallel import add_jobs_argument, map_rooms
+import golden_reference
+
+
+MANIFEST_PATH = Path(__file__).resolve().parent / 'golden_manifest.json'
+MANIFEST_VERSION = 1
+
+# 매니페스트 키 종류 (출력 순서)
+KINDS = ('room', 'object', 'ro', 'mid')
+
+
+def digest_pixels(buf, width, height):
+    """픽셀 버퍼 해시 (크기 포함)"""
+    h = hashlib.blake2b(struct.pack('<HH', width, height), digest_size=16)
+    h.update(buf)
+    return h.hexdigest()
+
+
+def digest_bytes(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def hash_room_outputs(lfl_path):
+    """LFL 하나의 디코더 출력 해시 → {키: 해시} (병렬 worker에서도 호출)
+
+    키: room/NN, object/NN/OOO, ro/NN_resXXX, mid/NN_resXXX
+    """
+    lfl_num = Path(lfl_path).stem
+    data = read_lfl(lfl_path)
+    room = parse_room(data)
+    entries = {}
+
+    # 배경 (SMAP strip이 있는 Room만)
+    frame = render_room(data, room)
+    if frame is not None:
+        entries[f'room/{lfl_num}'] = digest_pixels(frame.buf, frame.width, frame.height)
+
+    # 오브젝트 (decode_objects_v3와 같은 필터)
+    if room.size >= 32:
+        for obj in room.objects:
+            if obj.obim_size in (0, 19):
+                continue
+            result = decode_object_smart(data[obj.obim_offset:obj.obim_offset + obj.obim_size])
+            if result is None:
+                continue
+            entries[f'object/{lfl_num}/{obj.id:03d}'] = digest_pixels(
+                result['pixels'], result['width'], result['height'])
+
+    # 사운드 (extract_resources 분류 → sounds_midi/*.ro, sounds_standard_midi/*.mid)
+    for idx, (_, _, block, _, res_type) in enumerate(iter_classified_blocks(data), 1):
+        if res_type != 'sounds' or not block:
+            continue
+        name = f'{lfl_num}_res{idx:03d}'
+        entries[f'ro/{name}'] = digest_bytes(add_ro_tag(block))
+        entries[f'mid/{name}'] = digest_bytes(create_standard_midi(block))
+
+    return entries
+
+
+def hash_reference_outputs(lfl_path):
+    """hash_room_outputs와 같은 키를 기준 디코더(golden_reference)로 계산
+
+    Room/오브젝트 위치는 parse_room을 쓰고, 복호화/strip 디코딩/배경 렌더링/블록 추출은 기준 구현
+    """
+    lfl_num = Path(lfl_path).stem
+    data = golden_reference.xor_decrypt(Path(lfl_path).read_bytes())
+    room = parse_room(data)
+    entries = {}
+
+    rendered = golden_reference.render_room(data)
+    if rendered is not None:
+        entries[f'room/{lfl_num}'] = digest_pixels(*rendered)
+
+    if room.size >= 32:
+        for obj in room.objects:
+            if obj.obim_size in (0, 19):
+                continue
+            result = decode_object_smart(data[obj.obim_offset:obj.obim_offset + obj.obim_size],
+                                         decode_strip=golden_reference.decode_strip_ega)
+            if result is None:
+                continue
+            entries[f'object/{lfl_num}/{obj.id:03d}'] = digest_pixels(
+                result['pixels'], result['width'], result['height'])
+
+    for idx, block, res_type in golden_reference.iter_classified_blocks(data):
+        if res_type != 'sounds' or not block:
+            continue
+        name = f'{lfl_num}_res{idx:03d}'
+        entries[f'ro/{name}'] = digest_bytes(add_ro_tag(block))
+        entries[f'mid/{name}'] = digest_bytes(create_standard_midi(block))
+
+    return entries
+
+
+def collect_hashes(lfl_files, jobs=1, reference=False):
+    """전체 LFL → {키: 해시} (Room 순서대로 병합, reference=True면 기준 디코더)"""
+    func = hash_reference_outputs if reference else hash_room_outputs
+    entries = {}
+    for room_entries in map_rooms(func, lfl_files, jobs):
+        entries.update(room_entries)
+    return entries
+
+
+def load_manifest(path):
+    if not path.exists():
+        return None
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    return manifest['entries']
+
+
+def save_manifest(path, entries):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': MANIFEST_VERSION,
+            'entries': dict(sorted(entries.items())),
+        }, f, indent=1)
+        f.write('\n')
+
+
+def compare_manifest(expected, actual):
+    """→ (불일치, 누락, 추가) 키 목록"""
+    changed = sorted(k for k in expected.keys() & actual.keys() if expected[k] != actual[k])
+    missing = sorted(expected.keys() - actual.keys())
+    added = sorted(actual.keys() - expected.keys())
+    return changed, missing, added
+
+
+def count_kinds(entries):
+    counts = dict.fromkeys(KINDS, 0)
+    for key in entries:
+        kind = key.split('/', 1)[0]
+        counts[kind] = counts.get(kind, 0) + 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LOOM 골든 출력 해시 검사')
+    parser.add_argument('--update', action='store_true', help='기준 디코더 결과로 매니페스트 갱신')
+    parser.add_argument('--reference', action='store_true', help='빠른 경로 대신 기준 디코더 결과를 비교')
+    parser.add_argument('--manifest', type=Path, default=MANIFEST_PATH, help='매니페스트 JSON 경로')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    print('🔏 LOOM 골든 출력 검사')
+    print('=' * 70)
+
+    lfl_files = sorted(Path('.').glob('*.LFL'))
+    if not lfl_files:
+        print('❌ LFL 파일을 찾을 수 없습니다!')
+        return 1
+
+    reference = args.reference or args.update
+    entries = collect_hashes(lfl_files, args.jobs, reference)
+    counts = count_kinds(entries)
+    print(f'   {"기준 디코더" if reference else "현재 디코더"}, LFL {len(lfl_files)}개: ' + ', '.join(f'{kind} {counts[kind]}개' for kind in KINDS))
+
+    if args.update:
+        save_manifest(args.manifest, entries)
+        print(f'✅ 매니페스트 갱신: {args.manifest} ({len(entries)}개)')
+        return 0
+
+    expected = load_manifest(args.manifest)
+    if expected is None:
+        print(f'⚠️  매니페스트 없음: {args.manifest} (--update로 생성)')
+        return 1
+
+    changed, missing, added = compare_manifest(expected, entries)
+    if not (changed or missing or added):
+        print(f'✅ {len(entries)}개 출력 모두 일치')
+        return 0
+
+    for title, keys in (('불일치', changed), ('누락', missing), ('추가', added)):
+        if not keys:
+            continue
+        print(f'\n❌ {title} {len(keys)}개:')
+        for key in keys[:20]:
+            print(f'   {key}')
+        if len(keys) > 20:
+            print(f'   ... 외 {len(keys) - 20}개')
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
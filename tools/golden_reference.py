@@ -0,0 +1,225 @@
+"""
+골든 매니페스트용 기준 디코더
+최적화 전(baseline) 구현을 그대로 옮겨 둔 것으로, 빠른 경로(ega.py, room.py, extract_resources.py)와
+독립적으로 같은 출력을 만든다. golden.py --update는 이 디코더로 매니페스트를 기록하므로
+빠른 경로의 버그가 매니페스트에 섞여 들어가지 않는다.
+
+    - xor_decrypt          바이트 단위 XOR 0xFF
+    - draw_strip_ega       픽셀 단위 drawStripEGA (test/decode_all_rooms_correct.py)
+    - decode_strip_ega     행 목록 → 이미지 버퍼 복사 (decode_objects_v3.py)
+    - render_room          strip 테이블 (archive/decode_all_resources_fixed.py extract_room_image)
+                           + strip별 디코딩/복사 (test/decode_all_rooms_correct.py)
+    - find_block_boundaries, calculate_entropy, classify_resource  (extract_resources.py)
+
+느리므로 golden.py에서만 사용
+"""
+import math
+from collections import Counter
+
+
+def xor_decrypt(data):
+    """XOR 0xFF 복호화"""
+    return bytes([b ^ 0xFF for b in data])
+
+
+def draw_strip_ega(src, height):
+    """ScummVM drawStripEGA → pixels[y][x] (8 × height)"""
+    pixels = [[0 for _ in range(8)] for _ in range(height)]
+    color, run, x, y, src_idx = 0, 0, 0, 0, 0
+
+    while x < 8 and src_idx < len(src):
+        color = src[src_idx]
+        src_idx += 1
+
+        if color & 0x80:
+            run = color & 0x3F
+            if color & 0x40:  # Two-color dithering
+                if src_idx >= len(src): break
+                color = src[src_idx]
+                src_idx += 1
+                if run == 0:
+                    if src_idx >= len(src): break
+                    run = src[src_idx]
+                    src_idx += 1
+                for z in range(run):
+                    if x >= 8: break  # Stop at strip boundary
+                    if y < height:
+                        pixel_color = (color & 0xF) if (z & 1) else (color >> 4)
+                        pixels[y][x] = pixel_color
+                    y += 1
+                    if y >= height: y, x = 0, x + 1
+            else:  # Repeat previous
+                if run == 0:
+                    if src_idx >= len(src): break
+                    run = src[src_idx]
+                    src_idx += 1
+                for z in range(run):
+                    if x >= 8: break  # Stop at strip boundary
+                    if y < height:
+                        pixels[y][x] = pixels[y][x - 1] if x > 0 else 0
+                    y += 1
+                    if y >= height: y, x = 0, x + 1
+        else:  # Single color
+            run = color >> 4
+            if run == 0:
+                if src_idx >= len(src): break
+                run = src[src_idx]
+                src_idx += 1
+            pixel_color = color & 0xF
+            for z in range(run):
+                if x >= 8: break  # Stop at strip boundary
+                if y < height:
+                    pixels[y][x] = pixel_color
+                y += 1
+                if y >= height: y, x = 0, x + 1
+
+    return pixels
+
+
+def decode_strip_ega(data, pixels, strip_x, width, height):
+    """strip 하나를 row-major 이미지 버퍼(폭 width)의 strip_x 열에 디코딩 (decode_strip_into와 같은 시그니처)"""
+    if len(data) == 0:
+        return
+
+    dst = draw_strip_ega(data, height)
+
+    # Copy to main buffer
+    for row in range(height):
+        for col in range(8):
+            pixel_x = strip_x + col
+            if pixel_x < width:
+                pixel_index = row * width + pixel_x
+                if pixel_index < len(pixels):
+                    pixels[pixel_index] = dst[row][col]
+
+
+def render_room(decrypted):
+    """복호화된 Room → (픽셀 bytes, width, height), strip이 없으면 None"""
+    if len(decrypted) < 10:
+        return None
+
+    # Room 헤더 파싱
+    width = decrypted[4] | (decrypted[5] << 8)
+    height = decrypted[6] | (decrypted[7] << 8)
+
+    # SMAP = Resource 0 (리소스 테이블 첫 번째)
+    resource_table_start = 0x0A
+    smap_ptr = decrypted[resource_table_start] | (decrypted[resource_table_start + 1] << 8)
+
+    if smap_ptr >= len(decrypted):
+        return None
+
+    # Strip offset 읽기 (16-color: SMAP+2부터)
+    strip_offsets = []
+    max_strips = min(200, (width + 7) // 8)
+
+    for i in range(max_strips):
+        offset_pos = smap_ptr + 2 + i * 2
+        if offset_pos + 1 >= len(decrypted):
+            break
+
+        strip_offset = decrypted[offset_pos] | (decrypted[offset_pos + 1] << 8)
+
+        # 0이거나 범위 벗어나면 끝
+        if strip_offset == 0 or smap_ptr + strip_offset >= len(decrypted):
+            break
+
+        # SMAP 기준 상대 주소 → 절대 주소
+        strip_offsets.append(smap_ptr + strip_offset)
+
+    num_strips = len(strip_offsets)
+    if num_strips == 0:
+        return None
+
+    # Decode strips
+    full_pixels = [[0 for _ in range(width)] for _ in range(height)]
+
+    for strip_idx in range(min(num_strips, width // 8)):
+        strip_offset = strip_offsets[strip_idx]
+        next_offset = strip_offsets[strip_idx + 1] if strip_idx < num_strips - 1 else len(decrypted)
+        strip_data = decrypted[strip_offset:next_offset]
+
+        strip_pixels = draw_strip_ega(strip_data, height)
+
+        if strip_pixels:
+            strip_x = strip_idx * 8
+            for y in range(height):
+                for x in range(8):
+                    pixel_x = strip_x + x
+                    if pixel_x < width and y < len(strip_pixels):
+                        full_pixels[y][pixel_x] = strip_pixels[y][x]
+
+    return bytes(p for row in full_pixels for p in row), width, height
+
+
+def calculate_entropy(data):
+    """엔트로피 계산 (0.0 ~ 1.0)"""
+    if len(data) == 0:
+        return 0.0
+
+    counter = Counter(data)
+    entropy = 0.0
+    for count in counter.values():
+        p = count / len(data)
+        if p > 0:
+            entropy -= p * math.log2(p)
+
+    # 0-8 범위를 0-1로 정규화
+    max_entropy = 8.0
+    return min(entropy / max_entropy, 1.0)
+
+
+def classify_resource(data, entropy):
+    """리소스 타입 분류"""
+    size = len(data)
+
+    # 엔트로피 기반 분류
+    if entropy < 0.3:
+        return 'scripts'  # 낮은 엔트로피 = 스크립트/텍스트
+    elif size > 1000 and entropy > 0.7:
+        return 'graphics'  # 큰 크기 + 높은 엔트로피 = 그래픽
+    elif size < 2000 and entropy > 0.6:
+        return 'sounds'    # 작은 크기 + 중간 엔트로피 = 사운드
+    elif size < 100:
+        return 'palettes'  # 매우 작음 = 팔레트
+    else:
+        return 'unknown'
+
+
+def find_block_boundaries(data):
+    """블록 경계 찾기 (휴리스틱)"""
+    blocks = []
+    i = 0
+
+    while i < len(data) - 100:
+        # 의미있는 데이터가 시작되는 지점 찾기
+        # 연속된 0이 아닌 바이트가 많은 구간
+        non_zero_count = sum(1 for b in data[i:i+50] if b != 0)
+
+        if non_zero_count > 30:  # 50바이트 중 30개 이상이 non-zero
+            # 블록 크기 추정
+            block_end = i + 100
+
+            # 다음 0 패턴이나 다른 블록 시작까지 읽기
+            for j in range(i + 100, min(i + 60000, len(data))):
+                # 연속된 0이 10개 이상이면 블록 끝으로 간주
+                if all(data[k] == 0 for k in range(j, min(j + 10, len(data)))):
+                    block_end = j
+                    break
+
+            block_size = block_end - i
+            if block_size >= 100:  # 최소 100 bytes
+                blocks.append((i, block_size))
+                i = block_end
+                continue
+
+        i += 1
+
+    return blocks
+
+
+def iter_classified_blocks(data):
+    """→ (idx, block, res_type) (extract_resources.iter_classified_blocks와 같은 번호)"""
+    for idx, (offset, size) in enumerate(find_block_boundaries(data), 1):
+        block = bytes(data[offset:offset + size])
+        yield idx, block, classify_resource(block, calculate_entropy(block))
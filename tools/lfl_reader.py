@@ -0,0 +1,118 @@
+"""
+LOOM LFL 파일 공용 리더
+모든 도구가 공유하는 XOR 0xFF 복호화 및 LFL 읽기
+"""
+import mmap
+import os
+from pathlib import Path
+
+from profiling import span
+
+
+XOR_KEY = 0xFF
+
+# 바이트 → 복호화된 바이트 변환 테이블 (bytes.translate용)
+XOR_TABLE = bytes(b ^ XOR_KEY for b in range(256))
+
+
+def xor_decrypt(data):
+    """XOR 0xFF 복호화 (bytes.translate로 한 번에 처리)"""
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return data.translate(XOR_TABLE)
+
+
+def read_lfl(lfl_path):
+    """LFL 파일을 읽어 복호화된 bytes 반환"""
+    with span('read') as s:
+        raw = Path(lfl_path).read_bytes()
+        s.add_bytes(len(raw))
+    with span('decrypt', nbytes=len(raw)):
+        return xor_decrypt(raw)
+
+
+class LFLFile:
+    """mmap 기반 LFL 파일 - 슬라이스한 범위만 지연 복호화
+
+    복호화 결과는 페이지 단위로 내부 버퍼에 캐시되고, 슬라이스는
+    그 버퍼를 가리키는 memoryview로 반환된다 (복사 없음).
+    """
+
+    PAGE_SIZE = 4096
+
+    def __init__(self, lfl_path):
+        self.path = Path(lfl_path)
+        with open(self.path, 'rb') as f:
+            self.size = os.fstat(f.fileno()).st_size
+            # 빈 파일은 mmap 불가
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+
+        self._buf = bytearray(self.size)
+        self._view = memoryview(self._buf)
+        self._decrypted = bytearray((self.size + self.PAGE_SIZE - 1) // self.PAGE_SIZE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            indices = range(*key.indices(self.size))
+            if indices:
+                lo, hi = sorted((indices[0], indices[-1]))
+                self._ensure(lo, hi + 1)
+            return self._view[key]
+
+        if key < 0:
+            key += self.size
+        if not 0 <= key < self.size:
+            raise IndexError('LFL index out of range')
+        self._ensure(key, key + 1)
+        return self._buf[key]
+
+    def _ensure(self, start, stop):
+        """[start, stop) 범위를 포함하는 페이지 복호화"""
+        page = self.PAGE_SIZE
+        first = start // page
+        last = (stop - 1) // page
+
+        p = first
+        while p <= last:
+            if self._decrypted[p]:
+                p += 1
+                continue
+
+            # 연속된 미복호화 페이지를 한 번에 처리
+            q = p
+            while q + 1 <= last and not self._decrypted[q + 1]:
+                q += 1
+
+            if self._mmap is None:
+                raise ValueError(f'{self.path.name}: 닫힌 LFL 파일')
+
+            lo = p * page
+            hi = min((q + 1) * page, self.size)
+            with span('decrypt', nbytes=hi - lo):
+                self._buf[lo:hi] = self._mmap[lo:hi].translate(XOR_TABLE)
+            self._decrypted[p:q + 1] = b'\x01' * (q + 1 - p)
+            p = q + 1
+
+    def u16(self, offset):
+        """복호화된 little-endian 16-bit 값"""
+        self._ensure(offset, offset + 2)
+        return self._buf[offset] | (self._buf[offset + 1] << 8)
+
+    def view(self):
+        """파일 전체를 복호화한 memoryview"""
+        return self[:]
+
+    def close(self):
+        """mmap 해제 (이미 반환된 memoryview는 계속 유효)"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
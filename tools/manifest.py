@@ -0,0 +1,317 @@
+"""
+고정 길이 레코드 바이너리 리소스 매니페스트 (resources.bin / _summary.bin)
+resources.json / _summary.json과 같은 내용을 (타입, Room) 순으로 정렬해 저장하고
+(타입, Room) → 레코드 범위 인덱스로 필요한 레코드만 mmap에서 읽는다
+
+    manifest = open_manifest('decoded2')
+    for res in manifest.records(res_type='scripts'):     # 스크립트 레코드만 unpack
+        print(res['room'], res['filename'])
+    manifest.count('sounds')                               # 인덱스만 사용
+    manifest.to_json()                                     # 원래 JSON 문서
+"""
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+
+
+MAGIC = b'LRM1'
+MANIFEST_VERSION = 1
+
+# magic, version, record 수, 인덱스 항목 수, names/strings/meta 위치
+HEADER = struct.Struct('<4sHIIIII')
+# room, type, subtype, flags, id, Room 안 순서, strips, width, height, entropy, offset, size,
+# path (offset, len), extra JSON (offset, len)
+RECORD = struct.Struct('<BBBBHHHHHHIIIHIH')
+# type, room, 레코드 시작, 개수
+INDEX_ENTRY = struct.Struct('<BBII')
+
+NONE8 = 0xFF
+NONE16 = 0xFFFF
+NONE32 = 0xFFFFFFFF
+
+FLAG_RECONSTRUCTED = 0x01     # reconstructed 값
+FLAG_HAS_RECONSTRUCTED = 0x02  # reconstructed 키 있음
+FLAG_HAS_DIMENSIONS = 0x04     # width/height/strips 키 있음
+
+# 레코드 필드로 저장되는 키 (나머지는 extra JSON)
+RECORD_KEYS = {'id', 'type', 'subtype', 'filename', 'path', 'offset', 'size', 'entropy',
+               'reconstructed', 'width', 'height', 'strips'}
+
+
+def _room_groups(document):
+    """resources.json (rooms) / _summary.json (files) → (키, Room 번호, 그룹 메타데이터, 리소스 목록)"""
+    if 'rooms' in document:
+        key, room_key = 'rooms', 'room'
+    else:
+        key, room_key = 'files', 'file'
+    for group in document[key]:
+        meta = {k: v for k, v in group.items() if k != 'resources'}
+        yield key, int(group[room_key]), meta, group['resources']
+
+
+def _fits(value, limit):
+    return isinstance(value, int) and not isinstance(value, bool) and 0 <= value < limit
+
+
+def build_manifest(document):
+    """JSON 문서 (resources.json / _summary.json) → 매니페스트 bytes"""
+    names = []
+    name_ids = {}
+
+    def name_id(name):
+        if name not in name_ids:
+            name_ids[name] = len(names)
+            names.append(name)
+        return name_ids[name]
+
+    strings = bytearray()
+
+    def add_string(text):
+        raw = text.encode('utf-8')
+        offset = len(strings)
+        strings.extend(raw)
+        return offset, len(raw)
+
+    groups = []
+    entries = []
+    layout = 'rooms'
+    for layout, room, meta, resources in _room_groups(document):
+        groups.append(meta)
+        for seq, res in enumerate(resources):
+            entries.append((name_id(res['type']), room, seq, res))
+
+    # (타입, Room, 원래 순서)로 정렬 → 같은 (타입, Room)은 연속된 범위
+    entries.sort(key=lambda e: (e[0], e[1], e[2]))
+
+    records = bytearray()
+    index = []
+    for type_id, room, seq, res in entries:
+        if index and index[-1][0] == type_id and index[-1][1] == room:
+            index[-1][3] += 1
+        else:
+            index.append([type_id, room, len(records) // RECORD.size, 1])
+
+        extra = {k: v for k, v in res.items() if k not in RECORD_KEYS}
+        flags = 0
+        if 'reconstructed' in res:
+            flags |= FLAG_HAS_RECONSTRUCTED
+            if res['reconstructed']:
+                flags |= FLAG_RECONSTRUCTED
+        if 'width' in res:
+            flags |= FLAG_HAS_DIMENSIONS
+
+        # 고정 필드에 맞지 않는 값은 extra로
+        for key, limit in (('id', NONE16), ('offset', NONE32), ('size', NONE32),
+                           ('width', NONE16), ('height', NONE16), ('strips', NONE16)):
+            if key in res and not _fits(res[key], limit):
+                extra[key] = res[key]
+        entropy = NONE16
+        if 'entropy' in res:
+            entropy_text = res['entropy']
+            milli = round(float(entropy_text) * 1000) if isinstance(entropy_text, str) else None
+            if milli is not None and f'{milli / 1000:.3f}' == entropy_text:
+                entropy = milli
+            else:
+                extra['entropy'] = entropy_text
+        path = res.get('path', '')
+        if res.get('filename') != Path(path).name:
+            extra['filename'] = res.get('filename')
+        if 'subtype' in res and not isinstance(res['subtype'], str):
+            extra['subtype'] = res['subtype']
+
+        path_off, path_len = add_string(path)
+        extra_off, extra_len = add_string(json.dumps(extra, ensure_ascii=False)) if extra else (0, 0)
+
+        def field(key, none):
+            value = res.get(key)
+            return value if key not in extra and _fits(value, none) else none
+
+        subtype = res.get('subtype')
+        records += RECORD.pack(
+            room, type_id, name_id(subtype) if isinstance(subtype, str) else NONE8, flags,
+            field('id', NONE16), seq, field('strips', NONE16), field('width', NONE16),
+            field('height', NONE16), entropy, field('offset', NONE32), field('size', NONE32),
+            path_off, path_len, extra_off, extra_len)
+
+    if len(names) >= NONE8:
+        raise ValueError('타입/서브타입 이름이 너무 많음')
+
+    meta = {
+        'layout': layout,
+        'document': {k: v for k, v in document.items() if k not in ('rooms', 'files')},
+        'groups': groups,
+        'names': names,
+    }
+    meta_bytes = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+
+    index_bytes = b''.join(INDEX_ENTRY.pack(*entry) for entry in index)
+    records_offset = HEADER.size
+    index_offset = records_offset + len(records)
+    strings_offset = index_offset + len(index_bytes)
+    meta_offset = strings_offset + len(strings)
+
+    header = HEADER.pack(MAGIC, MANIFEST_VERSION, len(entries), len(index),
+                         index_offset, strings_offset, meta_offset)
+    return header + bytes(records) + index_bytes + bytes(strings) + meta_bytes
+
+
+def write_manifest(document, output_path):
+    """JSON 문서 → 바이너리 매니페스트 파일 (원자적 쓰기)"""
+    output_path = Path(output_path)
+    tmp_path = output_path.with_suffix(f'.{os.getpid()}.tmp')
+    tmp_path.write_bytes(build_manifest(document))
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+class Manifest:
+    """바이너리 매니페스트 리더 (파일은 mmap, 레코드는 요청할 때만 unpack)"""
+
+    def __init__(self, buf):
+        self._buf = buf
+        magic, version, self.num_records, num_index, index_offset, self._strings_offset, \
+            meta_offset = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != MANIFEST_VERSION:
+            raise ValueError('리소스 매니페스트 형식이 아님')
+
+        meta = json.loads(bytes(buf[meta_offset:]).decode('utf-8'))
+        self.layout = meta['layout']
+        self.document = meta['document']
+        self.groups = meta['groups']
+        self.names = meta['names']
+        self._type_ids = {name: i for i, name in enumerate(self.names)}
+
+        # (type, room) → (시작, 개수) - 작으므로 전부 읽음
+        self._index = [INDEX_ENTRY.unpack_from(buf, index_offset + i * INDEX_ENTRY.size)
+                       for i in range(num_index)]
+
+    @classmethod
+    def open(cls, path):
+        with open(path, 'rb') as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def _ranges(self, res_type=None, room=None):
+        if res_type is not None and res_type not in self._type_ids:
+            return []
+        type_id = self._type_ids.get(res_type)
+        room = int(room) if room is not None else None
+        return [(start, count) for t, r, start, count in self._index
+                if (type_id is None or t == type_id) and (room is None or r == room)]
+
+    def count(self, res_type=None, room=None):
+        """레코드 수 (인덱스만 사용)"""
+        return sum(count for _, count in self._ranges(res_type, room))
+
+    def types(self):
+        """레코드가 있는 타입 이름"""
+        return sorted({self.names[t] for t, _, _, _ in self._index})
+
+    def records(self, res_type=None, room=None):
+        """조건에 맞는 리소스 dict (JSON 리소스 항목 + 'room', 'seq') - (타입, Room, 원래 순서) 순"""
+        for start, count in self._ranges(res_type, room):
+            for i in range(start, start + count):
+                yield self._record(i)
+
+    def _string(self, offset, length):
+        start = self._strings_offset + offset
+        return bytes(self._buf[start:start + length]).decode('utf-8')
+
+    def _record(self, i):
+        (room, type_id, subtype, flags, res_id, seq, strips, width, height, entropy, offset, size,
+         path_off, path_len, extra_off, extra_len) = RECORD.unpack_from(self._buf, HEADER.size + i * RECORD.size)
+
+        path = self._string(path_off, path_len)
+        res = {'id': res_id, 'type': self.names[type_id]}
+        if subtype != NONE8:
+            res['subtype'] = self.names[subtype]
+        res['filename'] = Path(path).name
+        res['path'] = path
+        if offset != NONE32:
+            res['offset'] = offset
+        if size != NONE32:
+            res['size'] = size
+        if entropy != NONE16:
+            res['entropy'] = f'{entropy / 1000:.3f}'
+        if flags & FLAG_HAS_DIMENSIONS:
+            res['width'] = width
+            res['height'] = height
+            if strips != NONE16:
+                res['strips'] = strips
+        if flags & FLAG_HAS_RECONSTRUCTED:
+            res['reconstructed'] = bool(flags & FLAG_RECONSTRUCTED)
+        if res_id == NONE16:
+            del res['id']
+        if extra_len:
+            res.update(json.loads(self._string(extra_off, extra_len)))
+
+        res['room'] = f'{room:02d}'
+        res['seq'] = seq
+        return res
+
+    def to_json(self):
+        """원래 JSON 문서로 export (그룹/리소스 순서 보존)"""
+        room_key = 'room' if self.layout == 'rooms' else 'file'
+        by_room = {}
+        for res in self.records():
+            by_room.setdefault(res.pop('room'), []).append(res)
+
+        groups = []
+        for meta in self.groups:
+            resources = sorted(by_room.get(f'{int(meta[room_key]):02d}', []), key=lambda r: r['seq'])
+            for res in resources:
+                del res['seq']
+            groups.append({**meta, 'resources': resources})
+        return {**self.document, self.layout: groups}
+
+
+def open_manifest(directory, json_name='resources.json'):
+    """directory의 매니페스트 (.bin이 JSON보다 오래됐거나 없으면 JSON에서 메모리로 생성)"""
+    json_path = Path(directory) / json_name
+    bin_path = json_path.with_suffix('.bin')
+    if bin_path.exists() and (not json_path.exists()
+                              or bin_path.stat().st_mtime >= json_path.stat().st_mtime):
+        return Manifest.open(bin_path)
+
+    with open(json_path, 'r') as f:
+        return Manifest(build_manifest(json.load(f)))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='바이너리 리소스 매니페스트 생성/조회')
+    parser.add_argument('directory', nargs='?', default='decoded2', help='resources.json이 있는 디렉토리')
+    parser.add_argument('--json-name', default='resources.json', help='JSON 파일 이름 (out/은 _summary.json)')
+    parser.add_argument('--type', help='이 타입의 레코드만 출력')
+    parser.add_argument('--room', help='이 Room의 레코드만 출력')
+    parser.add_argument('--export', type=Path, help='매니페스트 → JSON export 경로')
+    args = parser.parse_args()
+
+    json_path = Path(args.directory) / args.json_name
+    bin_path = json_path.with_suffix('.bin')
+
+    if args.export:
+        with open(args.export, 'w', encoding='utf-8') as f:
+            json.dump(Manifest.open(bin_path).to_json(), f, indent=2, ensure_ascii=False)
+        print(f'✅ {bin_path} → {args.export}')
+        return
+
+    if args.type or args.room:
+        manifest = open_manifest(args.directory, args.json_name)
+        for res in manifest.records(res_type=args.type, room=args.room):
+            print(f'{res["room"]}  {res["type"]:12s} {res.get("id", "-"):>4}  {res.get("size", 0):>7,}  {res["path"]}')
+        print(f'\n📊 {manifest.count(args.type, args.room)}개')
+        return
+
+    with open(json_path, 'r') as f:
+        document = json.load(f)
+    write_manifest(document, bin_path)
+    manifest = Manifest.open(bin_path)
+    counts = ', '.join(f'{t} {manifest.count(t)}' for t in manifest.types())
+    print(f'✅ {json_path} → {bin_path} ({bin_path.stat().st_size:,} bytes, {manifest.num_records}개: {counts})')
+
+
+if __name__ == '__main__':
+    main()
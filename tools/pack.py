@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+출력 디렉토리 → 단일 아카이브 (무압축 zip, 기본 loom_output.zip)
+~1000개의 작은 파일 대신 한 번의 순차 쓰기로 만든 파일 하나 + 끝의 central directory 인덱스
+central directory만 읽어서 리소스 ID(경로) → offset을 찾고 해당 범위만 읽는다
+
+    python3 tools/pack.py                      # 출력 디렉토리 → loom_output.zip
+    python3 tools/pack.py --remove             # 패킹 후 원본 디렉토리 삭제
+
+    pack = PackReader('loom_output.zip')
+    data = pack.get('sounds_standard_midi/01_res007')   # 리소스 ID = 확장자 없는 경로
+"""
+import argparse
+import fnmatch
+import os
+import shutil
+import zipfile
+from pathlib import Path, PurePosixPath
+
+from profiling import span
+from store import default_store
+
+
+PACK_PATH = Path('loom_output.zip')
+
+# 패킹 대상 출력 디렉토리 (뷰어/카탈로그가 읽는 것)
+PACK_DIRS = ('backgrounds', 'objects_png_v3', 'sounds_midi', 'sounds_standard_midi', 'sounds_wav',
+             'disassembled')
+
+# 재현 가능한 아카이브 (같은 출력 → 같은 bytes)
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def collect_pack_entries(dirs=PACK_DIRS, root=Path('.')):
+    """→ [(아카이브 이름, 파일 경로)] (이름 순)
+
+    출력 디렉토리가 없으면 저장소 매니페스트의 객체를 사용
+    (--remove로 지운 뒤에도 .loom_cache/store만으로 다시 패킹 가능)
+    """
+    store = default_store()
+    entries = {}
+    for name in dirs:
+        directory = root / name
+        if directory.is_dir():
+            for path in directory.rglob('*'):
+                if path.is_file() and not path.name.startswith('.'):
+                    entries[path.relative_to(root).as_posix()] = path
+            continue
+
+        for manifest_name, _, manifest in store.manifests():
+            if manifest_name != name:
+                continue
+            for rel_path, (digest, _) in manifest['files'].items():
+                if store.has(digest):
+                    entries[f'{name}/{rel_path}'] = store.object_path(digest)
+
+    return sorted(entries.items())
+
+
+def write_pack(entries, pack_path=PACK_PATH):
+    """[(아카이브 이름, 파일 경로)] → 무압축 zip (임시 파일에 순차 쓰기 후 교체)
+
+    Returns: (항목 수, 데이터 bytes)
+    """
+    pack_path = Path(pack_path)
+    tmp_path = pack_path.with_name(f'.{pack_path.name}.{os.getpid()}.tmp')
+    total = 0
+    with span('write') as s, zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_STORED) as archive:
+        for name, path in entries:
+            info = zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME)
+            info.compress_type = zipfile.ZIP_STORED
+            info.external_attr = 0o644 << 16
+            data = Path(path).read_bytes()
+            archive.writestr(info, data)
+            total += len(data)
+        s.add_bytes(total)
+    os.replace(tmp_path, pack_path)
+    return len(entries), total
+
+
+def _glob_match(name, pattern):
+    """Path.glob과 같은 규칙: '*'는 경로 구분자를 넘지 않음"""
+    name_parts = name.split('/')
+    pattern_parts = pattern.split('/')
+    return (len(name_parts) == len(pattern_parts)
+            and all(fnmatch.fnmatchcase(n, p) for n, p in zip(name_parts, pattern_parts)))
+
+
+class DirectoryOutputs:
+    """출력 디렉토리 (PackReader와 같은 인터페이스)"""
+
+    def __init__(self, root='.'):
+        self.root = Path(root)
+
+    def exists(self, dirname):
+        return (self.root / dirname).exists()
+
+    def glob(self, pattern):
+        return sorted(PurePosixPath(path.relative_to(self.root).as_posix())
+                      for path in self.root.glob(pattern) if path.is_file())
+
+    def size(self, name):
+        return (self.root / name).stat().st_size
+
+    def read(self, name):
+        return (self.root / name).read_bytes()
+
+
+class PackReader:
+    """무압축 zip 아카이브 리더 (central directory만 읽고 항목은 요청할 때 읽음)"""
+
+    def __init__(self, pack_path=PACK_PATH):
+        self.path = Path(pack_path)
+        self._zip = zipfile.ZipFile(self.path, 'r')
+        self._infos = {info.filename: info for info in self._zip.infolist()}
+        # 리소스 ID (확장자 없는 경로) → 아카이브 이름
+        self._ids = {}
+        for name in self._infos:
+            self._ids.setdefault(str(PurePosixPath(name).with_suffix('')), name)
+
+    def close(self):
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self._infos)
+
+    def __contains__(self, name):
+        return name in self._infos
+
+    def names(self):
+        return list(self._infos)
+
+    def exists(self, dirname):
+        prefix = dirname.rstrip('/') + '/'
+        return any(name.startswith(prefix) for name in self._infos)
+
+    def glob(self, pattern):
+        return sorted(PurePosixPath(name) for name in self._infos if _glob_match(name, pattern))
+
+    def size(self, name):
+        return self._infos[str(name)].file_size
+
+    def read(self, name):
+        with span('read') as s:
+            data = self._zip.read(self._infos[str(name)])
+            s.add_bytes(len(data))
+        return data
+
+    def get(self, resource_id):
+        """리소스 ID (예: 'sounds_standard_midi/01_res007') 또는 아카이브 이름 → bytes 또는 None"""
+        name = resource_id if resource_id in self._infos else self._ids.get(resource_id)
+        return self.read(name) if name is not None else None
+
+
+def open_outputs(pack_path=None):
+    """pack_path가 있으면 PackReader, 없으면 현재 디렉토리의 출력 디렉토리"""
+    if pack_path:
+        return PackReader(pack_path)
+    return DirectoryOutputs()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='출력 디렉토리 → 단일 무압축 zip 아카이브')
+    parser.add_argument('--output', type=Path, default=PACK_PATH, help=f'아카이브 경로 (기본 {PACK_PATH})')
+    parser.add_argument('--remove', action='store_true', help='패킹 후 출력 디렉토리 삭제')
+    parser.add_argument('dirs', nargs='*', default=list(PACK_DIRS), help='패킹할 디렉토리')
+    args = parser.parse_args()
+
+    print('📦 LOOM 출력 패킹')
+    print('=' * 70)
+
+    entries = collect_pack_entries(args.dirs)
+    if not entries:
+        print('❌ 패킹할 출력이 없습니다!')
+        return
+
+    count, total = write_pack(entries, args.output)
+    print(f'✅ {count:,}개 파일, {total:,} bytes → {args.output} ({args.output.stat().st_size:,} bytes)')
+
+    if args.remove:
+        for name in args.dirs:
+            if Path(name).is_dir():
+                shutil.rmtree(name)
+                print(f'   🗑️  {name}/ 삭제')
+
+
+if __name__ == '__main__':
+    main()
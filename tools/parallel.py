@@ -0,0 +1,56 @@
+"""
+Room 단위 병렬 처리 (--jobs N)
+ProcessPoolExecutor로 LFL별 작업을 나눠 실행하고, 결과와 출력은 입력 순서대로 병합
+"""
+import contextlib
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import profiling
+
+
+def add_jobs_argument(parser):
+    """argparse에 -j/--jobs 옵션 추가"""
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='병렬 프로세스 수 (기본 1, 0 = CPU 개수)')
+
+
+def resolve_jobs(jobs):
+    """0 이하 → CPU 개수"""
+    if jobs is None or jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def _run_captured(func, item):
+    """worker: 출력과 프로파일 span을 모아서 결과와 함께 반환 (부모가 순서대로 출력)"""
+    profiling.drain_events()  # fork로 물려받은 부모 span 제거
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = func(item)
+    return output.getvalue(), result, profiling.drain_events()
+
+
+def map_rooms(func, items, jobs=1):
+    """items 순서대로 func(item) 결과를 yield
+
+    jobs > 1이면 프로세스 풀에서 실행하고, 각 작업의 출력은 끝난 뒤 입력 순서대로
+    다시 출력하므로 로그와 병합 결과는 jobs 값과 관계없이 같다.
+    func와 item은 pickle 가능해야 한다 (모듈 최상위 함수).
+    """
+    items = list(items)
+    jobs = min(resolve_jobs(jobs), len(items))
+
+    if jobs <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for output, result, events in pool.map(partial(_run_captured, func), items):
+            sys.stdout.write(output)
+            profiling.merge_events(events)
+            yield result
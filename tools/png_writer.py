@@ -0,0 +1,40 @@
+"""
+EGA 팔레트 인덱스 PNG 저장
+팔레트 인덱스 버퍼(0~15)를 Image.frombuffer로 바로 감싼 mode 'P' 이미지로 저장 (RGB 변환 없음)
+"""
+import sys
+
+from ega import EGA_PALETTE
+from profiling import span
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+
+def require_pil():
+    """PIL이 없으면 안내 후 종료 (PNG를 만드는 도구의 main에서 호출)"""
+    if not PIL_AVAILABLE:
+        print("⚠️  PIL 필요: pip3 install Pillow")
+        sys.exit(1)
+
+
+# putpalette용 평탄화된 팔레트 (r, g, b, r, g, b, ...)
+EGA_PALETTE_BYTES = bytes(c for rgb in EGA_PALETTE for c in rgb)
+
+
+def indexed_image(pixels, width, height):
+    """row-major 팔레트 인덱스 버퍼 (bytes/bytearray/Frame.buf) → mode 'P' 이미지"""
+    img = Image.frombuffer('P', (width, height), pixels, 'raw', 'P', 0, 1)
+    img.putpalette(EGA_PALETTE_BYTES)
+    return img
+
+
+def save_indexed_png(pixels, width, height, output_path):
+    """팔레트 PNG로 저장 (경로 또는 파일 객체, 저장한 이미지 반환 - 업스케일 등에 재사용)"""
+    with span('encode', nbytes=width * height):
+        img = indexed_image(pixels, width, height)
+        img.save(output_path, format='PNG')
+    return img
@@ -0,0 +1,264 @@
+"""
+단계별 프로파일링 (LOOM_PROFILE)
+도구들이 공유하는 context-manager span으로 Room/단계별 시간, 처리 bytes, 메모리 할당을 집계
+
+    with span('decode', room='01', nbytes=len(data)):
+        ...
+
+LOOM_PROFILE 환경 변수 (쉼표로 구분, 없으면 비활성 - span은 no-op):
+    1, table        종료 시 단계/Room별 요약 표 (stderr)
+    json=PATH       span 목록 + 요약 JSON
+    chrome=PATH     Chrome trace-event JSON (chrome://tracing, Perfetto)
+    mem             tracemalloc으로 span별 최대 할당량 측정 (느림)
+PATH의 {pid}는 프로세스 ID로 치환 (build.py처럼 하위 프로세스로 도구를 실행할 때)
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+
+def _parse_config(value):
+    config = {'table': False, 'json': None, 'chrome': None, 'mem': False}
+    for token in filter(None, (t.strip() for t in value.split(','))):
+        key, _, path = token.partition('=')
+        if key in ('1', 'table'):
+            config['table'] = True
+        elif key in ('json', 'chrome') and path:
+            config[key] = path
+        elif key == 'mem':
+            config['mem'] = True
+    return config
+
+
+CONFIG = _parse_config(os.environ.get('LOOM_PROFILE', ''))
+ENABLED = any(CONFIG.values())
+
+# 끝난 span 목록: (stage, name, room, start, duration, self, nbytes, alloc, pid)
+_events = []
+_stack = []
+_origin = time.perf_counter()
+
+
+class _NullSpan:
+    """비활성 상태의 span (아무것도 하지 않음)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add_bytes(self, n):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ('stage', 'name', 'room', 'nbytes', 'start', 'child_time',
+                 'mem_start', 'mem_peak')
+
+    def __init__(self, stage, name, room, nbytes):
+        self.stage = stage
+        self.name = name
+        self.room = room
+        self.nbytes = nbytes
+
+    def add_bytes(self, n):
+        self.nbytes += n
+
+    def __enter__(self):
+        # Room은 바깥 span에서 상속
+        if self.room is None and _stack:
+            self.room = _stack[-1].room
+
+        if CONFIG['mem']:
+            current, peak = tracemalloc.get_traced_memory()
+            if _stack:
+                parent = _stack[-1]
+                parent.mem_peak = max(parent.mem_peak, peak)
+            if hasattr(tracemalloc, 'reset_peak'):  # Python 3.9+ (이전 버전은 프로세스 최대값 기준)
+                tracemalloc.reset_peak()
+            self.mem_start = current
+            self.mem_peak = current
+
+        self.child_time = 0.0
+        _stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter() - self.start
+        _stack.pop()
+
+        alloc = 0
+        if CONFIG['mem']:
+            _, peak = tracemalloc.get_traced_memory()
+            self.mem_peak = max(self.mem_peak, peak)
+            alloc = self.mem_peak - self.mem_start
+            if _stack:
+                parent = _stack[-1]
+                parent.mem_peak = max(parent.mem_peak, self.mem_peak)
+
+        if _stack:
+            _stack[-1].child_time += duration
+
+        _events.append((self.stage, self.name, self.room, self.start - _origin, duration,
+                        duration - self.child_time, self.nbytes, alloc, os.getpid()))
+        return False
+
+
+def span(stage, room=None, nbytes=0, name=None):
+    """단계 span (stage: read, decrypt, parse, decode, encode, write, room 등)
+
+    room을 생략하면 바깥 span의 room을 사용하고, 처리량은 nbytes 또는 add_bytes()로 기록한다.
+    """
+    if not ENABLED:
+        return _NULL_SPAN
+    return Span(stage, name or stage, room, nbytes)
+
+
+def profiled(stage, measure=None, room=None):
+    """함수 전체를 span으로 감싸는 decorator (비활성이면 원래 함수 그대로)
+
+    measure(*args, **kwargs) → 처리 bytes, room(*args, **kwargs) → Room 번호
+    """
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nbytes = measure(*args, **kwargs) if measure else 0
+            room_id = room(*args, **kwargs) if room else None
+            with Span(stage, func.__name__, room_id, nbytes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def drain_events():
+    """지금까지의 span을 꺼내서 반환 (병렬 worker → 부모로 전달)"""
+    events = list(_events)
+    _events.clear()
+    return events
+
+
+def merge_events(events):
+    """worker에서 받은 span 추가"""
+    _events.extend(events)
+
+
+# ---------------------------------------------------------------------------
+# 집계 / 출력
+# ---------------------------------------------------------------------------
+
+def summarize(events):
+    """→ {'stages': {stage: {...}}, 'rooms': {room: {...}}}
+
+    단계별 total은 중첩 span을 포함한 시간, self는 하위 span을 뺀 시간.
+    Room별 시간은 self 합계 (중복 없음).
+    """
+    stages = {}
+    rooms = {}
+    for stage, _, room, _, duration, self_time, nbytes, alloc, _ in events:
+        s = stages.setdefault(stage, {'calls': 0, 'total': 0.0, 'self': 0.0, 'bytes': 0, 'alloc_peak': 0})
+        s['calls'] += 1
+        s['total'] += duration
+        s['self'] += self_time
+        s['bytes'] += nbytes
+        s['alloc_peak'] = max(s['alloc_peak'], alloc)
+
+        if room is not None:
+            r = rooms.setdefault(str(room), {'time': 0.0, 'stages': {}})
+            r['time'] += self_time
+            r['stages'][stage] = r['stages'].get(stage, 0.0) + self_time
+
+    return {'stages': stages, 'rooms': dict(sorted(rooms.items()))}
+
+
+def format_table(summary, top_rooms=10):
+    lines = ['', '⏱️  LOOM 프로파일', '=' * 78,
+             f'   {"stage":12s} {"calls":>7s} {"total s":>9s} {"self s":>9s} {"MB":>9s} '
+             f'{"MB/s":>8s} {"alloc KiB":>10s}',
+             '   ' + '-' * 72]
+
+    for stage, s in sorted(summary['stages'].items(), key=lambda item: -item[1]['self']):
+        mb = s['bytes'] / 1e6
+        rate = f'{mb / s["total"]:8.2f}' if s['bytes'] and s['total'] else f'{"-":>8s}'
+        alloc = f'{s["alloc_peak"] / 1024:10,.0f}' if s['alloc_peak'] else f'{"-":>10s}'
+        lines.append(f'   {stage:12s} {s["calls"]:7,d} {s["total"]:9.3f} {s["self"]:9.3f} '
+                     f'{mb:9.2f} {rate} {alloc}')
+
+    rooms = summary['rooms']
+    if rooms:
+        lines.append('')
+        lines.append(f'   Room별 시간 (상위 {min(top_rooms, len(rooms))}개 / {len(rooms)}개)')
+        for room, r in sorted(rooms.items(), key=lambda item: -item[1]['time'])[:top_rooms]:
+            stages = ', '.join(f'{stage} {t:.3f}' for stage, t in
+                               sorted(r['stages'].items(), key=lambda item: -item[1])[:4])
+            lines.append(f'   {room:>6s} {r["time"]:9.3f}s  ({stages})')
+
+    lines.append('=' * 78)
+    return '\n'.join(lines)
+
+
+def chrome_trace(events):
+    """Chrome trace-event 형식 (ph 'X' complete event, 단위 µs)"""
+    trace = []
+    for stage, name, room, start, duration, _, nbytes, alloc, pid in events:
+        args = {'bytes': nbytes}
+        if room is not None:
+            args['room'] = room
+        if alloc:
+            args['alloc'] = alloc
+        trace.append({'name': name, 'cat': stage, 'ph': 'X', 'pid': pid, 'tid': pid,
+                      'ts': round(start * 1e6, 3), 'dur': round(duration * 1e6, 3), 'args': args})
+    return {'traceEvents': trace, 'displayTimeUnit': 'ms'}
+
+
+def _output_path(path):
+    return path.replace('{pid}', str(os.getpid()))
+
+
+def report():
+    """설정된 형식으로 결과 출력 (메인 프로세스 종료 시 자동 호출)"""
+    if not _events:
+        return
+    events = sorted(_events, key=lambda e: e[3])
+    summary = summarize(events)
+
+    if CONFIG['table']:
+        print(format_table(summary), file=sys.stderr)
+
+    if CONFIG['json']:
+        with open(_output_path(CONFIG['json']), 'w', encoding='utf-8') as f:
+            json.dump({
+                'summary': summary,
+                'spans': [dict(zip(('stage', 'name', 'room', 'start', 'duration', 'self',
+                                    'bytes', 'alloc', 'pid'), e)) for e in events],
+            }, f, indent=1, ensure_ascii=False)
+
+    if CONFIG['chrome']:
+        with open(_output_path(CONFIG['chrome']), 'w', encoding='utf-8') as f:
+            json.dump(chrome_trace(events), f)
+
+
+_main_pid = os.getpid()
+
+
+def _report_at_exit():
+    # fork된 worker 프로세스에서는 출력하지 않음 (span은 부모로 전달됨)
+    if os.getpid() == _main_pid:
+        report()
+
+
+if ENABLED:
+    if CONFIG['mem']:
+        tracemalloc.start()
+    atexit.register(_report_at_exit)
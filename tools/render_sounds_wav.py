@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+LOOM 사운드 리소스 → WAV (오프라인 소프트웨어 신디사이저, synth.py)
+00.LFL 사운드 디렉토리의 리소스마다 WA 청크(PC 스피커 채널 스크립트)는 구형파로,
+AD 청크의 AdLib 음악 트랙은 사인/FM 음색으로 렌더링 (ScummVM이나 MT-32 에뮬레이터 없이 미리 듣기용)
+
+    python3 tools/render_sounds_wav.py --jobs 0          # 전체 사운드를 Room 단위 프로세스 풀에서 렌더링
+    python3 tools/render_sounds_wav.py --voice sine      # AdLib 음색 (기본 fm)
+    python3 tools/render_sounds_wav.py --room 70         # Room 하나의 사운드만
+
+출력: sounds_wav/sound_NNN_speaker.wav, sounds_wav/sound_NNN_adlib.wav
+AdLib 효과음(음악 트랙이 없는 AD 청크)은 해석하지 않으므로 PC 스피커 WAV만 만든다.
+WAV는 렌더링 캐시(store.py derive)에서 복사하므로 쓰기 가능 (LOOM_STORE_HARDLINK=1이면 읽기 전용 hard link)
+"""
+import argparse
+from functools import partial
+from pathlib import Path
+
+from lfl_reader import LFLFile
+from parallel import add_jobs_argument, map_rooms
+from profiling import profiled, span
+from resource_index import load_index
+from sound_v3 import read_sound
+from store import RoomOutputs, default_store, source_version
+from synth import (ADLIB_VOICES, DEFAULT_VOICE, SAMPLE_RATE, SKIPPED_ERRORS,
+                   render_adlib, render_speaker)
+
+
+TOOLS_DIR = Path(__file__).resolve().parent
+
+# 변환 결과 캐시 버전 (이 파일이나 파서/신디사이저가 바뀌면 다시 렌더링)
+SYNTH_VERSION = source_version(__file__, TOOLS_DIR / 'sound_v3.py', TOOLS_DIR / 'synth.py')
+
+OUTPUT_DIR = Path('sounds_wav')
+COUNT_KEYS = ('total', 'speaker', 'adlib', 'skipped', 'failed')
+
+
+def render_chunk(data, render):
+    """derive용 변환 함수 → (WAV bytes 또는 None, 메타데이터)"""
+    with span('render', nbytes=len(data)):
+        return render(data)
+
+
+def sound_jobs(index, voice, rooms=None):
+    """사운드 디렉토리 → Room별 작업 [(Room 번호, LFL 경로, [(사운드 ID, offset)], 음색)]
+
+    LFL 파일이 없는 Room은 건너뜀
+    """
+    by_room = {}
+    for sound_id, room, offset in index.directory('sound'):
+        if rooms is not None and room not in rooms:
+            continue
+        by_room.setdefault(room, []).append((sound_id, offset))
+
+    jobs = []
+    for room, sounds in sorted(by_room.items()):
+        lfl_path = index.room_path(room)
+        if lfl_path.exists():
+            jobs.append((room, str(lfl_path), sounds, voice))
+    return jobs
+
+
+@profiled('room', room=lambda job: f'{job[0]:02d}')
+def render_room_sounds(job):
+    """Room 하나의 사운드 렌더링 (병렬 worker에서도 호출)
+
+    Returns: {'total', 'speaker', 'adlib', 'skipped', 'failed', 'seconds'}
+    """
+    room, lfl_path, sounds, voice = job
+    outputs = RoomOutputs(OUTPUT_DIR.name, f'{room:02d}', OUTPUT_DIR)
+    counts = dict.fromkeys(COUNT_KEYS, 0)
+    counts['seconds'] = 0.0
+
+    renders = (
+        ('speaker', 'wav-speaker', render_speaker),
+        ('adlib', f'wav-{voice}', partial(render_adlib, voice=voice)),
+    )
+
+    with LFLFile(lfl_path) as lfl:
+        for sound_id, offset in sounds:
+            counts['total'] += 1
+            chunks = read_sound(lfl, offset)
+            if chunks is None:
+                print(f'   ⚠️  sound {sound_id:03d}: WA 청크 없음 (offset 0x{offset:04X})')
+                counts['failed'] += 1
+                continue
+
+            for (name, kind, render), data in zip(renders, chunks):
+                if data is None:
+                    continue
+                digest, meta = default_store().derive(kind, SYNTH_VERSION, data,
+                                                      partial(render_chunk, render=render))
+                if digest is None:
+                    # AdLib 효과음/무음은 건너뛰고, 스크립트/트랙 오류만 실패로 센다
+                    if meta['error'] in SKIPPED_ERRORS:
+                        counts['skipped'] += 1
+                    else:
+                        counts['failed'] += 1
+                        print(f'   ❌ sound {sound_id:03d} {name}: {meta["error"]}')
+                    continue
+
+                output_path = OUTPUT_DIR / f'sound_{sound_id:03d}_{name}.wav'
+                outputs.link(output_path, digest)
+                counts[name] += 1
+                counts['seconds'] += meta['seconds']
+                looped = ' (무한 반복 1회)' if meta.get('looped') else ''
+                print(f'   🔊 {output_path.name} - {meta["seconds"]:.2f}초{looped}')
+
+    outputs.save()
+    return counts
+
+
+def render_all_sounds(voice=DEFAULT_VOICE, jobs=1, rooms=None):
+    """00.LFL 사운드 디렉토리의 모든 사운드 → sounds_wav/ (jobs > 1이면 Room 단위 병렬) → 통계"""
+    OUTPUT_DIR.mkdir(exist_ok=True)
+
+    print(f'🔊 LOOM 사운드 → WAV 렌더링 (PC 스피커 + AdLib {voice}, {SAMPLE_RATE} Hz)')
+    print('=' * 70)
+
+    stats = dict.fromkeys(COUNT_KEYS, 0)
+    stats['seconds'] = 0.0
+    for counts in map_rooms(render_room_sounds, sound_jobs(load_index(), voice, rooms), jobs):
+        for key in stats:
+            stats[key] += counts[key]
+
+    print('\n' + '=' * 70)
+    print('✅ 렌더링 완료!')
+    print(f'   총 사운드: {stats["total"]}개')
+    print(f'   PC 스피커 WAV: {stats["speaker"]}개')
+    print(f'   AdLib WAV: {stats["adlib"]}개')
+    print(f'   길이 합계: {stats["seconds"]:.1f}초')
+    print(f'   건너뜀: {stats["skipped"]}개 (AdLib 효과음/무음)')
+    print(f'   실패: {stats["failed"]}개')
+    print(f'\n   출력: {OUTPUT_DIR.absolute()}/')
+    return stats
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='LOOM 사운드 → WAV (소프트웨어 신디사이저)')
+    parser.add_argument('--voice', choices=ADLIB_VOICES, default=DEFAULT_VOICE,
+                        help=f'AdLib 음색 (기본 {DEFAULT_VOICE})')
+    parser.add_argument('--room', type=int, action='append', help='이 Room의 사운드만 (여러 번 지정 가능)')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    render_all_sounds(args.voice, args.jobs, set(args.room) if args.room else None)
@@ -0,0 +1,197 @@
+"""
+00.LFL 리소스 인덱스 리더 (ScummVM resource_v3.cpp readIndexFile)
+글로벌 오브젝트 테이블과 Room/Costume/Script/Sound 디렉토리를 타입별 array로 파싱해
+리소스 ID → (Room, offset)을 O(1)로 조회
+
+    index = load_index()
+    room, offset = index.locate('sound', 37)
+    data = index.read_resource('sound', 37)
+"""
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from lfl_reader import LFLFile, read_lfl
+
+
+INDEX_MAGIC = 0x0100
+RESOURCE_TYPES = ('room', 'costume', 'script', 'sound')
+
+# 디렉토리 항목의 빈 값
+NO_ROOM = 0xFF
+NO_OFFSET = 0xFFFF
+
+# 글로벌 오브젝트 owner/state 바이트 (ScummVM OF_OWNER_MASK, OF_STATE_SHL)
+OWNER_MASK = 0x0F
+STATE_SHIFT = 4
+
+# 리소스 블록 헤더 (GF_OLD_BUNDLE): u16 크기 (헤더 포함) + 2 bytes
+RESOURCE_HEADER_SIZE = 4
+
+
+def _u16_array(data, offset, count):
+    """little-endian u16 count개 → array('H')"""
+    values = array('H', bytes(data[offset:offset + count * 2]))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+class ResourceDirectory:
+    """리소스 타입 하나의 디렉토리 (ID → Room 번호, Room 파일 안의 offset)"""
+
+    __slots__ = ('res_type', 'rooms', 'offsets')
+
+    def __init__(self, res_type, rooms, offsets):
+        self.res_type = res_type
+        self.rooms = rooms        # array('B'), NO_ROOM = 없음 (room 타입은 디스크 번호)
+        self.offsets = offsets    # array('H'), NO_OFFSET = 없음
+
+    def __len__(self):
+        return len(self.rooms)
+
+    def locate(self, res_id):
+        """→ (room, offset) 또는 None (범위 밖/빈 항목)"""
+        if not 0 <= res_id < len(self.rooms):
+            return None
+        room = self.rooms[res_id]
+        offset = self.offsets[res_id]
+        if room == NO_ROOM or offset == NO_OFFSET:
+            return None
+        return room, offset
+
+    def __iter__(self):
+        """유효한 항목만 (res_id, room, offset)"""
+        for res_id, (room, offset) in enumerate(zip(self.rooms, self.offsets)):
+            if room != NO_ROOM and offset != NO_OFFSET:
+                yield res_id, room, offset
+
+
+class ResourceIndex:
+    """00.LFL 리소스 인덱스
+
+    파일 전체(수 KB)는 한 번에 복호화하지만, 디렉토리 array는 타입별로 처음 접근할 때 만든다.
+    """
+
+    def __init__(self, data, lfl_dir='.'):
+        if len(data) < 4:
+            raise ValueError('리소스 인덱스가 너무 작음')
+
+        self.magic, num_objects = struct.unpack_from('<HH', data, 0)
+        if self.magic != INDEX_MAGIC:
+            raise ValueError(f'리소스 인덱스 magic 불일치: 0x{self.magic:04X}')
+
+        self._data = data
+        self.lfl_dir = Path(lfl_dir)
+        self.num_objects = num_objects
+        self._objects_offset = 4
+        self._class_data = None
+        self._owner_state = None
+
+        # 디렉토리 위치만 먼저 계산 (count u8, rooms u8[count], offsets u16[count])
+        self._directory_offsets = {}
+        self._directories = {}
+        ptr = self._objects_offset + num_objects * 4
+        for res_type in RESOURCE_TYPES:
+            if ptr >= len(data):
+                raise ValueError(f'{res_type} 디렉토리 없음 (offset {ptr})')
+            count = data[ptr]
+            self._directory_offsets[res_type] = ptr
+            ptr += 1 + count * 3
+        if ptr > len(data):
+            raise ValueError('리소스 디렉토리가 파일 끝을 넘음')
+        self.size = ptr
+
+    # --- 디렉토리 -----------------------------------------------------------
+
+    def directory(self, res_type):
+        """타입별 ResourceDirectory (처음 접근할 때 파싱)"""
+        directory = self._directories.get(res_type)
+        if directory is None:
+            if res_type not in self._directory_offsets:
+                raise KeyError(f'알 수 없는 리소스 타입: {res_type}')
+            ptr = self._directory_offsets[res_type]
+            count = self._data[ptr]
+            rooms = array('B', bytes(self._data[ptr + 1:ptr + 1 + count]))
+            offsets = _u16_array(self._data, ptr + 1 + count, count)
+            directory = ResourceDirectory(res_type, rooms, offsets)
+            self._directories[res_type] = directory
+        return directory
+
+    def locate(self, res_type, res_id):
+        """리소스 ID → (room, offset) 또는 None
+
+        room 디렉토리의 room 값은 디스크 번호이므로 Room 파일 번호(= ID)로 바꿔서 반환
+        """
+        location = self.directory(res_type).locate(res_id)
+        if location is not None and res_type == 'room':
+            return res_id, location[1]
+        return location
+
+    def count(self, res_type):
+        return len(self.directory(res_type))
+
+    # --- 글로벌 오브젝트 ------------------------------------------------------
+
+    def _load_objects(self):
+        start = self._objects_offset
+        raw = bytes(self._data[start:start + self.num_objects * 4])
+        # 항목: class data u24 + owner/state u8
+        self._class_data = array('I', (raw[i] | (raw[i + 1] << 8) | (raw[i + 2] << 16)
+                                       for i in range(0, len(raw), 4)))
+        self._owner_state = raw[3::4]
+
+    def object_class(self, obj_id):
+        if self._class_data is None:
+            self._load_objects()
+        return self._class_data[obj_id]
+
+    def object_owner(self, obj_id):
+        if self._owner_state is None:
+            self._load_objects()
+        return self._owner_state[obj_id] & OWNER_MASK
+
+    def object_state(self, obj_id):
+        if self._owner_state is None:
+            self._load_objects()
+        return self._owner_state[obj_id] >> STATE_SHIFT
+
+    # --- 리소스 데이터 --------------------------------------------------------
+
+    def room_path(self, room):
+        return self.lfl_dir / f'{room:02d}.LFL'
+
+    def read_resource(self, res_type, res_id, lfl=None):
+        """리소스 블록 (헤더 포함, 크기 = 헤더의 u16) → bytes 또는 None
+
+        Room LFL은 mmap 지연 복호화로 해당 범위만 읽는다. 같은 Room을 여러 번 읽을 때는
+        열어 둔 LFLFile을 lfl로 넘기면 된다.
+        """
+        location = self.locate(res_type, res_id)
+        if location is None:
+            return None
+        room, offset = location
+
+        if lfl is None:
+            path = self.room_path(room)
+            if not path.exists():
+                return None
+            with LFLFile(path) as room_lfl:
+                return self._read_block(room_lfl, offset)
+        return self._read_block(lfl, offset)
+
+    @staticmethod
+    def _read_block(lfl, offset):
+        if offset + RESOURCE_HEADER_SIZE > len(lfl):
+            return None
+        size = lfl.u16(offset)
+        if size < RESOURCE_HEADER_SIZE or offset + size > len(lfl):
+            return None
+        return bytes(lfl[offset:offset + size])
+
+
+def load_index(lfl_dir='.'):
+    """lfl_dir/00.LFL → ResourceIndex"""
+    lfl_dir = Path(lfl_dir)
+    return ResourceIndex(read_lfl(lfl_dir / '00.LFL'), lfl_dir)
@@ -0,0 +1,237 @@
+"""
+SCUMM v3 Roland(RO) 사운드 이벤트 파서 + 표준 MIDI 재인코딩
+포맷은 ScummVM MidiParser_RO 기준 (RO 태그 뒤 단일 트랙, PPQN 120, 템포 500000 µs/4분음표)
+
+    F0 dd           딜레이 dd ticks (연속되면 누적)
+    F1 dd           마지막 딜레이 dd ticks + 트랙 끝
+    An              마커 (데이터 없음, iMuse 스크립트 동기화용)
+    8n 9n Bn        채널 메시지 (데이터 2 bytes)
+    Cn pp xx        프로그램 체인지 (pp, xx는 용도 불명으로 건너뜀)
+Dn, En 등 그 밖의 status는 MidiParser_RO에 없으므로 오류.
+
+MidiParser_RO처럼 running status는 없다 (status 자리의 < 0x80 byte는 오류).
+'RO' 태그가 있으면 건너뛰고, SCUMM v3 채널 offset 테이블 헤더로 시작하는 블록(AdLib/PC 스피커
+채널 데이터)은 RO 스트림이 아니므로 오류. 노트가 하나도 없는 트랙, 트랙 끝 뒤에
+0이 아닌 데이터가 남는 블록도 오류.
+
+여러 사운드를 하나의 이벤트 배열(tick/status/data1/data2 병렬 array)에 파싱하고
+사운드별 범위(RolandTrack)로 표준 MIDI 파일을 만든다.
+
+    events, tracks = parse_roland_batch(blocks)
+    midi = encode_smf(events, tracks[0])
+"""
+import struct
+from array import array
+
+
+RO_PPQN = 120
+RO_TEMPO = 500000  # µs / 4분음표
+
+RO_TAG = b'RO'
+DELAY_EVENT = 0xF0
+END_OF_TRACK = 0xF1
+MARKER_COMMAND = 0xA
+NOTE_ON_COMMAND = 0x9
+
+# SCUMM v3 사운드 블록 헤더 (리소스 헤더 뒤): u16, u16 헤더 크기, u16 채널 offset x 6
+V3_SOUND_HEADER_SIZE = 0x16
+V3_CHANNEL_TABLE = 4
+V3_CHANNELS = 6
+
+# RO 채널 메시지 명령 (상위 nibble) → RO 스트림에서 읽는 데이터 bytes 수
+# ScummVM engines/scumm/midiparser_ro.cpp MidiParser_RO::parseNextEvent:
+#   0x8 0x9 0xB  param1, param2
+#   0xC          param1 + 다음 byte는 읽고 버림 ("I have NO IDEA what the second byte is for")
+#   0xD 0xE      case 없음 → 여기서는 알 수 없는 status로 오류
+DATA_LENGTHS = {0x8: 2, 0x9: 2, 0xB: 2, 0xC: 2}
+PROGRAM_CHANGE_COMMAND = 0xC
+
+# 표준 MIDI로 다시 쓸 때의 데이터 bytes 수 (프로그램 체인지는 표준대로 1 byte)
+SMF_DATA_LENGTHS = {0x8: 2, 0x9: 2, 0xB: 2, 0xC: 1}
+
+# 이벤트 배열의 마커 status (SMF 메타 이벤트 FF 06)
+MARKER_STATUS = 0xFF
+META_MARKER = 0x06
+
+
+class RolandEvents:
+    """여러 사운드의 이벤트를 담는 병렬 배열 (사운드별 범위는 RolandTrack)
+
+    - ticks: 절대 tick (u32)
+    - status: 채널 메시지 status 또는 MARKER_STATUS
+    - data1 / data2: 데이터 bytes (마커는 data1 = 원본 An byte)
+    """
+
+    __slots__ = ('ticks', 'status', 'data1', 'data2')
+
+    def __init__(self):
+        self.ticks = array('I')
+        self.status = array('B')
+        self.data1 = array('B')
+        self.data2 = array('B')
+
+    def __len__(self):
+        return len(self.ticks)
+
+    def append(self, tick, status, data1=0, data2=0):
+        self.ticks.append(tick)
+        self.status.append(status)
+        self.data1.append(data1)
+        self.data2.append(data2)
+
+    def truncate(self, length):
+        del self.ticks[length:]
+        del self.status[length:]
+        del self.data1[length:]
+        del self.data2[length:]
+
+
+class RolandTrack:
+    """이벤트 배열 안의 사운드 하나 (error가 있으면 이벤트 없음)"""
+
+    __slots__ = ('start', 'count', 'end_tick', 'markers', 'error')
+
+    def __init__(self, start, count=0, end_tick=0, markers=0, error=None):
+        self.start = start
+        self.count = count
+        self.end_tick = end_tick
+        self.markers = markers
+        self.error = error
+
+    def __repr__(self):
+        if self.error:
+            return f'RolandTrack(error={self.error!r})'
+        return f'RolandTrack({self.count} events, {self.end_tick} ticks, {self.markers} markers)'
+
+
+def v3_channel_table(data):
+    """SCUMM v3 사운드 블록 헤더의 채널 offset 목록 → tuple 또는 None (헤더가 아니면)
+
+    헤더 크기 필드가 0x16이고 0이 아닌 offset이 모두 헤더 뒤, 블록 안을 가리켜야 한다
+    """
+    if len(data) <= V3_SOUND_HEADER_SIZE:
+        return None
+    if struct.unpack_from('<H', data, 2)[0] != V3_SOUND_HEADER_SIZE:
+        return None
+    offsets = struct.unpack_from(f'<{V3_CHANNELS}H', data, V3_CHANNEL_TABLE)
+    channels = [offset for offset in offsets if offset]
+    if not channels or not all(V3_SOUND_HEADER_SIZE <= offset < len(data) for offset in channels):
+        return None
+    return offsets
+
+
+def parse_roland(data, events):
+    """RO 데이터 ('RO' 태그는 있어도 없어도 됨) → events에 이벤트 추가 → RolandTrack
+
+    검증 실패(채널 offset 테이블 헤더, 알 수 없는 status, 데이터 byte ≥ 0x80, 잘림,
+    트랙 끝 없음, 노트 없음, 트랙 끝 뒤의 0이 아닌 데이터)면 추가한 이벤트를 되돌리고 error가 있는 RolandTrack 반환
+    """
+    start = len(events)
+    size = len(data)
+    pos = len(RO_TAG) if data[:len(RO_TAG)] == RO_TAG else 0
+    tick = 0
+    markers = 0
+    notes = 0
+
+    def fail(message):
+        events.truncate(start)
+        return RolandTrack(start, error=f'0x{pos:04X}: {message}')
+
+    if not pos and v3_channel_table(data) is not None:
+        return fail('SCUMM v3 채널 offset 테이블 (AdLib/PC 스피커 블록, RO 아님)')
+
+    while pos < size:
+        byte = data[pos]
+
+        if byte == DELAY_EVENT or byte == END_OF_TRACK:
+            if pos + 1 >= size:
+                return fail('딜레이 잘림')
+            tick += data[pos + 1]
+            pos += 2
+            if byte == DELAY_EVENT:
+                continue
+            if not notes:
+                return fail('노트 이벤트 없음')
+            if data[pos:].strip(b'\x00'):
+                return fail('트랙 끝(F1) 뒤에 데이터가 남음')
+            return RolandTrack(start, len(events) - start, tick, markers)
+
+        if byte >> 4 == MARKER_COMMAND:
+            events.append(tick, MARKER_STATUS, byte)
+            markers += 1
+            pos += 1
+            continue
+
+        status = byte
+        if status < 0x80:
+            return fail(f'status 없는 데이터 0x{status:02X}')
+        if status >> 4 not in DATA_LENGTHS:
+            return fail(f'알 수 없는 status 0x{status:02X}')
+        pos += 1
+
+        length = DATA_LENGTHS[status >> 4]
+        if pos + length > size:
+            return fail('이벤트 잘림')
+        data1 = data[pos]
+        # 프로그램 체인지의 2번째 byte는 MidiParser_RO처럼 건너뜀 (검사/저장하지 않음)
+        data2 = data[pos + 1] if status >> 4 != PROGRAM_CHANGE_COMMAND else 0
+        if data1 >= 0x80 or data2 >= 0x80:
+            return fail(f'데이터 byte ≥ 0x80 (status 0x{status:02X})')
+        if status >> 4 == NOTE_ON_COMMAND and data2:
+            notes += 1
+        events.append(tick, status, data1, data2)
+        pos += length
+
+    return fail('트랙 끝(F1) 없음')
+
+
+def parse_roland_batch(blocks):
+    """여러 RO 데이터 → (RolandEvents 하나, [RolandTrack]) (한 번의 패스)"""
+    events = RolandEvents()
+    tracks = [parse_roland(data, events) for data in blocks]
+    return events, tracks
+
+
+def _vlq(value):
+    """MIDI variable-length quantity"""
+    out = bytearray((value & 0x7F,))
+    value >>= 7
+    while value:
+        out.insert(0, 0x80 | (value & 0x7F))
+        value >>= 7
+    return out
+
+
+def encode_smf(events, track):
+    """RolandTrack → 표준 MIDI 파일 bytes (format 0, PPQN 120, 템포 메타 이벤트 포함)
+
+    delta time은 절대 tick에서 다시 계산하고, 같은 채널 status가 이어지면 running status로 생략
+    """
+    body = bytearray(b'\x00\xFF\x51\x03')
+    body += RO_TEMPO.to_bytes(3, 'big')
+
+    ticks, status, data1, data2 = events.ticks, events.status, events.data1, events.data2
+    last_tick = 0
+    running = None
+    for i in range(track.start, track.start + track.count):
+        body += _vlq(ticks[i] - last_tick)
+        last_tick = ticks[i]
+
+        if status[i] == MARKER_STATUS:
+            text = f'{data1[i]:02X}'.encode('ascii')
+            body += bytes((0xFF, META_MARKER, len(text))) + text
+            running = None  # 메타 이벤트 뒤에는 status를 다시 씀
+            continue
+
+        if status[i] != running:
+            body.append(status[i])
+            running = status[i]
+        body.append(data1[i])
+        if SMF_DATA_LENGTHS[status[i] >> 4] == 2:
+            body.append(data2[i])
+
+    body += _vlq(track.end_tick - last_tick)
+    body += b'\xFF\x2F\x00'
+
+    header = b'MThd' + struct.pack('>IHHH', 6, 0, 1, RO_PPQN)
+    return header + b'MTrk' + struct.pack('>I', len(body)) + bytes(body)
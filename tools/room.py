@@ -0,0 +1,335 @@
+"""
+SCUMM v3 Room 모델 및 단일 패스 파서
+헤더, 리소스 테이블(0x0A), SMAP strip 테이블, OBIM/OBCD 테이블(29)을 한 번에 파싱
+parse_room_blocks: 헤더의 개수 필드로 하위 블록(스크립트 등)의 정확한 테이블 파싱
+"""
+from ega import render_strips
+from profiling import profiled
+
+
+# 파싱 로직이 바뀌면 올려서 기존 캐시 무효화
+PARSER_VERSION = 1
+
+RESOURCE_TABLE_START = 0x0A
+OBJECT_TABLE_START = 29
+
+MAX_RESOURCES = 50
+MAX_STRIPS = 200
+MAX_OBJECTS = 200
+
+# v3 Room 블록 헤더 필드 (ScummVM ScummEngine_v3old::loadRoomSubBlocks)
+ROOM_NUM_OBJECTS = 0x14   # u8
+ROOM_BOXES = 0x15         # u16 offset
+ROOM_NUM_SOUNDS = 0x17    # u8
+ROOM_NUM_SCRIPTS = 0x18   # u8
+ROOM_ENTRY_SCRIPT = 0x19  # u16 offset (ENCD)
+ROOM_EXIT_SCRIPT = 0x1B   # u16 offset (EXCD)
+ROOM_TABLE_OFFSETS = 5    # 0x0A부터 u16 offset 5개 (SMAP + 마스크/Z-plane)
+
+
+class ResourceSpan:
+    """같은 offset을 가리키는 리소스 테이블 항목들의 범위"""
+
+    __slots__ = ('indices', 'offset', 'size')
+
+    def __init__(self, indices, offset, size):
+        self.indices = indices
+        self.offset = offset
+        self.size = size
+
+    def __repr__(self):
+        return f'ResourceSpan(indices={self.indices}, offset=0x{self.offset:04X}, size={self.size})'
+
+
+class StripSpan:
+    """SMAP strip 하나의 절대 범위"""
+
+    __slots__ = ('offset', 'size')
+
+    def __init__(self, offset, size):
+        self.offset = offset
+        self.size = size
+
+    def __repr__(self):
+        return f'StripSpan(offset=0x{self.offset:04X}, size={self.size})'
+
+
+class ObjectSpan:
+    """오브젝트 하나의 OBIM 범위와 OBCD offset"""
+
+    __slots__ = ('id', 'obim_offset', 'obim_size', 'obcd_offset')
+
+    def __init__(self, obj_id, obim_offset, obim_size, obcd_offset):
+        self.id = obj_id
+        self.obim_offset = obim_offset
+        self.obim_size = obim_size
+        self.obcd_offset = obcd_offset
+
+    def __repr__(self):
+        return (f'ObjectSpan(id={self.id}, obim=0x{self.obim_offset:04X}+{self.obim_size}, '
+                f'obcd=0x{self.obcd_offset:04X})')
+
+
+class Room:
+    """파싱된 Room 구조 (원본 테이블 + 계산된 범위)"""
+
+    __slots__ = ('size', 'width', 'height', 'smap_ptr',
+                 'resource_offsets', 'strip_offsets', 'obim_offsets', 'obcd_offsets',
+                 'resources', 'strips', 'objects')
+
+    def __init__(self, size, width, height, smap_ptr,
+                 resource_offsets, strip_offsets, obim_offsets, obcd_offsets):
+        self.size = size
+        self.width = width
+        self.height = height
+        self.smap_ptr = smap_ptr
+        self.resource_offsets = tuple(resource_offsets)
+        self.strip_offsets = tuple(strip_offsets)
+        self.obim_offsets = tuple(obim_offsets)
+        self.obcd_offsets = tuple(obcd_offsets)
+
+        self.resources = group_resource_spans(self.resource_offsets, size)
+        self.strips = _strip_spans(self.strip_offsets, size)
+        self.objects = _object_spans(self.obim_offsets, self.obcd_offsets, size)
+
+    def __repr__(self):
+        return (f'Room({self.width}×{self.height}, {len(self.resources)} resources, '
+                f'{len(self.strips)} strips, {len(self.objects)} objects)')
+
+
+class RoomBlocks:
+    """v3 Room 블록 헤더의 정확한 하위 블록 테이블
+
+    - block_size: Room 블록 크기 (LFL에서 이 뒤는 00.LFL 디렉토리가 가리키는 리소스)
+    - obim_offsets / obcd_offsets: 헤더의 오브젝트 개수만큼
+    - sound_ids / script_ids: 이 Room에 속한 글로벌 리소스 ID
+    - local_scripts: (로컬 스크립트 ID, offset)
+    """
+
+    __slots__ = ('block_size', 'table_offsets', 'boxes_offset', 'entry_offset', 'exit_offset',
+                 'obim_offsets', 'obcd_offsets', 'sound_ids', 'script_ids', 'local_scripts')
+
+    def __init__(self, block_size, table_offsets, boxes_offset, entry_offset, exit_offset,
+                 obim_offsets, obcd_offsets, sound_ids, script_ids, local_scripts):
+        self.block_size = block_size
+        self.table_offsets = tuple(table_offsets)
+        self.boxes_offset = boxes_offset
+        self.entry_offset = entry_offset
+        self.exit_offset = exit_offset
+        self.obim_offsets = tuple(obim_offsets)
+        self.obcd_offsets = tuple(obcd_offsets)
+        self.sound_ids = tuple(sound_ids)
+        self.script_ids = tuple(script_ids)
+        self.local_scripts = tuple(local_scripts)
+
+    def __repr__(self):
+        return (f'RoomBlocks(size={self.block_size}, {len(self.obim_offsets)} objects, '
+                f'{len(self.local_scripts)} local scripts)')
+
+    def script_spans(self):
+        """(이름, 스크립트 ID, offset, size) - entry/exit/local 스크립트
+
+        끝 = 헤더가 가리키는 다음 하위 블록 offset 또는 Room 블록 끝
+        """
+        boundaries = sorted(set(self.table_offsets + self.obim_offsets + self.obcd_offsets
+                                + (self.boxes_offset, self.entry_offset, self.exit_offset,
+                                   self.block_size)
+                                + tuple(offset for _, offset in self.local_scripts)))
+
+        def span_size(offset):
+            for boundary in boundaries:
+                if boundary > offset:
+                    return boundary - offset
+            return 0
+
+        spans = [('entry', 0, self.entry_offset, span_size(self.entry_offset)),
+                 ('exit', 0, self.exit_offset, span_size(self.exit_offset))]
+        for script_id, offset in self.local_scripts:
+            spans.append(('local', script_id, offset, span_size(offset)))
+        return [span for span in spans if span[3] > 0]
+
+
+def parse_room_blocks(data):
+    """Room 블록 헤더 → RoomBlocks (Room이 아니거나 테이블이 범위를 벗어나면 None)
+
+    parse_room의 휴리스틱 테이블 탐색과 달리 헤더의 개수 필드만 사용한다.
+    """
+    size = len(data)
+    if size < OBJECT_TABLE_START:
+        return None
+
+    def u16(pos):
+        return data[pos] | (data[pos + 1] << 8)
+
+    block_size = u16(0)
+    num_objects = data[ROOM_NUM_OBJECTS]
+    num_sounds = data[ROOM_NUM_SOUNDS]
+    num_scripts = data[ROOM_NUM_SCRIPTS]
+
+    ptr = OBJECT_TABLE_START + num_objects * 4
+    if block_size > size or ptr + num_sounds + num_scripts > block_size:
+        return None
+
+    table_offsets = [u16(RESOURCE_TABLE_START + i * 2) for i in range(ROOM_TABLE_OFFSETS)]
+    obim_offsets = [u16(OBJECT_TABLE_START + i * 2) for i in range(num_objects)]
+    obcd_offsets = [u16(OBJECT_TABLE_START + (num_objects + i) * 2) for i in range(num_objects)]
+
+    sound_ids = data[ptr:ptr + num_sounds]
+    ptr += num_sounds
+    script_ids = data[ptr:ptr + num_scripts]
+    ptr += num_scripts
+
+    # 로컬 스크립트: (ID u8, offset u16) 반복, ID 0으로 끝
+    local_scripts = []
+    while ptr + 2 < block_size and data[ptr] != 0:
+        local_scripts.append((data[ptr], u16(ptr + 1)))
+        ptr += 3
+
+    offsets = (table_offsets + obim_offsets + obcd_offsets
+               + [u16(ROOM_BOXES), u16(ROOM_ENTRY_SCRIPT), u16(ROOM_EXIT_SCRIPT)]
+               + [offset for _, offset in local_scripts])
+    if any(offset >= block_size for offset in offsets):
+        return None
+
+    return RoomBlocks(block_size, table_offsets, u16(ROOM_BOXES), u16(ROOM_ENTRY_SCRIPT),
+                      u16(ROOM_EXIT_SCRIPT), obim_offsets, obcd_offsets,
+                      sound_ids, script_ids, local_scripts)
+
+
+def group_resource_spans(offsets, size):
+    """리소스 offset 목록 → offset 순으로 정렬된 중복 제거 범위 (다음 offset 또는 파일 끝까지)"""
+    unique_offsets = {}
+    for idx, offset in enumerate(offsets):
+        unique_offsets.setdefault(offset, []).append(idx)
+
+    sorted_offsets = sorted(unique_offsets.items())
+
+    spans = []
+    for i, (offset, indices) in enumerate(sorted_offsets):
+        next_offset = sorted_offsets[i + 1][0] if i < len(sorted_offsets) - 1 else size
+        spans.append(ResourceSpan(indices, offset, next_offset - offset))
+    return spans
+
+
+def _strip_spans(strip_offsets, size):
+    spans = []
+    for i, offset in enumerate(strip_offsets):
+        end = strip_offsets[i + 1] if i < len(strip_offsets) - 1 else size
+        spans.append(StripSpan(offset, end - offset))
+    return spans
+
+
+def _object_spans(obim_offsets, obcd_offsets, size):
+    num_objects = len(obim_offsets)
+    objects = []
+
+    for i, obim_offset in enumerate(obim_offsets):
+        obcd_offset = obcd_offsets[i] if i < len(obcd_offsets) else 0
+
+        # OBIM 크기 추정: 다음 OBIM 또는 첫 OBCD까지
+        if i < num_objects - 1:
+            obim_size = obim_offsets[i + 1] - obim_offset
+        else:
+            # 마지막 오브젝트: OBCD까지
+            obim_size = obcd_offset - obim_offset if obcd_offset > obim_offset else 100
+
+        # 파일 범위로 자른 실제 슬라이스 길이
+        obim_size = len(range(size)[obim_offset:obim_offset + obim_size])
+        objects.append(ObjectSpan(i, obim_offset, obim_size, obcd_offset))
+
+    return objects
+
+
+@profiled('parse', measure=len)
+def parse_room(data):
+    """복호화된 Room 데이터 → Room (한 번의 순차 패스)"""
+    size = len(data)
+
+    if size < 10:
+        return Room(size, 0, 0, 0, (), (), (), ())
+
+    width = data[4] | (data[5] << 8)
+    height = data[6] | (data[7] << 8)
+
+    # 리소스 테이블: 0x0A부터 0이 나올 때까지
+    resource_offsets = []
+    for i in range(MAX_RESOURCES):
+        pos = RESOURCE_TABLE_START + i * 2
+        if pos + 1 >= size:
+            break
+        offset = data[pos] | (data[pos + 1] << 8)
+        if offset == 0:
+            break
+        resource_offsets.append(offset)
+
+    # 오브젝트 테이블: OBIM offset들 → 같은 개수의 OBCD offset들
+    obim_offsets = []
+    obcd_offsets = []
+    if size >= 32:
+        ptr = OBJECT_TABLE_START
+        for i in range(MAX_OBJECTS):
+            if ptr + 1 >= size:
+                break
+            offset = data[ptr] | (data[ptr + 1] << 8)
+            if offset == 0 or offset >= size:
+                break
+            obim_offsets.append(offset)
+            ptr += 2
+
+        for i in range(len(obim_offsets)):
+            if ptr + 1 >= size:
+                break
+            obcd_offsets.append(data[ptr] | (data[ptr + 1] << 8))
+            ptr += 2
+
+    # SMAP = Resource 0, strip offset은 SMAP+2부터 (SMAP 기준 상대 주소)
+    smap_ptr = resource_offsets[0] if resource_offsets else 0
+    strip_offsets = []
+    if smap_ptr < size:
+        for i in range(min(MAX_STRIPS, (width + 7) // 8)):
+            offset_pos = smap_ptr + 2 + i * 2
+            if offset_pos + 1 >= size:
+                break
+            strip_offset = data[offset_pos] | (data[offset_pos + 1] << 8)
+            if strip_offset == 0 or smap_ptr + strip_offset >= size:
+                break
+            strip_offsets.append(smap_ptr + strip_offset)
+
+    return Room(size, width, height, smap_ptr,
+                resource_offsets, strip_offsets, obim_offsets, obcd_offsets)
+
+
+def rebuild_room_image(room_data, room):
+    """SMAP을 재구성된 포맷으로 변환 (width, height, strip offset table, strip data)
+
+    Returns: (bytes, width, height, num_strips) 또는 None
+    """
+    if room.size < 10 or room.smap_ptr >= room.size or not room.strips:
+        return None
+
+    header_size = 4  # width + height
+    table_size = len(room.strips) * 2
+
+    new_data = bytearray(header_size + table_size)
+    new_data[0:4] = bytes((room.width & 0xFF, (room.width >> 8) & 0xFF,
+                           room.height & 0xFF, (room.height >> 8) & 0xFF))
+
+    # 새 offset table (상대 주소, headerSize 기준) + strip 데이터
+    current_offset = header_size + table_size
+    for i, strip in enumerate(room.strips):
+        table_pos = header_size + i * 2
+        new_data[table_pos] = current_offset & 0xFF
+        new_data[table_pos + 1] = (current_offset >> 8) & 0xFF
+        current_offset += strip.size
+
+    for strip in room.strips:
+        new_data += room_data[strip.offset:strip.offset + strip.size]
+
+    return bytes(new_data), room.width, room.height, len(room.strips)
+
+
+def render_room(room_data, room):
+    """SMAP의 모든 strip을 하나의 Frame에 디코딩 (strip이 없으면 None)"""
+    if not room.strips:
+        return None
+    return render_strips(room_data, room.strip_offsets, room.width, room.height)
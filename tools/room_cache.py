@@ -0,0 +1,111 @@
+"""
+파싱된 Room 구조 캐시
+LFL 파일 (경로, 크기, mtime) + 파서 버전을 키로 디스크(.loom_cache/)와 프로세스 내 LRU에 저장
+캐시 적중 시 LFL 파일을 읽지 않고, 미스일 때도 LFLFile(mmap)로 헤더/테이블 범위만 복호화해서 파싱
+"""
+import hashlib
+import os
+import struct
+from collections import OrderedDict
+from pathlib import Path
+
+from lfl_reader import LFLFile
+from room import PARSER_VERSION, Room, parse_room
+
+
+CACHE_ROOT = Path(os.environ.get('LOOM_CACHE_DIR', '.loom_cache'))
+CACHE_DIR = CACHE_ROOT / 'rooms'
+
+MAGIC = b'LRC1'
+HEADER = struct.Struct('<4sHIHHH')   # magic, version, size, width, height, smap_ptr
+
+# 프로세스 내 LRU (content key → Room)
+LRU_SIZE = 128
+_lru = OrderedDict()
+
+
+def encode_room(room):
+    """Room → compact binary (원본 테이블만 저장, 범위는 로드 시 계산)"""
+    out = bytearray(HEADER.pack(MAGIC, PARSER_VERSION, room.size,
+                                room.width, room.height, room.smap_ptr))
+    for fmt, values in (('H', room.resource_offsets), ('I', room.strip_offsets),
+                        ('H', room.obim_offsets), ('H', room.obcd_offsets)):
+        out += struct.pack(f'<H{len(values)}{fmt}', len(values), *values)
+    return bytes(out)
+
+
+def decode_room(blob):
+    """compact binary → Room (형식이 맞지 않으면 None)"""
+    if len(blob) < HEADER.size:
+        return None
+    magic, version, size, width, height, smap_ptr = HEADER.unpack_from(blob, 0)
+    if magic != MAGIC or version != PARSER_VERSION:
+        return None
+
+    pos = HEADER.size
+    columns = []
+    for itemsize, fmt in ((2, 'H'), (4, 'I'), (2, 'H'), (2, 'H')):
+        if pos + 2 > len(blob):
+            return None
+        (count,) = struct.unpack_from('<H', blob, pos)
+        pos += 2
+        if pos + count * itemsize > len(blob):
+            return None
+        columns.append(struct.unpack_from(f'<{count}{fmt}', blob, pos))
+        pos += count * itemsize
+
+    return Room(size, width, height, smap_ptr, *columns)
+
+
+def content_key(raw):
+    """LFL 원본 바이트 해시 (출력 저장소/서버 캐시 키)"""
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def stat_key(lfl_path):
+    """LFL 파일 (절대 경로, 크기, mtime) 해시 (Room 캐시 키, 파일 내용은 읽지 않음)"""
+    path = Path(lfl_path).resolve()
+    st = path.stat()
+    return hashlib.blake2b(f'{path}\0{st.st_size}\0{st.st_mtime_ns}'.encode(), digest_size=16).hexdigest()
+
+
+def _cache_path(key):
+    return CACHE_DIR / f'{key}.v{PARSER_VERSION}.bin'
+
+
+def _load_from_disk(key):
+    cache_path = _cache_path(key)
+    if not cache_path.exists():
+        return None
+    return decode_room(cache_path.read_bytes())
+
+
+def _store_on_disk(key, room):
+    cache_path = _cache_path(key)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # 원자적 쓰기 (동시 실행 대비)
+    tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+    tmp_path.write_bytes(encode_room(room))
+    os.replace(tmp_path, cache_path)
+
+
+def load_room(lfl_path):
+    """LFL 파일의 파싱된 Room (LRU → 디스크 캐시 → 파싱 순)"""
+    key = stat_key(lfl_path)
+
+    room = _lru.get(key)
+    if room is not None:
+        _lru.move_to_end(key)
+        return room
+
+    room = _load_from_disk(key)
+    if room is None:
+        # 헤더, 리소스/오브젝트 테이블, SMAP strip 테이블이 있는 페이지만 복호화
+        with LFLFile(lfl_path) as data:
+            room = parse_room(data)
+        _store_on_disk(key, room)
+
+    _lru[key] = room
+    if len(_lru) > LRU_SIZE:
+        _lru.popitem(last=False)
+    return room
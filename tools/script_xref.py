@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+SCUMM v3 스크립트 참조 인덱스
+00.LFL 글로벌 스크립트 + Room entry/exit/local 스크립트를 scumm_v3.py IR로 디코딩하고
+어떤 스크립트가 어떤 오브젝트/Room/사운드/스크립트/변수를 참조하는지 (종류, 값) → 참조 목록 dict로 만든다
+
+    xref = load_xref()                                      # analyze/script_xref.json
+    xref.scripts('sound', 18)                               # 사운드 18을 참조하는 스크립트
+    xref.scripts('sound', 18, opcodes={'startSound'})       # 사운드 18을 시작하는 스크립트
+
+    python3 tools/script_xref.py        # 인덱스 생성 → analyze/script_xref.json
+
+스크립트 이름은 server.py 경로와 같다: script/ID, room/NN/entry, room/NN/exit, room/NN/local/ID
+오브젝트/Room/사운드/스크립트 참조는 상수 피연산자만 (변수로 넘기면 값을 알 수 없음),
+변수 참조는 Var/Bit만 (Local은 스크립트 안에서만 의미가 있음)
+"""
+import json
+from pathlib import Path
+
+from extract_indexed_resources import read_block
+from lfl_reader import read_lfl
+from profiling import span
+from resource_index import RESOURCE_HEADER_SIZE, load_index
+from room import parse_room_blocks
+from scumm_v3 import (OPCODE_NAMES, OPERAND_BIT, OPERAND_CONST, OPERAND_VAR, ROLE_RESULT, ROLES,
+                      ScriptIR, decode_script)
+
+
+XREF_PATH = Path('analyze/script_xref.json')
+
+# 인덱스 종류: 역할이 있는 상수 + 변수
+REF_KINDS = ('object', 'room', 'sound', 'script', 'var', 'bit')
+VARIABLE_KINDS = {OPERAND_VAR: 'var', OPERAND_BIT: 'bit'}
+
+
+class ScriptXref:
+    """스크립트 참조 인덱스
+
+    names: 스크립트 이름 목록, errors: 이름 → 디코딩 오류 (끝까지 디코딩된 스크립트는 없음)
+    refs: (종류, 값) → [(스크립트 번호, offset, opcode 이름)] (스크립트/offset 순)
+    """
+
+    def __init__(self, names, refs, errors=None):
+        self.names = names
+        self.refs = refs
+        self.errors = errors or {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, kind, value):
+        """(종류, 값) → [(스크립트 이름, offset, opcode 이름)]"""
+        return [(self.names[script], offset, opcode)
+                for script, offset, opcode in self.refs.get((kind, value), ())]
+
+    def scripts(self, kind, value, opcodes=None):
+        """(종류, 값)을 참조하는 스크립트 이름 (opcodes가 있으면 그 명령만)"""
+        found = []
+        for script, _, opcode in self.refs.get((kind, value), ()):
+            name = self.names[script]
+            if (opcodes is None or opcode in opcodes) and (not found or found[-1] != name):
+                found.append(name)
+        return found
+
+    def values(self, kind):
+        """종류별로 참조된 값 (정렬)"""
+        return sorted(value for ref_kind, value in self.refs if ref_kind == kind)
+
+    def to_dict(self):
+        refs = {kind: {} for kind in REF_KINDS}
+        for (kind, value), entries in sorted(self.refs.items()):
+            refs[kind][str(value)] = [list(entry) for entry in entries]
+        return {'scripts': self.names, 'errors': self.errors, 'refs': refs}
+
+    @classmethod
+    def from_dict(cls, data):
+        refs = {(kind, int(value)): [tuple(entry) for entry in entries]
+                for kind, by_value in data['refs'].items()
+                for value, entries in by_value.items()}
+        return cls(data['scripts'], refs, data.get('errors'))
+
+
+def collect_scripts(lfl_dir='.'):
+    """LFL 파일 → [(스크립트 이름, bytes)] (글로벌 스크립트는 리소스 헤더를 뗌)"""
+    lfl_dir = Path(lfl_dir)
+    index = load_index(lfl_dir)
+    rooms = {}
+
+    def room_data(num):
+        if num not in rooms:
+            lfl_path = lfl_dir / f'{num:02d}.LFL'
+            rooms[num] = read_lfl(lfl_path) if lfl_path.exists() else None
+        return rooms[num]
+
+    scripts = []
+    for script_id in range(index.count('script')):
+        location = index.locate('script', script_id)
+        data = room_data(location[0]) if location else None
+        if data is None:
+            continue
+        size = read_block(data, location[1], 0)
+        if size:
+            scripts.append((f'script/{script_id}', bytes(data[location[1] + RESOURCE_HEADER_SIZE:location[1] + size])))
+
+    for lfl_path in sorted(lfl_dir.glob('*.LFL')):
+        num = int(lfl_path.stem)
+        data = room_data(num) if num else None
+        blocks = parse_room_blocks(data) if data else None
+        if blocks is None:
+            continue
+        for kind, script_id, offset, size in blocks.script_spans():
+            name = f'room/{num:02d}/{kind}' + (f'/{script_id}' if kind == 'local' else '')
+            scripts.append((name, bytes(data[offset:offset + size])))
+    return scripts
+
+
+def build_xref(scripts):
+    """[(이름, bytes)] → (ScriptXref, ScriptIR, [ScriptCode]) (모든 스크립트를 IR 하나에 디코딩)"""
+    ir = ScriptIR()
+    names = []
+    codes = []
+    errors = {}
+    refs = {}
+
+    with span('xref', nbytes=sum(len(data) for _, data in scripts)):
+        for script, (name, data) in enumerate(scripts):
+            code = decode_script(data, ir)
+            names.append(name)
+            codes.append(code)
+            if code.error:
+                errors[name] = code.error
+
+            for i in range(code.start, code.start + code.count):
+                entry = (script, ir.offsets[i], OPCODE_NAMES[ir.opcodes[i]])
+                for kind, value, role in ir.operands(i):
+                    if kind == OPERAND_CONST:
+                        if role == ROLE_RESULT or not ROLES[role]:
+                            continue
+                        key = (ROLES[role], value)
+                    elif kind in VARIABLE_KINDS:
+                        key = (VARIABLE_KINDS[kind], value)
+                    else:
+                        continue
+                    entries = refs.setdefault(key, [])
+                    if not entries or entries[-1] != entry:
+                        entries.append(entry)
+
+    return ScriptXref(names, refs, errors), ir, codes
+
+
+def load_xref(path=XREF_PATH):
+    """저장된 인덱스 → ScriptXref 또는 None (없으면)"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return ScriptXref.from_dict(json.load(f))
+
+
+def main():
+    print('🔗 LOOM 스크립트 참조 인덱스')
+    print('=' * 70)
+
+    scripts = collect_scripts()
+    if not scripts:
+        print('❌ 스크립트가 없습니다. (LFL 파일 확인)')
+        return
+
+    xref, ir, codes = build_xref(scripts)
+
+    print(f'\n📜 스크립트 {len(xref)}개 → 명령 {len(ir)}개')
+    print(f'   끝까지 디코딩: {len(xref) - len(xref.errors)}개')
+    for name, error in xref.errors.items():
+        print(f'   ⚠️  {name} - {error}')
+
+    print('\n📊 참조 대상')
+    for kind in REF_KINDS:
+        print(f'   {kind:7s} {len(xref.values(kind)):5d}개')
+
+    XREF_PATH.parent.mkdir(exist_ok=True)
+    with open(XREF_PATH, 'w', encoding='utf-8') as f:
+        json.dump(xref.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
+    print(f'\n   결과: {XREF_PATH}')
+
+
+if __name__ == '__main__':
+    main()
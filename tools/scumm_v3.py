@@ -0,0 +1,915 @@
+"""
+SCUMM v3 스크립트 디코더 (descumm 없이 프로세스 안에서 디스어셈블)
+opcode byte로 인덱싱한 디스패치 테이블(OPCODES, 256개)로 명령 하나씩 디코딩하고
+descumm과 같은 형식의 줄 `[OFFS] (OP) 문장`을 만든다 (if/while 블록 재구성 없음, `descumm -i`와 같음)
+
+opcode 표는 ScummVM script_v5.cpp + v3/v4 변경(ifState, waitForActor, setBoxFlags 등) 기준.
+파라미터 비트: opcode & 0x80 / 0x40 / 0x20 → 1/2/3번째 파라미터가 변수 (아니면 상수)
+변수 word: 0x8000 Bit[], 0x4000 Local[], 그 외 Var[], 0x2000이면 인덱스 word가 뒤따름
+
+    lines, error = disassemble(data)
+    text = format_listing(lines)
+
+구조화된 IR: 명령/피연산자를 병렬 array(ScriptIR)에 기록 (script_xref.py가 참조 인덱스로 사용)
+피연산자마다 종류(상수/Var/Local/Bit)와 역할(object/room/sound/script/result)을 함께 저장
+
+    ir = ScriptIR()
+    code = decode_script(data, ir)    # → ScriptCode(start, count, size, error)
+"""
+from array import array
+
+from profiling import span
+
+
+PARAM_1 = 0x80
+PARAM_2 = 0x40
+PARAM_3 = 0x20
+PARAM_BITS = {'1': PARAM_1, '2': PARAM_2, '3': PARAM_3}
+
+# 피연산자 종류
+OPERAND_CONST = 0
+OPERAND_VAR = 1
+OPERAND_LOCAL = 2
+OPERAND_BIT = 3
+OPERAND_KINDS = ('const', 'var', 'local', 'bit')
+
+# 피연산자 역할 (spec에서 'B1:sound'처럼 지정, result = 결과 변수)
+ROLE_NONE = 0
+ROLE_OBJECT = 1
+ROLE_ROOM = 2
+ROLE_SOUND = 3
+ROLE_SCRIPT = 4
+ROLE_RESULT = 5
+ROLES = ('', 'object', 'room', 'sound', 'script', 'result')
+ROLE_NUMBERS = {name: number for number, name in enumerate(ROLES) if name}
+
+# opcode → 이름 (4개씩, ScummVM setupOpcodes 순서)
+OPCODE_NAMES = (
+    # 00
+    'stopObjectCode', 'putActor', 'startMusic', 'getActorRoom',
+    'isGreaterEqual', 'drawObject', 'getActorElevation', 'setState',
+    'isNotEqual', 'faceActor', 'startScript', 'getVerbEntrypoint',
+    'resourceRoutines', 'walkActorToActor', 'putActorAtObject', 'ifState',
+    # 10
+    'getObjectOwner', 'animateActor', 'panCameraTo', 'actorOps',
+    'print', 'actorFromPos', 'getRandomNr', 'and',
+    'jumpRelative', 'doSentence', 'move', 'multiply',
+    'startSound', 'ifClassOfIs', 'walkActorTo', 'isActorInBox',
+    # 20
+    'stopMusic', 'putActor', 'saveLoadGame', 'getActorY',
+    'loadRoomWithEgo', 'drawObject', 'setVarRange', 'stringOps',
+    'equalZero', 'setOwnerOf', 'startScript', 'delayVariable',
+    'cursorCommand', 'putActorInRoom', 'delay', 'ifNotState',
+    # 30
+    'setBoxFlags', 'getInventoryCount', 'setCameraAt', 'roomOps',
+    'getDist', 'findObject', 'walkActorToObject', 'startObject',
+    'isLessEqual', 'doSentence', 'subtract', 'waitForActor',
+    'stopSound', 'findInventory', 'walkActorTo', 'drawBox',
+    # 40
+    'cutscene', 'putActor', 'chainScript', 'getActorX',
+    'isLess', 'drawObject', 'increment', 'setState',
+    'isEqual', 'faceActor', 'startScript', 'getVerbEntrypoint',
+    'waitForSentence', 'walkActorToActor', 'putActorAtObject', 'ifState',
+    # 50
+    'pickupObject', 'animateActor', 'actorFollowCamera', 'actorOps',
+    'setObjectName', 'actorFromPos', 'getActorMoving', 'or',
+    'beginOverride', 'doSentence', 'add', 'divide',
+    'oldRoomEffect', 'setClass', 'walkActorTo', 'isActorInBox',
+    # 60
+    'freezeScripts', 'putActor', 'stopScript', 'getActorFacing',
+    'loadRoomWithEgo', 'drawObject', 'getClosestObjActor', 'getStringWidth',
+    'isScriptRunning', 'setOwnerOf', 'startScript', 'debug',
+    'getActorWidth', 'putActorInRoom', 'stopObjectScript', 'ifNotState',
+    # 70
+    'lights', 'getActorCostume', 'loadRoom', 'roomOps',
+    'getDist', 'findObject', 'walkActorToObject', 'startObject',
+    'isGreater', 'doSentence', 'verbOps', 'getActorWalkBox',
+    'isSoundRunning', 'findInventory', 'walkActorTo', 'drawBox',
+    # 80
+    'breakHere', 'putActor', 'startMusic', 'getActorRoom',
+    'isGreaterEqual', 'drawObject', 'getActorElevation', 'setState',
+    'isNotEqual', 'faceActor', 'startScript', 'getVerbEntrypoint',
+    'resourceRoutines', 'walkActorToActor', 'putActorAtObject', 'ifState',
+    # 90
+    'getObjectOwner', 'animateActor', 'panCameraTo', 'actorOps',
+    'print', 'actorFromPos', 'getRandomNr', 'and',
+    'systemOps', 'doSentence', 'move', 'multiply',
+    'startSound', 'ifClassOfIs', 'walkActorTo', 'isActorInBox',
+    # A0
+    'stopObjectCode', 'putActor', 'saveLoadGame', 'getActorY',
+    'loadRoomWithEgo', 'drawObject', 'setVarRange', 'saveLoadVars',
+    'notEqualZero', 'setOwnerOf', 'startScript', 'saveRestoreVerbs',
+    'expression', 'putActorInRoom', 'wait', 'ifNotState',
+    # B0
+    'setBoxFlags', 'getInventoryCount', 'setCameraAt', 'roomOps',
+    'getDist', 'findObject', 'walkActorToObject', 'startObject',
+    'isLessEqual', 'doSentence', 'subtract', 'waitForActor',
+    'stopSound', 'findInventory', 'walkActorTo', 'drawBox',
+    # C0
+    'endCutscene', 'putActor', 'chainScript', 'getActorX',
+    'isLess', 'drawObject', 'decrement', 'setState',
+    'isEqual', 'faceActor', 'startScript', 'getVerbEntrypoint',
+    'pseudoRoom', 'walkActorToActor', 'putActorAtObject', 'ifState',
+    # D0
+    'pickupObject', 'animateActor', 'actorFollowCamera', 'actorOps',
+    'setObjectName', 'actorFromPos', 'getActorMoving', 'or',
+    'printEgo', 'doSentence', 'add', 'divide',
+    'oldRoomEffect', 'setClass', 'walkActorTo', 'isActorInBox',
+    # E0
+    'freezeScripts', 'putActor', 'stopScript', 'getActorFacing',
+    'loadRoomWithEgo', 'drawObject', 'getClosestObjActor', 'getStringWidth',
+    'isScriptRunning', 'setOwnerOf', 'startScript', 'debug',
+    'getActorWidth', 'putActorInRoom', 'stopObjectScript', 'ifNotState',
+    # F0
+    'lights', 'getActorCostume', 'loadRoom', 'roomOps',
+    'getDist', 'findObject', 'walkActorToObject', 'startObject',
+    'isGreater', 'doSentence', 'verbOps', 'getActorWalkBox',
+    'isSoundRunning', 'findInventory', 'walkActorTo', 'drawBox',
+)
+
+# 단순 명령: 이름 → 파라미터 (B/W + 번호 = 변수 또는 byte/word, b/w = 상수, L = 가변 인자, S = 문자열)
+# R로 시작하면 결과 변수에 대입, ':역할'은 참조 인덱스용 (ROLES)
+SIMPLE_OPS = {
+    'stopObjectCode': '',
+    'putActor': 'B1 W2 W3',
+    'startMusic': 'B1:sound',
+    'getActorRoom': 'R B1',
+    'drawObject': 'W1:object W2 W3',
+    'getActorElevation': 'R B1',
+    'setState': 'W1:object B2',
+    'faceActor': 'B1 W2',
+    'getVerbEntrypoint': 'R W1:object W2',
+    'walkActorToActor': 'B1 B2 b',
+    'putActorAtObject': 'B1 W2:object',
+    'getObjectOwner': 'R W1:object',
+    'animateActor': 'B1 B2',
+    'panCameraTo': 'W1',
+    'actorFromPos': 'R W1 W2',
+    'getRandomNr': 'R B1',
+    'move': 'R W1',
+    'startSound': 'B1:sound',
+    'walkActorTo': 'B1 W2 W3',
+    'stopMusic': '',
+    'saveLoadGame': 'R B1',
+    'getActorY': 'R W1',
+    'loadRoomWithEgo': 'W1:object B2:room w w',
+    'setOwnerOf': 'W1:object B2',
+    'putActorInRoom': 'B1 B2:room',
+    'setBoxFlags': 'B1 b',
+    'getInventoryCount': 'R B1',
+    'setCameraAt': 'W1',
+    'getDist': 'R W1 W2',
+    'findObject': 'R W1 W2',
+    'walkActorToObject': 'B1 W2:object',
+    'waitForActor': 'B1',
+    'stopSound': 'B1:sound',
+    'findInventory': 'R B1 B2',
+    'cutscene': 'L',
+    'getActorX': 'R W1',
+    'waitForSentence': '',
+    'pickupObject': 'W1:object',
+    'actorFollowCamera': 'B1',
+    'setObjectName': 'W1:object S',
+    'getActorMoving': 'R B1',
+    'freezeScripts': 'B1',
+    'stopScript': 'B1:script',
+    'getActorFacing': 'R B1',
+    'getClosestObjActor': 'R W1',
+    'getStringWidth': 'R B1',
+    'isScriptRunning': 'R B1:script',
+    'debug': 'W1',
+    'getActorWidth': 'R B1',
+    'stopObjectScript': 'W1:object',
+    'lights': 'B1 b b',
+    'getActorCostume': 'R B1',
+    'loadRoom': 'B1:room',
+    'getActorWalkBox': 'R B1',
+    'isSoundRunning': 'R B1:sound',
+    'breakHere': '',
+    'endCutscene': '',
+    'systemOps': 'b',
+}
+
+# 비교 → 조건 (변수가 왼쪽: ScummVM은 jumpRelative(b OP a), a = 변수)
+COMPARISONS = {
+    'isEqual': '==',
+    'isNotEqual': '!=',
+    'isGreater': '<',
+    'isGreaterEqual': '<=',
+    'isLess': '>',
+    'isLessEqual': '>=',
+}
+
+ARITHMETIC = {'add': '+=', 'subtract': '-=', 'multiply': '*=', 'divide': '/=', 'and': '&=', 'or': '|='}
+
+# 하위 명령 이름 (하위 opcode & 0x1F) → (이름, 파라미터)
+ACTOR_OPS = {
+    0: ('dummy', 'B1'), 1: ('costume', 'B1'), 2: ('walkSpeed', 'B1 B2'), 3: ('sound', 'B1'),
+    4: ('walkAnimation', 'B1'), 5: ('talkAnimation', 'B1 B2'), 6: ('standAnimation', 'B1'),
+    7: ('animation', 'B1 B2 B3'), 8: ('default', ''), 9: ('elevation', 'W1'),
+    10: ('animationDefault', ''), 11: ('palette', 'B1 B2'), 12: ('talkColor', 'B1'),
+    13: ('name', 'S'), 14: ('initAnimation', 'B1'), 16: ('width', 'B1'), 17: ('scale', 'B1 B2'),
+    18: ('neverZClip', ''), 19: ('setZClip', 'B1'), 20: ('ignoreBoxes', ''),
+    21: ('followBoxes', ''), 22: ('animationSpeed', 'B1'), 23: ('shadow', 'B1'),
+}
+
+# v3 actorOps 하위 번호 → v5 번호 (ScummVM small header convertTable, 인덱스 = 번호 - 1)
+ACTOR_OPS_V3 = (1, 0, 0, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 20)
+
+VERB_OPS = {
+    1: ('image', 'W1'), 2: ('name', 'S'), 3: ('color', 'B1'), 4: ('hicolor', 'B1'),
+    5: ('setXY', 'W1 W2'), 6: ('on', ''), 7: ('off', ''), 8: ('delete', ''), 9: ('new', ''),
+    16: ('dimColor', 'B1'), 17: ('dim', ''), 18: ('key', 'B1'), 19: ('center', ''),
+    20: ('setToString', 'W1'), 22: ('setToObject', 'W1:object B2'), 23: ('backColor', 'B1'),
+}
+
+RESOURCE_OPS = {
+    1: 'loadScript', 2: 'loadSound', 3: 'loadCostume', 4: 'loadRoom',
+    5: 'nukeScript', 6: 'nukeSound', 7: 'nukeCostume', 8: 'nukeRoom',
+    9: 'lockScript', 10: 'lockSound', 11: 'lockCostume', 12: 'lockRoom',
+    13: 'unlockScript', 14: 'unlockSound', 15: 'unlockCostume', 16: 'unlockRoom',
+    17: 'clearHeap', 18: 'loadCharset', 19: 'nukeCharset',
+}
+# resourceRoutines 대상 이름 끝 → 역할
+RESOURCE_ROLES = {'Script': ROLE_SCRIPT, 'Sound': ROLE_SOUND, 'Room': ROLE_ROOM}
+
+CURSOR_OPS = {
+    1: ('cursorOn', ''), 2: ('cursorOff', ''), 3: ('userputOn', ''), 4: ('userputOff', ''),
+    5: ('cursorSoftOn', ''), 6: ('cursorSoftOff', ''), 7: ('userputSoftOn', ''),
+    8: ('userputSoftOff', ''), 10: ('setCursorImg', 'B1 B2'), 11: ('setCursorHotspot', 'B1 B2 B3'),
+    12: ('initCursor', 'B1'), 13: ('initCharset', 'B1'), 14: ('charsetColors', 'L'),
+}
+
+ROOM_OPS = {
+    1: 'scroll', 2: 'color', 3: 'screen', 4: 'palette', 5: 'shakeOn', 6: 'shakeOff',
+}
+
+STRING_OPS = {
+    1: ('putCodeInString', 'B1 S'), 2: ('copyString', 'B1 B2'), 3: ('setStringChar', 'B1 B2 B3'),
+    4: ('getStringChar', 'R B1 B2'), 5: ('createString', 'B1 B2'),
+}
+
+WAIT_OPS = {1: ('forActor', 'B1'), 2: ('forMessage', ''), 3: ('forCamera', ''), 4: ('forSentence', '')}
+
+SAVE_RESTORE_VERBS = {1: 'saveVerbs', 2: 'restoreVerbs', 3: 'deleteVerbs'}
+
+# 문자열 안의 0xFF 제어 코드 → (이름, word 인자 수)
+STRING_CODES = {
+    1: ('newline', 0), 2: ('keepText', 0), 3: ('wait', 0), 4: ('getInt', 1), 5: ('getVerb', 1),
+    6: ('getName', 1), 7: ('getString', 1), 8: ('verbNextLine', 0), 9: ('startAnim', 1),
+    12: ('setColor', 1), 13: ('unknown13', 1), 14: ('setFont', 1),
+}
+STRING_SOUND_CODE = 10
+STRING_SOUND_BYTES = 14
+
+STRING_END = 0x00
+SUBOP_END = 0xFF
+
+# listing에서 디코딩이 중단된 위치를 표시하는 줄
+ERROR_MARKER = '// 디코딩 중단: '
+
+
+class ScriptDecodeError(Exception):
+    pass
+
+
+class ScriptIR:
+    """디코딩된 명령 (병렬 array, 여러 스크립트가 한 IR을 공유)
+
+    명령 i: offsets[i], opcodes[i], targets[i] (점프 대상, 없으면 -1),
+           피연산자 operand_starts[i] ~ + operand_counts[i]
+    피연산자 j: kinds[j] (OPERAND_*), values[j] (상수 값 또는 변수 번호), roles[j] (ROLE_*)
+    """
+
+    __slots__ = ('offsets', 'opcodes', 'targets', 'operand_starts', 'operand_counts',
+                 'kinds', 'values', 'roles')
+
+    def __init__(self):
+        self.offsets = array('I')
+        self.opcodes = array('B')
+        self.targets = array('i')
+        self.operand_starts = array('I')
+        self.operand_counts = array('H')
+        self.kinds = array('B')
+        self.values = array('i')
+        self.roles = array('B')
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def add_operand(self, kind, value, role):
+        self.kinds.append(kind)
+        self.values.append(value)
+        self.roles.append(role)
+
+    def add_instruction(self, offset, opcode, target, operand_start):
+        self.offsets.append(offset)
+        self.opcodes.append(opcode)
+        self.targets.append(-1 if target is None else target)
+        self.operand_starts.append(operand_start)
+        self.operand_counts.append(len(self.kinds) - operand_start)
+
+    def truncate_operands(self, count):
+        """디코딩에 실패한 명령의 피연산자 제거"""
+        del self.kinds[count:]
+        del self.values[count:]
+        del self.roles[count:]
+
+    def operands(self, i):
+        """명령 i의 피연산자 → [(종류, 값, 역할)]"""
+        start = self.operand_starts[i]
+        end = start + self.operand_counts[i]
+        return list(zip(self.kinds[start:end], self.values[start:end], self.roles[start:end]))
+
+
+class ScriptCode:
+    """IR 안의 스크립트 하나 (명령 start ~ start + count, 디코딩이 중단되었으면 error)"""
+
+    __slots__ = ('start', 'count', 'size', 'error')
+
+    def __init__(self, start, count, size, error=None):
+        self.start = start
+        self.count = count
+        self.size = size
+        self.error = error
+
+    def __repr__(self):
+        return f'ScriptCode({self.count} instructions, {self.size} bytes, error={self.error!r})'
+
+
+class _Reader:
+    """스크립트 bytes 위의 커서 (현재 opcode의 파라미터 비트 포함, ir이 있으면 피연산자 기록)"""
+
+    __slots__ = ('data', 'pos', 'opcode', 'ir')
+
+    def __init__(self, data, pos=0, ir=None):
+        self.data = data
+        self.pos = pos
+        self.opcode = 0
+        self.ir = ir
+
+    def byte(self):
+        if self.pos >= len(self.data):
+            raise ScriptDecodeError('스크립트 끝에서 잘림')
+        value = self.data[self.pos]
+        self.pos += 1
+        return value
+
+    def word(self):
+        if self.pos + 2 > len(self.data):
+            raise ScriptDecodeError('스크립트 끝에서 잘림')
+        value = self.data[self.pos] | (self.data[self.pos + 1] << 8)
+        self.pos += 2
+        return value
+
+    def signed_word(self):
+        value = self.word()
+        return value - 0x10000 if value & 0x8000 else value
+
+    def var(self, number=None, role=ROLE_NONE):
+        """변수 word → 'Var[N]' / 'Local[N]' / 'Bit[N]' (0x2000이면 인덱스 포함)"""
+        if number is None:
+            number = self.word()
+        index = ''
+        if number & 0x2000:
+            offset = self.word()
+            if offset & 0x2000:
+                index = f' + {self.var(offset & ~0x2000)}'
+            else:
+                index = f' + {offset & 0xFFF}'
+            number &= ~0x2000
+        if number & 0x8000:
+            kind, number, name = OPERAND_BIT, number & 0x7FFF, 'Bit'
+        elif number & 0x4000:
+            kind, number, name = OPERAND_LOCAL, number & 0xFFF, 'Local'
+        else:
+            kind, number, name = OPERAND_VAR, number & 0xFFF, 'Var'
+        if self.ir is not None:
+            self.ir.add_operand(kind, number, role)
+        return f'{name}[{number}{index}]'
+
+    def const(self, value, role=ROLE_NONE):
+        if self.ir is not None:
+            self.ir.add_operand(OPERAND_CONST, value, role)
+        return str(value)
+
+    def param(self, kind, bit, role=ROLE_NONE):
+        """kind: 'B' 변수 또는 byte, 'W' 변수 또는 word"""
+        if self.opcode & bit:
+            return self.var(role=role)
+        return self.const(self.byte() if kind == 'B' else self.word(), role)
+
+    def vararg(self):
+        """가변 인자 목록: (파라미터 비트 byte, 값)* 0xFF"""
+        values = []
+        while True:
+            self.opcode = self.byte()
+            if self.opcode == SUBOP_END:
+                return values
+            values.append(self.param('W', PARAM_1))
+
+    def string(self):
+        """0으로 끝나는 문자열 (0xFF/0xFE 제어 코드는 이름으로)"""
+        out = []
+        while True:
+            c = self.byte()
+            if c == STRING_END:
+                return '"' + ''.join(out) + '"'
+            if c in (0xFF, 0xFE):
+                code = self.byte()
+                if code == STRING_SOUND_CODE:
+                    self.pos += STRING_SOUND_BYTES
+                    out.append('\\sound()')
+                    continue
+                name, words = STRING_CODES.get(code, (f'code{code}', 0))
+                args = ','.join(self.var() if code == 4 else str(self.word()) for _ in range(words))
+                out.append(f'\\{name}({args})')
+            elif c == 0x22 or c == 0x5C:
+                out.append('\\' + chr(c))
+            elif 0x20 <= c < 0x7F:
+                out.append(chr(c))
+            else:
+                out.append(f'\\x{c:02X}')
+
+    def args(self, spec):
+        """파라미터 spec → (결과 변수 또는 None, [인자 텍스트])"""
+        result = None
+        values = []
+        for token in spec.split():
+            token, _, role = token.partition(':')
+            role = ROLE_NUMBERS.get(role, ROLE_NONE)
+            if token == 'R':
+                result = self.var(role=ROLE_RESULT)
+            elif token[0] in 'BW':
+                values.append(self.param(token[0], PARAM_BITS[token[1]], role))
+            elif token == 'b':
+                values.append(self.const(self.byte()))
+            elif token == 'w':
+                values.append(self.const(self.word()))
+            elif token == 'L':
+                values.append('[' + ','.join(self.vararg()) + ']')
+            elif token == 'S':
+                values.append(self.string())
+        return result, values
+
+
+class Line:
+    """디스어셈블된 명령 하나: offset, opcode, 문장, 점프 대상 (없으면 None)"""
+
+    __slots__ = ('offset', 'opcode', 'text', 'target')
+
+    def __init__(self, offset, opcode, text, target=None):
+        self.offset = offset
+        self.opcode = opcode
+        self.text = text
+        self.target = target
+
+    def __str__(self):
+        return f'[{self.offset:04X}] ({self.opcode:02X}) {self.text}'
+
+
+# --- opcode 핸들러 (reader, 이름) → (문장, 점프 대상 또는 None) --------------------
+
+def _call(name, values, result=None):
+    text = f'{name}({",".join(values)})'
+    return f'{result} = {text}' if result else text
+
+
+def _simple(r, name):
+    result, values = r.args(SIMPLE_OPS[name])
+    return _call(name, values, result), None
+
+
+def _jump_unless(r, condition):
+    offset = r.signed_word()
+    target = r.pos + offset
+    return f'unless ({condition}) goto {target:04X}', target
+
+
+def _compare(r, name):
+    a = r.var()
+    b = r.param('W', PARAM_1)
+    return _jump_unless(r, f'{a} {COMPARISONS[name]} {b}')
+
+
+def _zero(r, name):
+    a = r.var()
+    return _jump_unless(r, f'{a} {"==" if name == "equalZero" else "!="} 0')
+
+
+def _state(r, name):
+    obj = r.param('W', PARAM_1, ROLE_OBJECT)
+    state = r.param('B', PARAM_2)
+    return _jump_unless(r, f'getState({obj}) {"==" if name == "ifState" else "!="} {state}')
+
+
+def _actor_in_box(r, name):
+    actor = r.param('B', PARAM_1)
+    box = r.param('B', PARAM_2)
+    return _jump_unless(r, f'isActorInBox({actor},{box})')
+
+
+def _class_list(r):
+    classes = []
+    while True:
+        r.opcode = r.byte()
+        if r.opcode == SUBOP_END:
+            return classes
+        classes.append(r.param('W', PARAM_1))
+
+
+def _if_class_of_is(r, name):
+    obj = r.param('W', PARAM_1, ROLE_OBJECT)
+    classes = _class_list(r)
+    return _jump_unless(r, f'classOfIs({obj},[{",".join(classes)}])')
+
+
+def _set_class(r, name):
+    obj = r.param('W', PARAM_1, ROLE_OBJECT)
+    return f'setClass({obj},[{",".join(_class_list(r))}])', None
+
+
+def _jump(r, name):
+    offset = r.signed_word()
+    target = r.pos + offset
+    return f'goto {target:04X}', target
+
+
+def _arithmetic(r, name):
+    result = r.var(role=ROLE_RESULT)
+    value = r.param('W', PARAM_1)
+    return f'{result} {ARITHMETIC[name]} {value}', None
+
+
+def _step(r, name):
+    return f'{r.var(role=ROLE_RESULT)}{"++" if name == "increment" else "--"}', None
+
+
+def _start_script(r, name):
+    flags = r.opcode
+    script = r.param('B', PARAM_1, ROLE_SCRIPT)
+    args = r.vararg()
+    text = f'startScript({script},[{",".join(args)}]'
+    if flags & 0x20:
+        text += ',F'
+    if flags & 0x40:
+        text += ',R'
+    return text + ')', None
+
+
+def _chain_script(r, name):
+    script = r.param('B', PARAM_1, ROLE_SCRIPT)
+    return f'chainScript({script},[{",".join(r.vararg())}])', None
+
+
+def _start_object(r, name):
+    obj = r.param('W', PARAM_1, ROLE_OBJECT)
+    script = r.param('B', PARAM_2)
+    return f'startObject({obj},{script},[{",".join(r.vararg())}])', None
+
+
+def _do_sentence(r, name):
+    verb = r.param('B', PARAM_1)
+    if verb == '254':
+        return 'doSentence(STOP)', None
+    a = r.param('W', PARAM_2, ROLE_OBJECT)
+    b = r.param('W', PARAM_3, ROLE_OBJECT)
+    return f'doSentence({verb},{a},{b})', None
+
+
+def _sub_ops(r, table, convert=None):
+    """0xFF로 끝나는 하위 명령 목록 → 'name(args)' 목록 (하위 opcode가 파라미터 비트를 가짐)
+
+    convert: 하위 번호 변환표 (인덱스 = 번호 - 1)
+    """
+    ops = []
+    while True:
+        r.opcode = r.byte()
+        if r.opcode == SUBOP_END:
+            return ops
+        number = r.opcode & 0x1F
+        if convert is not None:
+            number = convert[number - 1] if 0 < number <= len(convert) else -1
+        sub = table.get(number)
+        if sub is None:
+            raise ScriptDecodeError(f'알 수 없는 하위 명령 0x{r.opcode:02X}')
+        sub_name, spec = sub
+        _, values = r.args(spec)
+        ops.append(_call(sub_name, values))
+
+
+def _actor_ops(r, name):
+    actor = r.param('B', PARAM_1)
+    return f'actorOps({actor},[{",".join(_sub_ops(r, ACTOR_OPS, ACTOR_OPS_V3))}])', None
+
+
+def _verb_ops(r, name):
+    verb = r.param('B', PARAM_1)
+    return f'verbOps({verb},[{",".join(_sub_ops(r, VERB_OPS))}])', None
+
+
+def _print_ops(r):
+    """print 하위 명령 (0xF = 텍스트, 텍스트 뒤에서 끝남)"""
+    ops = []
+    while True:
+        r.opcode = r.byte()
+        if r.opcode == SUBOP_END:
+            return ops
+        sub = r.opcode & 0x0F
+        if sub == 0:
+            ops.append(f'pos({r.param("W", PARAM_1)},{r.param("W", PARAM_2)})')
+        elif sub == 1:
+            ops.append(f'color({r.param("B", PARAM_1)})')
+        elif sub == 2:
+            ops.append(f'clipped({r.param("W", PARAM_1)})')
+        elif sub == 3:
+            ops.append(f'restoreBG({r.param("W", PARAM_1)},{r.param("W", PARAM_2)})')
+        elif sub == 4:
+            ops.append('center()')
+        elif sub == 6:
+            ops.append(f'height({r.param("W", PARAM_1)})')
+        elif sub == 7:
+            ops.append('overhead()')
+        elif sub == 15:
+            ops.append(f'text({r.string()})')
+            return ops
+        else:
+            raise ScriptDecodeError(f'알 수 없는 print 하위 명령 0x{r.opcode:02X}')
+
+
+def _print(r, name):
+    actor = r.param('B', PARAM_1)
+    return f'print({actor},[{",".join(_print_ops(r))}])', None
+
+
+def _print_ego(r, name):
+    return f'printEgo([{",".join(_print_ops(r))}])', None
+
+
+def _resource_routines(r, name):
+    r.opcode = r.byte()
+    sub = RESOURCE_OPS.get(r.opcode & 0x1F)
+    if sub is None:
+        raise ScriptDecodeError(f'알 수 없는 resourceRoutines 하위 명령 0x{r.opcode:02X}')
+    if sub == 'clearHeap':
+        return 'resourceRoutines.clearHeap()', None
+    role = next((role for suffix, role in RESOURCE_ROLES.items() if sub.endswith(suffix)), ROLE_NONE)
+    return f'resourceRoutines.{sub}({r.param("B", PARAM_1, role)})', None
+
+
+def _cursor_command(r, name):
+    r.opcode = r.byte()
+    sub = CURSOR_OPS.get(r.opcode & 0x1F)
+    if sub is None:
+        raise ScriptDecodeError(f'알 수 없는 cursorCommand 하위 명령 0x{r.opcode:02X}')
+    sub_name, spec = sub
+    _, values = r.args(spec)
+    return f'cursorCommand.{_call(sub_name, values)}', None
+
+
+def _room_ops(r, name):
+    # v3: 파라미터 2개가 하위 opcode 앞에 옴 (파라미터 비트는 주 opcode)
+    a = r.param('W', PARAM_1)
+    b = r.param('W', PARAM_2)
+    sub = r.byte()
+    sub_name = ROOM_OPS.get(sub & 0x1F, f'op{sub & 0x1F}')
+    return f'roomOps.{sub_name}({a},{b})', None
+
+
+def _string_ops(r, name):
+    r.opcode = r.byte()
+    sub = STRING_OPS.get(r.opcode & 0x1F)
+    if sub is None:
+        raise ScriptDecodeError(f'알 수 없는 stringOps 하위 명령 0x{r.opcode:02X}')
+    sub_name, spec = sub
+    result, values = r.args(spec)
+    return _call(f'stringOps.{sub_name}', values, result), None
+
+
+def _wait(r, name):
+    r.opcode = r.byte()
+    sub = WAIT_OPS.get(r.opcode & 0x1F)
+    if sub is None:
+        raise ScriptDecodeError(f'알 수 없는 wait 하위 명령 0x{r.opcode:02X}')
+    sub_name, spec = sub
+    _, values = r.args(spec)
+    return f'wait.{_call(sub_name, values)}', None
+
+
+def _save_restore_verbs(r, name):
+    r.opcode = r.byte()
+    a = r.param('B', PARAM_1)
+    b = r.param('B', PARAM_2)
+    c = r.param('B', PARAM_3)
+    sub_name = SAVE_RESTORE_VERBS.get(r.opcode & 0x1F, f'op{r.opcode & 0x1F}')
+    return f'saveRestoreVerbs.{sub_name}({a},{b},{c})', None
+
+
+def _save_load_vars(r, name):
+    mode = 'saveVars' if r.byte() == 1 else 'loadVars'
+    ops = []
+    while True:
+        sub = r.byte()
+        if sub == 0:
+            break
+        kind = sub & 0x1F
+        if kind == 0x01:
+            ops.append(f'varRange({r.var()},{r.var()})')
+        elif kind == 0x02:
+            r.opcode = sub
+            ops.append(f'stringRange({r.param("B", PARAM_1)},{r.param("B", PARAM_2)})')
+        elif kind == 0x03:
+            ops.append(f'open({r.string()})')
+        elif kind in (0x04, 0x1F):
+            ops.append('close()' if kind == 0x1F else 'end()')
+            break
+        else:
+            raise ScriptDecodeError(f'알 수 없는 saveLoadVars 하위 명령 0x{sub:02X}')
+    return f'{mode}([{",".join(ops)}])', None
+
+
+def _set_var_range(r, name):
+    result = r.var(role=ROLE_RESULT)
+    count = r.byte()
+    values = [r.const(r.word() if r.opcode & PARAM_1 else r.byte()) for _ in range(count)]
+    return f'setVarRange({result},{count},[{",".join(values)}])', None
+
+
+def _delay(r, name):
+    value = r.byte() | (r.byte() << 8) | (r.byte() << 16)
+    return f'delay({value})', None
+
+
+def _delay_variable(r, name):
+    return f'delayVariable({r.var()})', None
+
+
+def _draw_box(r, name):
+    x = r.param('W', PARAM_1)
+    y = r.param('W', PARAM_2)
+    r.opcode = r.byte()
+    x2 = r.param('W', PARAM_1)
+    y2 = r.param('W', PARAM_2)
+    color = r.param('B', PARAM_3)
+    return f'drawBox({x},{y},{x2},{y2},{color})', None
+
+
+def _override(r, name):
+    return ('beginOverride()' if r.byte() else 'endOverride()'), None
+
+
+def _old_room_effect(r, name):
+    r.opcode = r.byte()
+    if r.opcode & 0x1F == 3:
+        return f'oldRoomEffect.set({r.param("W", PARAM_1)})', None
+    return f'oldRoomEffect.op{r.opcode & 0x1F}()', None
+
+
+def _pseudo_room(r, name):
+    value = r.byte()
+    rooms = []
+    while True:
+        room = r.byte()
+        if room == 0:
+            break
+        rooms.append(str(room & 0x7F) if room & 0x80 else str(room))
+    return f'pseudoRoom({value},[{",".join(rooms)}])', None
+
+
+def _expression(r, name):
+    """스택 식 → 중위 표기 (6 = 내장 명령 하나를 실행해서 결과를 push)"""
+    result = r.var(role=ROLE_RESULT)
+    stack = []
+    while True:
+        r.opcode = r.byte()
+        if r.opcode == SUBOP_END:
+            break
+        kind = r.opcode & 0x1F
+        if kind == 1:
+            stack.append(r.param('W', PARAM_1))
+        elif kind in (2, 3, 4, 5):
+            if len(stack) < 2:
+                raise ScriptDecodeError('expression 스택 부족')
+            b = stack.pop()
+            a = stack.pop()
+            stack.append(f'({a} {"+-*/"[kind - 2]} {b})')
+        elif kind == 6:
+            opcode = r.byte()
+            r.opcode = opcode
+            text, _ = OPCODES[opcode](r, OPCODE_NAMES[opcode])
+            stack.append(text.split(' = ', 1)[1] if ' = ' in text else text)
+        else:
+            raise ScriptDecodeError(f'알 수 없는 expression 명령 0x{r.opcode:02X}')
+    if len(stack) != 1:
+        raise ScriptDecodeError('expression 스택 불일치')
+    value = stack[0]
+    if value.startswith('(') and value.endswith(')'):
+        value = value[1:-1]
+    return f'{result} = {value}', None
+
+
+SPECIAL_OPS = {
+    'jumpRelative': _jump,
+    'equalZero': _zero,
+    'notEqualZero': _zero,
+    'ifState': _state,
+    'ifNotState': _state,
+    'isActorInBox': _actor_in_box,
+    'ifClassOfIs': _if_class_of_is,
+    'setClass': _set_class,
+    'increment': _step,
+    'decrement': _step,
+    'startScript': _start_script,
+    'chainScript': _chain_script,
+    'startObject': _start_object,
+    'doSentence': _do_sentence,
+    'actorOps': _actor_ops,
+    'verbOps': _verb_ops,
+    'print': _print,
+    'printEgo': _print_ego,
+    'resourceRoutines': _resource_routines,
+    'cursorCommand': _cursor_command,
+    'roomOps': _room_ops,
+    'stringOps': _string_ops,
+    'wait': _wait,
+    'saveRestoreVerbs': _save_restore_verbs,
+    'saveLoadVars': _save_load_vars,
+    'setVarRange': _set_var_range,
+    'delay': _delay,
+    'delayVariable': _delay_variable,
+    'drawBox': _draw_box,
+    'beginOverride': _override,
+    'oldRoomEffect': _old_room_effect,
+    'pseudoRoom': _pseudo_room,
+    'expression': _expression,
+}
+
+
+def _handler(name):
+    if name in SPECIAL_OPS:
+        return SPECIAL_OPS[name]
+    if name in COMPARISONS:
+        return _compare
+    if name in ARITHMETIC:
+        return _arithmetic
+    return _simple
+
+
+# 디스패치 테이블: opcode byte → 핸들러
+OPCODES = tuple(_handler(name) for name in OPCODE_NAMES)
+
+# 스크립트를 끝내는 명령 (뒤의 bytes는 도달하지 않음)
+TERMINATORS = frozenset({0x00, 0xA0})
+
+
+def decode_instruction(data, pos, ir=None):
+    """offset의 명령 하나 → (Line, 다음 offset) (잘못된 명령이면 ScriptDecodeError)
+
+    ir이 있으면 명령과 피연산자를 기록 (실패한 명령의 피연산자는 지움)
+    """
+    r = _Reader(data, pos, ir)
+    operand_start = len(ir.kinds) if ir is not None else 0
+    try:
+        opcode = r.opcode = r.byte()
+        text, target = OPCODES[opcode](r, OPCODE_NAMES[opcode])
+    except ScriptDecodeError:
+        if ir is not None:
+            ir.truncate_operands(operand_start)
+        raise
+    if ir is not None:
+        ir.add_instruction(pos, opcode, target, operand_start)
+    return Line(pos, opcode, text, target), r.pos
+
+
+def disassemble(data, ir=None):
+    """스크립트 bytes (헤더 없음) → ([Line], 오류 또는 None)
+
+    끝까지 순서대로 디코딩하고, 디코딩할 수 없는 명령을 만나면 그때까지의 줄과 오류를 반환
+    ir: 명령을 함께 기록할 ScriptIR
+    """
+    lines = []
+    pos = 0
+    with span('decode', nbytes=len(data)):
+        while pos < len(data):
+            try:
+                line, pos = decode_instruction(data, pos, ir)
+            except ScriptDecodeError as e:
+                return lines, f'0x{pos:04X}: {e}'
+            lines.append(line)
+    return lines, None
+
+
+def decode_script(data, ir):
+    """스크립트 bytes → ScriptCode (명령은 ir에 추가)"""
+    start = len(ir)
+    _, error = disassemble(data, ir)
+    return ScriptCode(start, len(ir) - start, len(data), error)
+
+
+def format_listing(lines, error=None):
+    """[Line] → descumm 형식 텍스트"""
+    out = [str(line) for line in lines]
+    if error:
+        out.append(f'{ERROR_MARKER}{error}')
+    out.append('END')
+    return '\n'.join(out) + '\n'
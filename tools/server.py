@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+LOOM 리소스 HTTP 서버 (asyncio, server.ts와 같은 경로 + 디코딩된 리소스)
+LFL은 Room별로 한 번만 복호화/파싱하고, 응답 body는 내용 해시 ETag와 함께 메모리 LRU에 보관해
+같은 요청은 다시 디코딩하지 않고 memoryview로 바로 전송
+
+    python3 tools/server.py --port 3000
+
+경로:
+    /room/NN/image               재구성된 배경 (server.ts extractRoomImage와 같은 포맷)
+    /room/NN/background.png      배경 PNG
+    /room/NN/object/OOO.png      오브젝트 PNG
+    /room/NN/script/entry|exit   Room entry/exit 스크립트, /room/NN/script/local/ID 로컬 스크립트
+    /sound/ID[.mid|.ro]          00.LFL 디렉토리의 사운드 (원본 / 표준 MIDI / RO 태그)
+    /sound/ID.wav, .adlib.wav    사운드 미리 듣기 (PC 스피커 구형파 / AdLib 음악 트랙 FM, synth.py)
+    /script/ID, /costume/ID      00.LFL 디렉토리의 글로벌 스크립트/코스튬
+    /NN.LFL                      복호화된 LFL
+    그 외                        정적 파일: tools/의 뷰어 파일 (index.html, dist/) →
+                                 현재 디렉토리의 출력 (out/, pack.py PACK_DIRS, resource_catalog.html) →
+                                 loom_output.zip (tools/pack.py). 목록 밖의 경로와 '.'으로 시작하는 경로는 404
+
+디코딩 중 예외가 나면 연결을 끊지 않고 500을 응답한다.
+
+소켓 없이 테스트할 때는 LoomServer.respond('GET', '/room/01/image')로 Response를 바로 얻을 수 있다.
+"""
+import argparse
+import asyncio
+import io
+import mimetypes
+import re
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from lfl_reader import read_lfl
+from room import parse_room, parse_room_blocks, rebuild_room_image, render_room
+from resource_index import RESOURCE_HEADER_SIZE, load_index
+from extract_indexed_resources import read_block
+from convert_sounds_to_midi import add_ro_tag
+from convert_to_standard_midi import create_standard_midi
+from room_cache import content_key
+from sound_v3 import read_sound
+from synth import render_adlib, render_speaker
+from pack import PACK_DIRS, PACK_PATH, PackReader
+from png_writer import PIL_AVAILABLE, save_indexed_png
+from profiling import span
+
+if PIL_AVAILABLE:
+    from decode_objects_v3 import encode_object_png
+
+
+TOOLS_DIR = Path(__file__).resolve().parent
+
+DEFAULT_PORT = 3000
+CACHE_BYTES = 64 * 1024 * 1024  # 응답 LRU 크기
+ROOM_CACHE_SIZE = 32            # 파싱된 Room LRU 개수
+MAX_HEADER_BYTES = 16 * 1024
+
+# 정적 파일 허용 목록: tools/의 뷰어 파일, LFL 디렉토리의 출력
+VIEWER_FILES = ('index.html',)
+VIEWER_DIRS = ('dist',)
+OUTPUT_FILES = ('resource_catalog.html',)
+OUTPUT_DIRS = ('out',) + PACK_DIRS
+
+CONTENT_TYPES = {
+    '.mid': 'audio/midi',
+    '.ro': 'application/octet-stream',
+    '.wav': 'audio/wav',
+    '.lfl': 'application/octet-stream',
+    '.ts': 'text/plain; charset=utf-8',
+}
+
+STATUS_TEXT = {
+    200: 'OK',
+    304: 'Not Modified',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    500: 'Internal Server Error',
+    501: 'Not Implemented',
+}
+
+
+def content_type(name):
+    suffix = Path(name).suffix.lower()
+    if suffix in CONTENT_TYPES:
+        return CONTENT_TYPES[suffix]
+    guessed, _ = mimetypes.guess_type(name)
+    if guessed and guessed.startswith('text/'):
+        guessed += '; charset=utf-8'
+    return guessed or 'application/octet-stream'
+
+
+class Resource:
+    """캐시되는 응답 body (bytes) + Content-Type + ETag (내용 해시)"""
+
+    __slots__ = ('body', 'content_type', 'etag')
+
+    def __init__(self, body, content_type):
+        self.body = bytes(body)
+        self.content_type = content_type
+        self.etag = f'"{content_key(self.body)}"'
+
+
+class Response:
+    __slots__ = ('status', 'headers', 'body')
+
+    def __init__(self, status, headers=None, body=b''):
+        self.status = status
+        self.headers = headers or {}
+        self.body = memoryview(body)
+
+
+class ByteLRU:
+    """크기(bytes) 기준 LRU"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        item = self._items.get(key)
+        if item is not None:
+            self._items.move_to_end(key)
+        return item
+
+    def put(self, key, resource):
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.nbytes -= len(old.body)
+        self._items[key] = resource
+        self.nbytes += len(resource.body)
+        while self.nbytes > self.max_bytes and len(self._items) > 1:
+            _, evicted = self._items.popitem(last=False)
+            self.nbytes -= len(evicted.body)
+
+
+class LoadedRoom:
+    """복호화 + 파싱된 LFL 하나 (Room 헤더/블록은 처음 접근할 때 파싱)"""
+
+    __slots__ = ('num', 'data', 'room', '_blocks')
+
+    def __init__(self, num, data):
+        self.num = num
+        self.data = data
+        self.room = parse_room(data)
+        self._blocks = None
+
+    @property
+    def blocks(self):
+        if self._blocks is None:
+            self._blocks = parse_room_blocks(self.data) or False
+        return self._blocks or None
+
+
+class LoomResources:
+    """경로 → Resource 디코더 (소켓/이벤트 루프와 무관, 한 스레드에서만 호출)"""
+
+    def __init__(self, lfl_dir='.', static_roots=None, pack_path=PACK_PATH):
+        self.lfl_dir = Path(lfl_dir)
+        # [(루트, 허용 파일, 허용 디렉토리)]
+        self.static_roots = [(Path(root), set(files), set(dirs)) for root, files, dirs in (
+            static_roots or ((TOOLS_DIR, VIEWER_FILES, VIEWER_DIRS),
+                             (self.lfl_dir, OUTPUT_FILES, OUTPUT_DIRS)))]
+        self.pack_path = Path(pack_path) if pack_path else None
+        self._pack = None
+        self._index = None
+        self._rooms = OrderedDict()
+
+        self.routes = [
+            (re.compile(r'/room/(\d{2})/image'), self.room_image),
+            (re.compile(r'/room/(\d{2})/background\.png'), self.room_background),
+            (re.compile(r'/room/(\d{2})/object/(\d+)\.png'), self.room_object),
+            (re.compile(r'/room/(\d{2})/script/(entry|exit)'), self.room_script),
+            (re.compile(r'/room/(\d{2})/script/(local)/(\d+)'), self.room_script),
+            (re.compile(r'/sound/(\d+)\.(adlib\.)?wav'), self.sound_wav),
+            (re.compile(r'/sound/(\d+)(\.mid|\.ro)?'), self.global_sound),
+            (re.compile(r'/(script|costume)/(\d+)'), self.global_resource),
+            (re.compile(r'/(\d{2})\.LFL', re.IGNORECASE), self.lfl),
+        ]
+
+    # --- 캐시된 입력 ----------------------------------------------------------
+
+    def load_room(self, num):
+        """Room 번호 → LoadedRoom 또는 None (LFL은 한 번만 읽고 파싱)"""
+        loaded = self._rooms.get(num)
+        if loaded is not None:
+            self._rooms.move_to_end(num)
+            return loaded
+
+        lfl_path = self.lfl_dir / f'{num:02d}.LFL'
+        if not lfl_path.exists():
+            return None
+        with span('room', room=f'{num:02d}'):
+            loaded = LoadedRoom(num, read_lfl(lfl_path))
+
+        self._rooms[num] = loaded
+        if len(self._rooms) > ROOM_CACHE_SIZE:
+            self._rooms.popitem(last=False)
+        return loaded
+
+    def load_scene(self, num):
+        """Room 경로용: 인덱스의 room 디렉토리에 있는 번호만 (00.LFL 등 인덱스/특수 파일은 None)"""
+        if self.index.locate('room', num) is None:
+            return None
+        return self.load_room(num)
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = load_index(self.lfl_dir)
+        return self._index
+
+    @property
+    def pack(self):
+        if self._pack is None and self.pack_path is not None and self.pack_path.exists():
+            self._pack = PackReader(self.pack_path)
+        return self._pack
+
+    # --- 경로 ---------------------------------------------------------------
+
+    def resolve(self, path):
+        """URL 경로 → Resource 또는 None"""
+        for pattern, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if match:
+                return handler(*match.groups())
+        return self.static(path)
+
+    def room_image(self, num):
+        loaded = self.load_scene(int(num))
+        rebuilt = rebuild_room_image(loaded.data, loaded.room) if loaded else None
+        return Resource(rebuilt[0], 'application/octet-stream') if rebuilt else None
+
+    def room_background(self, num):
+        loaded = self.load_scene(int(num))
+        if loaded is None or not PIL_AVAILABLE:
+            return None
+        frame = render_room(loaded.data, loaded.room)
+        if frame is None:
+            return None
+        png = io.BytesIO()
+        save_indexed_png(frame.buf, frame.width, frame.height, png)
+        return Resource(png.getvalue(), 'image/png')
+
+    def room_object(self, num, obj_id):
+        loaded = self.load_scene(int(num))
+        if loaded is None or not PIL_AVAILABLE or loaded.room.size < 32:
+            return None
+        obj = next((obj for obj in loaded.room.objects if obj.id == int(obj_id)), None)
+        if obj is None or obj.obim_size in (0, 19):
+            return None
+        png, _ = encode_object_png(loaded.data[obj.obim_offset:obj.obim_offset + obj.obim_size])
+        return Resource(png, 'image/png') if png is not None else None
+
+    def room_script(self, num, kind, script_id=None):
+        loaded = self.load_scene(int(num))
+        blocks = loaded.blocks if loaded else None
+        if blocks is None:
+            return None
+        for span_kind, span_id, offset, size in blocks.script_spans():
+            if span_kind == kind and (script_id is None or span_id == int(script_id)):
+                return Resource(loaded.data[offset:offset + size], 'application/octet-stream')
+        return None
+
+    def _global_block(self, res_type, res_id):
+        location = self.index.locate(res_type, int(res_id))
+        if location is None:
+            return None
+        loaded = self.load_room(location[0])
+        if loaded is None:
+            return None
+        offset = location[1]
+        size = read_block(loaded.data, offset, 0)
+        return loaded.data[offset:offset + size] if size else None
+
+    def global_sound(self, res_id, suffix=None):
+        block = self._global_block('sound', res_id)
+        if block is None:
+            return None
+        if suffix == '.mid':
+            # 변환기 입력은 decoded2와 같은 리소스 헤더 뒤 데이터
+            midi = create_standard_midi(block[RESOURCE_HEADER_SIZE:])
+            return Resource(midi, 'audio/midi') if midi is not None else None
+        if suffix == '.ro':
+            return Resource(add_ro_tag(block[RESOURCE_HEADER_SIZE:]), 'application/octet-stream')
+        return Resource(block, 'application/octet-stream')
+
+    def sound_wav(self, res_id, adlib=None):
+        location = self.index.locate('sound', int(res_id))
+        loaded = self.load_room(location[0]) if location else None
+        chunks = read_sound(loaded.data, location[1]) if loaded else None
+        if chunks is None:
+            return None
+        wa, ad = chunks
+        if adlib:
+            wav, _ = render_adlib(ad) if ad is not None else (None, None)
+        else:
+            wav, _ = render_speaker(wa)
+        return Resource(wav, 'audio/wav') if wav is not None else None
+
+    def global_resource(self, res_type, res_id):
+        block = self._global_block(res_type, res_id)
+        return Resource(block, 'application/octet-stream') if block is not None else None
+
+    def lfl(self, num):
+        loaded = self.load_room(int(num))
+        return Resource(loaded.data, 'application/octet-stream') if loaded else None
+
+    def static(self, path):
+        """정적 파일: static_roots 허용 목록 순서대로, 없으면 아카이브"""
+        if path == '/':
+            path = '/index.html'
+        rel = path.lstrip('/')
+        parts = rel.split('/')
+        if not rel or any(not part or part.startswith('.') for part in parts):
+            return None
+
+        for root, files, dirs in self.static_roots:
+            if rel not in files and (len(parts) < 2 or parts[0] not in dirs):
+                continue
+            file_path = root / rel
+            # 심볼릭 링크로 루트 밖을 가리키는 경로 거부
+            try:
+                file_path.resolve().relative_to(root.resolve())
+            except ValueError:
+                continue
+            if file_path.is_file():
+                return Resource(file_path.read_bytes(), content_type(rel))
+
+        if self.pack is not None and rel in self.pack:
+            return Resource(self.pack.read(rel), content_type(rel))
+        return None
+
+    def is_static(self, path):
+        return not any(pattern.fullmatch(path) for pattern, _ in self.routes)
+
+
+class LoomServer:
+    """asyncio HTTP/1.1 서버 (keep-alive, GET/HEAD, ETag/If-None-Match)
+
+    디코딩은 전용 스레드 하나에서 실행하고 (이벤트 루프는 캐시된 응답을 계속 처리),
+    같은 경로를 동시에 요청하면 디코딩 한 번의 결과를 함께 기다린다.
+    """
+
+    def __init__(self, resources=None, cache_bytes=CACHE_BYTES):
+        self.resources = resources or LoomResources()
+        self.cache = ByteLRU(cache_bytes)
+        self._pending = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='loom-decode')
+        self.stats = {'requests': 0, 'hits': 0, 'decoded': 0}
+
+    async def _resource(self, path):
+        # 정적 파일은 디스크에서 바뀔 수 있으므로 캐시하지 않고 매번 읽음
+        if self.resources.is_static(path):
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, self.resources.static, path)
+
+        resource = self.cache.get(path)
+        if resource is not None:
+            self.stats['hits'] += 1
+            return resource
+
+        pending = self._pending.get(path)
+        if pending is None:
+            pending = asyncio.get_running_loop().run_in_executor(
+                self._executor, self.resources.resolve, path)
+            self._pending[path] = pending
+            try:
+                resource = await pending
+            finally:
+                del self._pending[path]
+            self.stats['decoded'] += 1
+            if resource is not None:
+                self.cache.put(path, resource)
+            return resource
+
+        self.stats['hits'] += 1
+        return await asyncio.shield(pending)
+
+    async def respond(self, method, target, headers=None):
+        """요청 하나 → Response (소켓 없이 테스트 가능)"""
+        headers = headers or {}
+        self.stats['requests'] += 1
+
+        if method not in ('GET', 'HEAD'):
+            return Response(405, {'Allow': 'GET, HEAD'})
+
+        path = unquote(urlsplit(target).path)
+        try:
+            resource = await self._resource(path)
+        except Exception:
+            traceback.print_exc()
+            return Response(500, {'Content-Type': 'text/plain; charset=utf-8'}, b'Internal Server Error')
+        if resource is None:
+            return Response(404, {'Content-Type': 'text/plain; charset=utf-8'}, b'Not Found')
+
+        common = {'ETag': resource.etag, 'Cache-Control': 'no-cache'}
+        if headers.get('if-none-match') == resource.etag:
+            return Response(304, common)
+
+        body = resource.body if method == 'GET' else b''
+        return Response(200, {**common, 'Content-Type': resource.content_type,
+                              'Content-Length': str(len(resource.body))}, body)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._send(writer, Response(400), close=True)
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ')
+                except ValueError:
+                    await self._send(writer, Response(400), close=True)
+                    break
+
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(':')
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get('connection', '').lower()
+                close = connection == 'close' or (version == 'HTTP/1.0' and connection != 'keep-alive')
+
+                response = await self.respond(method, target, headers)
+                await self._send(writer, response, close)
+                if close:
+                    break
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _send(writer, response, close=False):
+        headers = dict(response.headers)
+        headers.setdefault('Content-Length', str(len(response.body)))
+        headers['Connection'] = 'close' if close else 'keep-alive'
+        head = f'HTTP/1.1 {response.status} {STATUS_TEXT.get(response.status, "")}\r\n'
+        head += ''.join(f'{name}: {value}\r\n' for name, value in headers.items())
+        writer.write((head + '\r\n').encode('latin-1'))
+        if response.body:
+            writer.write(response.body)  # 캐시된 bytes의 memoryview (복사 없음)
+        await writer.drain()
+
+    async def serve(self, host='127.0.0.1', port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle_connection, host, port,
+                                            limit=MAX_HEADER_BYTES)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LOOM 리소스 HTTP 서버 (asyncio)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--cache-mb', type=int, default=CACHE_BYTES // (1024 * 1024),
+                        help='응답 캐시 크기 (MB)')
+    parser.add_argument('--pack', type=Path, default=PACK_PATH, help='정적 파일 대체 아카이브')
+    args = parser.parse_args()
+
+    server = LoomServer(LoomResources(pack_path=args.pack), args.cache_mb * 1024 * 1024)
+    print(f'🚀 서버 시작: http://{args.host}:{args.port}')
+    print('📁 LFL 파일: ./*.LFL (Room별 한 번만 복호화/파싱)')
+    if not PIL_AVAILABLE:
+        print('⚠️  PIL 없음: PNG 경로는 404')
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == '__main__':
+    main()
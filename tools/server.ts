@@ -121,6 +121,92 @@ function extractRoomImage(roomData: Uint8Array): Uint8Array | null {
   return newData;
 }
 
+/**
+ * 패킹된 출력 (tools/pack.py 무압축 zip)
+ * central directory만 읽어서 이름 → 범위 인덱스를 만들고, 요청한 항목만 slice로 읽음
+ */
+const PACK_PATH = process.env.LOOM_PACK ?? '../loom_output.zip';
+
+const PACK_CONTENT_TYPES: Record<string, string> = {
+  png: 'image/png',
+  mid: 'audio/midi',
+  txt: 'text/plain; charset=utf-8',
+  json: 'application/json',
+};
+
+interface PackEntry {
+  localOffset: number;
+  size: number;
+  dataOffset?: number;
+}
+
+async function loadPackIndex(path: string): Promise<Map<string, PackEntry> | null> {
+  const file = Bun.file(path);
+  if (!(await file.exists())) return null;
+
+  // End of central directory (파일 끝 22 bytes + comment)
+  const tailSize = Math.min(file.size, 22 + 0xFFFF);
+  const tail = new Uint8Array(await file.slice(file.size - tailSize).arrayBuffer());
+  let eocd = -1;
+  for (let i = tail.length - 22; i >= 0; i--) {
+    if (tail[i] === 0x50 && tail[i + 1] === 0x4B && tail[i + 2] === 0x05 && tail[i + 3] === 0x06) {
+      eocd = i;
+      break;
+    }
+  }
+  if (eocd < 0) {
+    console.log(`  ❌ ${path}: zip 아카이브가 아님`);
+    return null;
+  }
+
+  const tailView = new DataView(tail.buffer, tail.byteOffset, tail.byteLength);
+  const count = tailView.getUint16(eocd + 10, true);
+  const cdSize = tailView.getUint32(eocd + 12, true);
+  const cdOffset = tailView.getUint32(eocd + 16, true);
+
+  const cd = new Uint8Array(await file.slice(cdOffset, cdOffset + cdSize).arrayBuffer());
+  const view = new DataView(cd.buffer, cd.byteOffset, cd.byteLength);
+  const decoder = new TextDecoder();
+  const entries = new Map<string, PackEntry>();
+
+  let pos = 0;
+  for (let i = 0; i < count && pos + 46 <= cd.length; i++) {
+    if (view.getUint32(pos, true) !== 0x02014B50) break;
+    const method = view.getUint16(pos + 10, true);
+    const size = view.getUint32(pos + 20, true);
+    const nameLen = view.getUint16(pos + 28, true);
+    const extraLen = view.getUint16(pos + 30, true);
+    const commentLen = view.getUint16(pos + 32, true);
+    const localOffset = view.getUint32(pos + 42, true);
+    const name = decoder.decode(cd.subarray(pos + 46, pos + 46 + nameLen));
+
+    // 무압축 항목만 (pack.py는 ZIP_STORED로만 씀)
+    if (method === 0) {
+      entries.set(name, { localOffset, size });
+    }
+    pos += 46 + nameLen + extraLen + commentLen;
+  }
+  return entries;
+}
+
+const packIndex = await loadPackIndex(PACK_PATH);
+
+async function readPacked(name: string): Promise<Blob | null> {
+  const entry = packIndex?.get(name);
+  if (!entry) return null;
+
+  const file = Bun.file(PACK_PATH);
+  if (entry.dataOffset === undefined) {
+    // local file header (30 bytes + 이름 + extra) 뒤가 데이터
+    const header = new DataView(await file.slice(entry.localOffset, entry.localOffset + 30).arrayBuffer());
+    entry.dataOffset = entry.localOffset + 30 + header.getUint16(26, true) + header.getUint16(28, true);
+  }
+
+  const ext = name.slice(name.lastIndexOf('.') + 1).toLowerCase();
+  const contentType = PACK_CONTENT_TYPES[ext] ?? 'application/octet-stream';
+  return file.slice(entry.dataOffset, entry.dataOffset + entry.size, contentType);
+}
+
 const server = Bun.serve({
   port: 3000,
   async fetch(req) {
@@ -185,6 +271,12 @@ const server = Bun.serve({
       return new Response(outFile);
     }
 
+    // 패킹된 출력에서 찾기 (tools/pack.py)
+    const packed = await readPacked(decodeURIComponent(filePath.slice(1)));
+    if (packed) {
+      return new Response(packed);
+    }
+
     // 404
     return new Response('Not Found', { status: 404 });
   },
@@ -192,4 +284,7 @@ const server = Bun.serve({
 
 console.log(`🚀 서버 시작: http://localhost:${server.port}`);
 console.log(`📁 LFL 파일: ../*.LFL (XOR 복호화 지원)`);
+if (packIndex) {
+  console.log(`📦 패킹된 출력: ${PACK_PATH} (${packIndex.size}개 항목)`);
+}
 console.log(`🎮 브라우저에서 http://localhost:3000 을 열어주세요!`);
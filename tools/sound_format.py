@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+사운드 포맷 판별
+사운드 하나를 한 번 훑어서 (바이트 히스토그램 + RO 이벤트 파싱) 모든 시그니처를 함께 계산하고 포맷을 정한다.
+변환기(.ro / .mid)는 포맷과 관계없이 모든 사운드를 받으므로 (.ro 태그는 ScummVM이 판별, .mid는 RO가 아니면 raw 래핑)
+판별 결과는 통계/표시용이고, 변환기는 RO 파싱 결과(track)만 재사용한다.
+
+    events, signatures = scan_sounds(blocks)
+    signatures[0].format, signatures[0].track
+
+    python3 tools/sound_format.py       # decoded2 사운드 포맷 분포 → analyze/sound_formats.json
+
+포맷:
+    adlib       AdLib 레지스터 명령 0xBD가 앞 20 bytes에 있음
+    pc_speaker  반복이 많은 단순 데이터 (앞 20 bytes의 값 종류 < 5)
+    roland      RO 이벤트 스트림으로 검증되고 이벤트가 하나 이상 (roland.py)
+    midi_like   RO 검증은 실패했지만 MIDI status byte(0x80-0xEF) 밀도가 높음
+    unknown     그 외
+블록 태그(SPK/ADL/ROL)가 있으면 태그가 우선, 그 다음은 위 순서대로 (AdLib/PC 스피커 휴리스틱이 RO보다 먼저)
+"""
+import json
+from collections import Counter
+from pathlib import Path
+
+from profiling import span
+from roland import RolandEvents, parse_roland
+
+
+FORMATS = {
+    'pc_speaker': 'PC Speaker (단순 beep 데이터)',
+    'adlib': 'AdLib (OPL2 FM 합성)',
+    'roland': 'Roland MT-32 (RO 이벤트 스트림)',
+    'midi_like': 'MIDI 비슷한 데이터 (RO 검증 실패)',
+    'unknown': '알 수 없음',
+}
+
+# 블록 태그 → 포맷 (SCUMM v5+ 스타일 헤더)
+TAG_FORMATS = {'SPK': 'pc_speaker', 'ADL': 'adlib', 'ROL': 'roland'}
+
+PREFIX_BYTES = 20
+ADLIB_REGISTER = 0xBD
+PC_SPEAKER_MAX_UNIQUE = 5
+MIDI_STATUS_DENSITY = 0.25
+
+
+class SoundSignature:
+    """사운드 하나의 시그니처 + 판별된 포맷
+
+    - 히스토그램 통계: unique_bytes, null_count, high_bit_count, status_bytes (0x80-0xEF)
+    - 앞부분: tag (SPK/ADL/ROL 또는 None), adlib_marks (0xBD 개수), prefix_unique
+    - RO 파싱: track (RolandTrack, 이벤트는 scan_sounds의 배열)
+    """
+
+    __slots__ = ('size', 'unique_bytes', 'null_count', 'high_bit_count', 'status_bytes',
+                 'tag', 'adlib_marks', 'prefix_unique', 'track', 'format')
+
+    def __init__(self, data, track):
+        histogram = Counter(data)
+        prefix = data[:PREFIX_BYTES]
+
+        self.size = len(data)
+        self.unique_bytes = len(histogram)
+        self.null_count = histogram[0]
+        self.high_bit_count = sum(count for byte, count in histogram.items() if byte >= 0x80)
+        self.status_bytes = sum(count for byte, count in histogram.items() if 0x80 <= byte < 0xF0)
+        # 예전 identify_sound_format과 같은 비교 (앞 4 bytes, ASCII 아닌 byte 무시, 공백 제거)
+        tag = bytes(data[:4]).decode('ascii', errors='ignore').strip()
+        self.tag = tag if tag in TAG_FORMATS else None
+        self.adlib_marks = prefix.count(ADLIB_REGISTER)
+        self.prefix_unique = len(set(prefix))
+        self.track = track
+        self.format = self._classify()
+
+    def _classify(self):
+        if self.tag:
+            return TAG_FORMATS[self.tag]
+        if self.adlib_marks:
+            return 'adlib'
+        if self.size >= 8 and self.prefix_unique < PC_SPEAKER_MAX_UNIQUE:
+            return 'pc_speaker'
+        if not self.track.error and self.track.count:
+            return 'roland'
+        if self.size and self.status_bytes / self.size >= MIDI_STATUS_DENSITY:
+            return 'midi_like'
+        return 'unknown'
+
+    @property
+    def status_density(self):
+        return self.status_bytes / self.size if self.size else 0.0
+
+    def to_dict(self):
+        return {
+            'format': self.format,
+            'size': self.size,
+            'unique_bytes': self.unique_bytes,
+            'null_count': self.null_count,
+            'high_bit_count': self.high_bit_count,
+            'status_density': round(self.status_density, 3),
+            'tag': self.tag,
+            'ro_error': self.track.error,
+            'ro_events': self.track.count,
+            'ro_ticks': self.track.end_tick,
+        }
+
+    def __repr__(self):
+        return f'SoundSignature({self.format}, {self.size} bytes)'
+
+
+def scan_sound(data, events=None):
+    """사운드 하나 → SoundSignature (RO 이벤트는 events에 추가)"""
+    if events is None:
+        events = RolandEvents()
+    return SoundSignature(data, parse_roland(data, events))
+
+
+def scan_sounds(blocks):
+    """여러 사운드 → (RolandEvents 하나, [SoundSignature]) (사운드마다 한 번씩 훑음)"""
+    events = RolandEvents()
+    with span('scan', nbytes=sum(len(data) for data in blocks)):
+        signatures = [scan_sound(data, events) for data in blocks]
+    return events, signatures
+
+
+def find_sound_files(decoded_dir=Path('decoded2')):
+    sound_files = []
+    for room_dir in sorted(decoded_dir.glob('room_*')):
+        sounds_dir = room_dir / 'sounds'
+        if sounds_dir.exists():
+            sound_files.extend(sorted(sounds_dir.glob('*.bin')))
+    return sound_files
+
+
+def main():
+    output_path = Path('analyze/sound_formats.json')
+
+    print('🔍 LOOM 사운드 포맷 판별')
+    print('=' * 70)
+
+    sound_files = find_sound_files()
+    if not sound_files:
+        print('❌ decoded2/ 사운드가 없습니다.')
+        return
+
+    _, signatures = scan_sounds([path.read_bytes() for path in sound_files])
+
+    formats = Counter(signature.format for signature in signatures)
+
+    print(f'\n📊 사운드 {len(signatures)}개')
+    for format_name, count in formats.most_common():
+        print(f'   {format_name:12s} {count:4d}개  {FORMATS[format_name]}')
+
+    output_path.parent.mkdir(exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'formats': dict(formats),
+            'sounds': {path.name: signature.to_dict() for path, signature in zip(sound_files, signatures)},
+        }, f, indent=2, ensure_ascii=False)
+    print(f'\n   결과: {output_path}')
+
+
+if __name__ == '__main__':
+    main()
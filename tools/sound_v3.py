@@ -0,0 +1,398 @@
+"""
+SCUMM v3 (GF_OLD_BUNDLE) 사운드 리소스: WA 청크 (PC 스피커/PCjr 채널 스크립트) + AD 청크 (AdLib)
+ScummVM sound.cpp readSoundResourceSmallHeader / convertADResource, player_v2base.cpp 기준
+
+00.LFL 사운드 디렉토리 offset에 WA 청크가 있고 바로 뒤에 AD 청크가 이어진다 (둘 다 u16 크기, 헤더 포함).
+
+    WA  +0 u16 크기, +2 2 bytes, +4 우선순위, +5 restartable
+        +6  u16 × 4   PC 스피커 채널 스크립트 offset (청크 시작 기준, 0 = 없음)
+        +14 u16 × 4   PCjr 채널 스크립트 offset
+    AD  +0 u16 크기, +2 2 bytes, +4 u16 우선순위
+        +6 0x80이면 음악: 악기 정의 (8 × 16 bytes) 뒤 +0x96부터 MIDI 트랙 이벤트 (delta time,
+           running status, 템포 메타 이벤트, PPQN 480). 아니면 효과음 (AdLib 레지스터 데이터, 해석하지 않음)
+
+PC 스피커 스크립트 (Player_V2Base::execute_cmd): 236 Hz tick마다 채널 4개를 진행하고,
+볼륨과 남은 tick이 있는 가장 낮은 번호 채널의 PIT 분주값이 스피커 음높이 (1193180 / 분주값 Hz)
+
+    F8 xx       hull(엔벨로프) 곡선 선택           F9 xx       주파수 변조 곡선 선택
+    FA          현재 채널 지우기                   FB          서브루틴 복귀
+    FC oooo     서브루틴 호출 (청크 기준 offset)    FD cccc     채널 cccc / 50을 지우고 현재 채널로
+    FE pp oooo  파라미터 pp를 1 줄여서 0이 아니면 상대 offset oooo로 점프 (처음부터 0이면 무한 반복)
+    FF pp vvvv  현재 채널 파라미터 설정 (pp = 채널 구조체 byte offset, 0 = 대기 tick)
+    0ccnnnnn nn     채널 cc 노트 nn (길이 tempo × NOTE_LENGTHS[n], nn bit 7이면 대기, 0x7F = 쉼표)
+    1cc0 xttt tt nn 채널 cc 노트 nn (길이 ttt:tt tick, 대기 없음)
+    1cc1 xttt tt    쉼표 (ttt:tt tick 대기)
+
+hull 곡선과 주파수 변조(비브라토) 테이블은 옮기지 않았다: 노트는 길이 - inter_note_pause 동안
+켜지고, 분주값은 base_freq (+ 매 tick freq_delta)만 쓴다. PCjr 채널은 렌더링하지 않는다.
+무한 반복(카운터 0인 FE)에 닿으면 한 바퀴에서 멈춘다.
+
+    wa, ad = read_sound(lfl, offset)
+    runs, looped = speaker_runs(wa)
+    notes = adlib_notes(ad)
+"""
+import struct
+from array import array
+
+
+CHUNK_HEADER_SIZE = 4
+
+# WA 청크
+SPEAKER_TABLE = 6
+PCJR_TABLE = 14
+CHANNELS = 4
+WA_HEADER_SIZE = PCJR_TABLE + CHANNELS * 2
+
+# AD 청크
+AD_MUSIC = 0x80
+AD_MUSIC_FLAG = 6
+AD_TRACK = 0x96
+AD_PPQN = 480
+AD_DEFAULT_TEMPO = 500000  # µs / 4분음표
+
+SPEAKER_TICK_HZ = 236
+PIT_HZ = 1193180
+MAX_TICKS = SPEAKER_TICK_HZ * 600  # 10분 (반복 카운터가 아주 큰 스크립트 방지)
+MAX_COMMANDS = 10000  # tick 하나에서 실행할 최대 명령 수 (대기 없는 무한 루프 방지)
+
+# 채널 구조체 (u16 × 25, FF/FE의 pp는 byte offset → index pp // 2)
+CHANNEL_SIZE = 50
+TIME_LEFT = 0
+NEXT_CMD = 1
+BASE_FREQ = 2
+FREQ_DELTA = 3
+FREQ = 4
+VOLUME = 5
+VOLUME_DELTA = 6
+TEMPO = 7
+INTER_NOTE_PAUSE = 8
+TRANSPOSE = 9
+NOTE_LENGTH = 10
+HULL_CURVE = 11
+HULL_OFFSET = 12
+HULL_COUNTER = 13
+FREQMOD_TABLE = 14
+FREQMOD_OFFSET = 15
+FREQMOD_INCR = 16
+FREQMOD_MULTIPLIER = 17
+FREQMOD_MODULO = 18
+
+# FA/FD가 지우는 파라미터 (Player_V2Base::clear_channel)
+CLEARED_PARAMS = (NEXT_CMD, BASE_FREQ, FREQ_DELTA, FREQ, VOLUME, VOLUME_DELTA, TRANSPOSE,
+                  HULL_CURVE, HULL_COUNTER, FREQMOD_TABLE, FREQMOD_OFFSET, FREQMOD_INCR,
+                  FREQMOD_MULTIPLIER, FREQMOD_MODULO)
+
+NOTE_LENGTHS = (0, 0, 0, 2, 0, 3, 4, 5, 6, 8, 9, 12, 16, 18, 24, 32, 36, 48, 64, 72, 96)
+SPEAKER_FREQ_TABLE = (36484, 34436, 32503, 30679, 28957, 27332,
+                      25798, 24350, 22983, 21693, 20476, 19326)  # 옥타브 0 C..B 분주값
+REST_NOTE = 0x7F
+NOTE_VOLUME = 0xFFFF  # hull 대신 노트 동안 켜 두는 볼륨
+
+# AdLib MIDI 트랙 채널 메시지 데이터 bytes 수 (상위 nibble)
+MIDI_DATA_LENGTHS = {0x8: 2, 0x9: 2, 0xA: 2, 0xB: 2, 0xC: 1, 0xD: 1, 0xE: 2}
+META_EVENT = 0xFF
+META_TEMPO = 0x51
+META_END_OF_TRACK = 0x2F
+SYSEX_EVENTS = (0xF0, 0xF7)
+VOLUME_CONTROLLER = 7
+DEFAULT_CHANNEL_VOLUME = 127
+
+
+def read_sound(data, offset):
+    """LFL 데이터 (bytes/LFLFile) + 디렉토리 offset → (WA 청크, AD 청크 또는 None), WA가 없으면 None"""
+    if offset + CHUNK_HEADER_SIZE > len(data):
+        return None
+    wa_size = data[offset] | (data[offset + 1] << 8)
+    if wa_size < WA_HEADER_SIZE or offset + wa_size > len(data):
+        return None
+    wa = bytes(data[offset:offset + wa_size])
+
+    ad = None
+    ad_offset = offset + wa_size
+    if ad_offset + CHUNK_HEADER_SIZE <= len(data):
+        ad_size = data[ad_offset] | (data[ad_offset + 1] << 8)
+        if ad_size > CHUNK_HEADER_SIZE and ad_offset + ad_size <= len(data):
+            ad = bytes(data[ad_offset:ad_offset + ad_size])
+    return wa, ad
+
+
+# ---------------------------------------------------------------------------
+# WA: PC 스피커 채널 스크립트
+# ---------------------------------------------------------------------------
+
+class SpeakerPlayer:
+    """WA 청크의 PC 스피커 채널 4개를 tick 단위로 진행 (Player_V2Base nextTick/execute_cmd)"""
+
+    def __init__(self, wa):
+        self.data = wa
+        self.looped = False
+        self.channels = [array('H', bytes(CHANNEL_SIZE)) for _ in range(CHANNELS)]
+        offsets = struct.unpack_from(f'<{CHANNELS}H', wa, SPEAKER_TABLE)
+        for channel, offset in zip(self.channels, offsets):
+            if offset:
+                channel[NEXT_CMD] = offset
+                channel[TIME_LEFT] = 1
+
+    @property
+    def playing(self):
+        return any(channel[TIME_LEFT] for channel in self.channels)
+
+    def tick(self):
+        for channel in self.channels:
+            if not channel[TIME_LEFT]:
+                continue
+            channel[VOLUME] = (channel[VOLUME] + channel[VOLUME_DELTA]) & 0xFFFF
+            channel[BASE_FREQ] = (channel[BASE_FREQ] + channel[FREQ_DELTA]) & 0xFFFF
+            channel[FREQ] = channel[BASE_FREQ]
+
+            if channel[NOTE_LENGTH]:
+                channel[NOTE_LENGTH] -= 1
+                if not channel[NOTE_LENGTH]:
+                    channel[VOLUME] = 0
+                    channel[VOLUME_DELTA] = 0
+
+            channel[TIME_LEFT] -= 1
+            if not channel[TIME_LEFT]:
+                self.execute(channel)
+
+    def divisor(self):
+        """지금 스피커에 나가는 PIT 분주값 (0 = 무음)"""
+        for channel in self.channels:
+            if channel[VOLUME] and channel[TIME_LEFT]:
+                return channel[FREQ]
+        return 0
+
+    def start_note(self, dest, note, length):
+        note += dest[TRANSPOSE] - 0x10000 if dest[TRANSPOSE] & 0x8000 else dest[TRANSPOSE]
+        while note < 0:
+            note += 12
+        octave, note = divmod(note, 12)
+        dest[BASE_FREQ] = dest[FREQ] = SPEAKER_FREQ_TABLE[note] >> octave
+        dest[TIME_LEFT] = length
+        dest[NOTE_LENGTH] = max(length - dest[INTER_NOTE_PAUSE], 1)
+        dest[VOLUME] = NOTE_VOLUME
+        dest[VOLUME_DELTA] = 0
+
+    def execute(self, channel):
+        """채널 스크립트를 대기 명령까지 실행 (대기 tick이 0이면 채널 끝)"""
+        data = self.data
+        pos = channel[NEXT_CMD]
+        current = channel
+        return_pos = None
+
+        for _ in range(MAX_COMMANDS if pos else 0):
+            if pos >= len(data):
+                raise ValueError(f'0x{pos:04X}: 스크립트가 청크 끝을 넘음')
+            opcode = data[pos]
+            pos += 1
+
+            if opcode >= 0xF8:
+                if opcode == 0xF8:
+                    current[HULL_CURVE] = data[pos]
+                    pos += 1
+                elif opcode == 0xF9:
+                    current[FREQMOD_TABLE] = data[pos]
+                    pos += 1
+                elif opcode in (0xFA, 0xFD):
+                    if opcode == 0xFD:
+                        index = struct.unpack_from('<H', data, pos)[0] // CHANNEL_SIZE
+                        if index >= CHANNELS:
+                            raise ValueError(f'0x{pos:04X}: 채널 번호 {index}')
+                        current = self.channels[index]
+                        pos += 2
+                    for param in CLEARED_PARAMS:
+                        current[param] = 0
+                elif opcode == 0xFB:
+                    if return_pos is None:
+                        raise ValueError(f'0x{pos - 1:04X}: 호출 없는 복귀')
+                    pos, return_pos = return_pos, None
+                elif opcode == 0xFC:
+                    return_pos = pos + 2
+                    pos = struct.unpack_from('<H', data, pos)[0]
+                elif opcode == 0xFE:
+                    param = data[pos] // 2
+                    jump = struct.unpack_from('<h', data, pos + 1)[0]
+                    pos += 3
+                    if not current[param]:
+                        # 무한 반복: 오프라인 렌더링은 여기서 끝
+                        self.looped = True
+                        channel[TIME_LEFT] = 0
+                        break
+                    else:
+                        current[param] -= 1
+                        if current[param]:
+                            pos += jump
+                else:
+                    param = data[pos] // 2
+                    current[param] = struct.unpack_from('<H', data, pos + 1)[0]
+                    pos += 3
+                    if param == TIME_LEFT:
+                        break
+                continue
+
+            if not opcode & 0x80:
+                index = opcode & 0x1F
+                if index >= len(NOTE_LENGTHS):
+                    raise ValueError(f'0x{pos - 1:04X}: 노트 길이 번호 {index}')
+                length = max(channel[TEMPO], 1) * NOTE_LENGTHS[index]
+                note = data[pos]
+                pos += 1
+                wait = note & 0x80
+                note &= 0x7F
+                channel[TIME_LEFT] = length
+                if note == REST_NOTE:
+                    break
+            else:
+                length = ((opcode & 0x07) << 8) | data[pos]
+                pos += 1
+                channel[TIME_LEFT] = length
+                if opcode & 0x10:
+                    break
+                wait = 0
+                note = data[pos] & 0x7F
+                pos += 1
+
+            self.start_note(self.channels[(opcode >> 5) & 0x03], note, length)
+            if wait:
+                break
+        else:
+            channel[TIME_LEFT] = 0
+
+        channel[NEXT_CMD] = pos if channel[TIME_LEFT] else 0
+
+
+def speaker_runs(wa, max_ticks=MAX_TICKS):
+    """WA 청크 → ([[tick 수, PIT 분주값 또는 0]], 무한 반복에서 멈췄는지)
+
+    모든 채널의 스크립트가 끝나거나, 무한 반복에 닿거나, max_ticks가 되면 멈춘다
+    """
+    if len(wa) < WA_HEADER_SIZE:
+        raise ValueError('WA 헤더보다 짧음')
+    player = SpeakerPlayer(wa)
+    runs = []
+    ticks = 0
+    while player.playing and not player.looped and ticks < max_ticks:
+        try:
+            player.tick()
+        except (IndexError, struct.error):
+            raise ValueError(f'tick {ticks}: 스크립트 명령이 청크 끝에서 잘림') from None
+        divisor = player.divisor()
+        if runs and runs[-1][1] == divisor:
+            runs[-1][0] += 1
+        else:
+            runs.append([1, divisor])
+        ticks += 1
+    return runs, player.looped
+
+
+# ---------------------------------------------------------------------------
+# AD: AdLib 음악 트랙
+# ---------------------------------------------------------------------------
+
+class AdlibNote:
+    """AdLib 음악 노트 하나 (초 단위)"""
+
+    __slots__ = ('start', 'end', 'channel', 'note', 'velocity', 'volume')
+
+    def __init__(self, start, end, channel, note, velocity, volume):
+        self.start = start
+        self.end = end
+        self.channel = channel
+        self.note = note
+        self.velocity = velocity
+        self.volume = volume
+
+    def __repr__(self):
+        return f'AdlibNote({self.start:.3f}-{self.end:.3f}s, ch={self.channel}, note={self.note})'
+
+
+def is_adlib_music(ad):
+    return ad is not None and len(ad) > AD_TRACK and ad[AD_MUSIC_FLAG] == AD_MUSIC
+
+
+def _read_vlq(data, pos):
+    value = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError(f'0x{pos:04X}: delta time 잘림')
+        byte = data[pos]
+        pos += 1
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value, pos
+
+
+def adlib_notes(ad):
+    """AD 음악 청크 → ([AdlibNote] 시작 순, 길이 초), 효과음이면 None
+
+    note on/off를 짝짓고 (같은 채널/음은 먼저 시작한 것부터), 끝나지 않은 음은 트랙 끝에서 끝낸다
+    """
+    if not is_adlib_music(ad):
+        return None
+
+    pos = AD_TRACK
+    seconds = 0.0
+    tempo = AD_DEFAULT_TEMPO
+    running = None
+    volumes = [DEFAULT_CHANNEL_VOLUME] * 16
+    sounding = {}
+    notes = []
+
+    while True:
+        delta, pos = _read_vlq(ad, pos)
+        seconds += delta * tempo / 1_000_000 / AD_PPQN
+        if pos >= len(ad):
+            raise ValueError('트랙 끝(FF 2F) 없음')
+        status = ad[pos]
+
+        if status == META_EVENT:
+            if pos + 2 >= len(ad):
+                raise ValueError(f'0x{pos:04X}: 메타 이벤트 잘림')
+            meta_type = ad[pos + 1]
+            length, pos = _read_vlq(ad, pos + 2)
+            if meta_type == META_TEMPO and length == 3:
+                tempo = int.from_bytes(ad[pos:pos + 3], 'big') or AD_DEFAULT_TEMPO
+            pos += length
+            running = None
+            if meta_type == META_END_OF_TRACK:
+                break
+            continue
+
+        if status in SYSEX_EVENTS:
+            length, pos = _read_vlq(ad, pos + 1)
+            pos += length
+            running = None
+            continue
+
+        if status & 0x80:
+            running = status
+            pos += 1
+        elif running is None:
+            raise ValueError(f'0x{pos:04X}: status 없는 데이터 0x{status:02X}')
+        if running >> 4 not in MIDI_DATA_LENGTHS:
+            raise ValueError(f'0x{pos:04X}: 알 수 없는 status 0x{running:02X}')
+
+        length = MIDI_DATA_LENGTHS[running >> 4]
+        if pos + length > len(ad):
+            raise ValueError(f'0x{pos:04X}: 이벤트 잘림')
+        command, channel = running >> 4, running & 0x0F
+        data1 = ad[pos]
+        data2 = ad[pos + 1] if length == 2 else 0
+        pos += length
+
+        if command == 0xB and data1 == VOLUME_CONTROLLER:
+            volumes[channel] = data2
+        elif command == 0x9 and data2:
+            sounding.setdefault((channel, data1), []).append((seconds, data2, volumes[channel]))
+        elif command in (0x8, 0x9):
+            started = sounding.get((channel, data1))
+            if started:
+                start, velocity, volume = started.pop(0)
+                notes.append(AdlibNote(start, seconds, channel, data1, velocity, volume))
+
+    for (channel, note), started in sounding.items():
+        for start, velocity, volume in started:
+            notes.append(AdlibNote(start, seconds, channel, note, velocity, volume))
+
+    notes.sort(key=lambda note: (note.start, note.channel, note.note))
+    return notes, seconds
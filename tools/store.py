@@ -0,0 +1,295 @@
+"""
+내용 주소 출력 저장소 (.loom_cache/store/)
+출력 파일 내용을 해시로 한 번만 저장하고 출력 경로에는 복사 (쓰기 가능한 일반 파일)
+LOOM_STORE_HARDLINK=1이면 복사 대신 hard link (디스크 절약, 출력이 읽기 전용 저장소 객체를 공유하므로
+출력을 제자리에서 수정하면 안 됨 - git이 추적하는 출력 디렉토리에는 쓰지 말 것)
+Room별 매니페스트(출력 경로 → 해시)가 저장소 객체를 참조하고,
+변환 결과(.ro/.mid/PNG)는 입력 해시 + 변환기 버전으로 캐시해서 같은 내용은 한 번만 변환
+
+    outputs = RoomOutputs('decoded2', '01', base=Path('decoded2'))
+    outputs.write(Path('decoded2/room_01/sounds/01_res007.bin'), data)
+    outputs.save()
+
+    digest, meta = default_store().derive('mid', CONVERTER_VERSION, data, convert)
+
+저장소 위치: LOOM_CACHE_DIR (기본 .loom_cache) / store
+"""
+import hashlib
+import json
+import os
+import shutil
+import stat
+from pathlib import Path
+
+from room_cache import CACHE_ROOT, content_key
+from profiling import span
+
+
+STORE_DIR = CACHE_ROOT / 'store'
+
+# 출력 경로를 hard link로 연결할지 (기본은 복사)
+HARDLINK = os.environ.get('LOOM_STORE_HARDLINK', '') not in ('', '0')
+
+
+def content_hash(data):
+    """출력 내용 해시 (저장소 키)"""
+    return content_key(data)
+
+
+def source_version(*paths):
+    """변환기 소스 파일 해시 → derive 버전 (소스가 바뀌면 캐시 무효)"""
+    h = hashlib.blake2b(digest_size=8)
+    for path in paths:
+        h.update(Path(path).read_bytes())
+    return h.hexdigest()
+
+
+def _atomic_write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+class ContentStore:
+    """해시 → 내용 객체 저장소
+
+    객체는 읽기 전용으로 저장 (hardlink=True일 때 출력 파일을 제자리에서 수정하면 다른 출력까지 바뀌므로).
+    출력 경로는 기본적으로 복사본(쓰기 가능, mtime은 객체와 같게)이고, 항상 임시 파일 + os.replace로 교체한다.
+    """
+
+    def __init__(self, root=STORE_DIR, hardlink=HARDLINK):
+        self.root = Path(root)
+        self.hardlink = hardlink
+        self.objects_dir = self.root / 'objects'
+        self.derived_dir = self.root / 'derived'
+        self.manifests_dir = self.root / 'manifests'
+
+    # --- 객체 ---------------------------------------------------------------
+
+    def object_path(self, digest):
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def has(self, digest):
+        return self.object_path(digest).exists()
+
+    def put(self, data):
+        """내용 저장 → 해시 (이미 있으면 쓰지 않음)"""
+        digest = content_hash(data)
+        path = self.object_path(digest)
+        if not path.exists():
+            _atomic_write(path, data)
+            path.chmod(stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        return digest
+
+    def get(self, digest):
+        return self.object_path(digest).read_bytes()
+
+    def materialize(self, digest, dest):
+        """저장소 객체 → 출력 경로 (복사, hardlink=True면 hard link - 다른 파일시스템이면 복사)
+
+        복사본은 쓰기 가능한 새 파일이고 mtime을 객체와 맞춘다 (is_materialized로 수정 여부 확인).
+        예전 hard link 출력도 복사 모드에서는 복사본으로 바뀐다.
+        """
+        dest = Path(dest)
+        src = self.object_path(digest)
+        if self.hardlink:
+            try:
+                if os.path.samefile(src, dest):
+                    return
+            except OSError:
+                pass
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = dest.with_name(f'.{dest.name}.{os.getpid()}.tmp')
+        try:
+            if not self.hardlink:
+                raise OSError
+            os.link(src, tmp_path)
+        except OSError:
+            shutil.copyfile(src, tmp_path)
+            st = src.stat()
+            os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp_path, dest)
+
+    def is_materialized(self, digest, path):
+        """출력 파일이 저장소 객체 그대로인지 (hard link이거나, 크기와 mtime이 같은 복사본) - 내용은 읽지 않음"""
+        src = self.object_path(digest)
+        try:
+            if os.path.samefile(src, path):
+                return True
+            src_stat, path_stat = src.stat(), Path(path).stat()
+        except OSError:
+            return False
+        return src_stat.st_size == path_stat.st_size and src_stat.st_mtime_ns == path_stat.st_mtime_ns
+
+    def write(self, dest, data):
+        """내용 저장 + 출력 경로에 연결 → 해시"""
+        with span('write', nbytes=len(data)):
+            digest = self.put(data)
+            self.materialize(digest, dest)
+        return digest
+
+    # --- 변환 캐시 ------------------------------------------------------------
+
+    def derive(self, kind, version, data, convert):
+        """convert(data) → (출력 bytes 또는 None, 메타데이터) 결과를 입력 해시로 캐시
+
+        → (출력 해시 또는 None, 메타데이터). 같은 입력은 Room/실행이 달라도 한 번만 변환한다.
+        """
+        entry_path = self.derived_dir / kind / f'{version}-{content_hash(data)}.json'
+        if entry_path.exists():
+            entry = json.loads(entry_path.read_text())
+            if entry['digest'] is None or self.has(entry['digest']):
+                return entry['digest'], entry['meta']
+
+        output, meta = convert(data)
+        digest = self.put(output) if output is not None else None
+        _atomic_write(entry_path, json.dumps({'digest': digest, 'meta': meta}).encode('utf-8'))
+        return digest, meta
+
+    # --- Room 매니페스트 -----------------------------------------------------
+
+    def manifest_path(self, name, room):
+        return self.manifests_dir / name / f'room_{room}.json'
+
+    def load_manifest(self, name, room):
+        """{'base': 출력 디렉토리, 'files': {상대 경로: [해시, 크기]}} 또는 None"""
+        path = self.manifest_path(name, room)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def save_manifest(self, name, room, base, files):
+        manifest = {'base': str(base), 'files': files}
+        _atomic_write(self.manifest_path(name, room),
+                      json.dumps(manifest, indent=1, sort_keys=True).encode('utf-8'))
+
+    def manifests(self):
+        """→ [(이름, Room, 매니페스트)]"""
+        result = []
+        for path in sorted(self.manifests_dir.glob('*/room_*.json')):
+            result.append((path.parent.name, path.stem[len('room_'):], json.loads(path.read_text())))
+        return result
+
+    # --- 관리 -----------------------------------------------------------------
+
+    def iter_objects(self):
+        if not self.objects_dir.exists():
+            return
+        for path in self.objects_dir.glob('*/*'):
+            if not path.name.startswith('.'):
+                yield path.parent.name + path.name, path
+
+    def gc(self):
+        """매니페스트가 참조하지 않는 객체 삭제 → (삭제 수, bytes)"""
+        referenced = set()
+        for _, _, manifest in self.manifests():
+            referenced.update(digest for digest, _ in manifest['files'].values())
+
+        removed = 0
+        freed = 0
+        for digest, path in list(self.iter_objects()):
+            if digest not in referenced:
+                freed += path.stat().st_size
+                path.chmod(stat.S_IWUSR | stat.S_IRUSR)
+                path.unlink()
+                removed += 1
+        return removed, freed
+
+
+_default_store = None
+
+
+def default_store():
+    global _default_store
+    if _default_store is None:
+        _default_store = ContentStore()
+    return _default_store
+
+
+class RoomOutputs:
+    """도구 하나 × Room 하나의 출력 (저장소에 쓰고 매니페스트 기록)"""
+
+    def __init__(self, name, room, base, store=None):
+        self.name = name
+        self.room = room
+        self.base = Path(base)
+        self.store = store or default_store()
+        self.files = {}
+
+    def _key(self, dest):
+        return Path(dest).relative_to(self.base).as_posix()
+
+    def write(self, dest, data):
+        digest = self.store.write(dest, data)
+        self.files[self._key(dest)] = [digest, len(data)]
+        return digest
+
+    def link(self, dest, digest, size=None):
+        """이미 저장소에 있는 객체를 출력 경로에 연결 (읽기/해시 없음)"""
+        if size is None:
+            size = self.store.object_path(digest).stat().st_size
+        with span('write', nbytes=size):
+            self.store.materialize(digest, dest)
+        self.files[self._key(dest)] = [digest, size]
+
+    def save(self):
+        self.store.save_manifest(self.name, self.room, self.base, self.files)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='내용 주소 출력 저장소 통계/정리/복원')
+    parser.add_argument('--gc', action='store_true', help='매니페스트가 참조하지 않는 객체 삭제')
+    parser.add_argument('--restore', metavar='NAME', help='이 도구의 출력을 매니페스트에서 다시 생성 (예: decoded2)')
+    args = parser.parse_args()
+
+    store = default_store()
+    print(f'🗄️  LOOM 출력 저장소: {store.root}')
+    print('=' * 70)
+
+    if args.gc:
+        removed, freed = store.gc()
+        print(f'🧹 미참조 객체 {removed}개 삭제 ({freed:,} bytes)')
+
+    if args.restore:
+        restored = 0
+        for name, _, manifest in store.manifests():
+            if name != args.restore:
+                continue
+            base = Path(manifest['base'])
+            for rel_path, (digest, _) in manifest['files'].items():
+                store.materialize(digest, base / rel_path)
+                restored += 1
+        print(f'♻️  {args.restore}: {restored}개 파일 복원')
+
+    # 통계: 출력 파일 수/크기 vs 실제 저장된 객체
+    by_name = {}
+    referenced = {}
+    for name, _, manifest in store.manifests():
+        files, size = by_name.get(name, (0, 0))
+        for digest, file_size in manifest['files'].values():
+            files += 1
+            size += file_size
+            referenced[digest] = file_size
+        by_name[name] = (files, size)
+
+    for name, (files, size) in sorted(by_name.items()):
+        print(f'   {name:24s} {files:6,}개 {size:12,} bytes')
+
+    objects = list(store.iter_objects())
+    stored = sum(path.stat().st_size for _, path in objects)
+    total_files = sum(files for files, _ in by_name.values())
+    total_size = sum(size for _, size in by_name.values())
+    print('   ' + '-' * 50)
+    print(f'   출력 파일: {total_files:,}개, {total_size:,} bytes')
+    print(f'   저장 객체: {len(objects):,}개, {stored:,} bytes (참조 {len(referenced):,}개)')
+    if total_size:
+        print(f'   중복 제거: {total_size - sum(referenced.values()):,} bytes '
+              f'({(total_size - sum(referenced.values())) * 100 / total_size:.1f}%)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""
+오프라인 소프트웨어 신디사이저: SCUMM v3 사운드 (sound_v3.py) → 16-bit mono PCM → WAV
+ScummVM/MT-32 에뮬레이터 없이 미리 듣기용으로 렌더링
+
+음색:
+    square  PC 스피커: WA 청크 스크립트의 분주값 구간을 위상이 이어지는 구형파로 (단음)
+    sine    AdLib: AD 음악 트랙 노트를 사인파로 (다성, 어택/디케이/릴리즈 엔벨로프)
+    fm      AdLib: 2-operator FM (변조 지수가 시간에 따라 감소)
+
+AD 청크의 악기 정의(OPL 레지스터)는 해석하지 않고 모든 채널에 같은 음색을 쓴다.
+velocity와 채널 볼륨(CC 7)만 반영한다.
+노트 하나씩 wavetable에서 블록 단위로 샘플을 만들고 믹스 버퍼에 더한다 (NumPy 없이 map/slice 연산).
+
+    wav, meta = render_speaker(wa)
+    wav, meta = render_adlib(ad, voice='fm')
+"""
+import io
+import math
+import sys
+import wave
+from array import array
+from operator import add, mul
+
+from sound_v3 import PIT_HZ, SPEAKER_TICK_HZ, adlib_notes, speaker_runs
+
+
+SAMPLE_RATE = 22050
+ADLIB_VOICES = ('sine', 'fm')
+DEFAULT_VOICE = 'fm'
+
+TABLE_BITS = 12
+TABLE_SIZE = 1 << TABLE_BITS
+TABLE_MASK = TABLE_SIZE - 1
+SINE_TABLE = [math.sin(2 * math.pi * i / TABLE_SIZE) for i in range(TABLE_SIZE)]
+
+MASTER_GAIN = 0.2
+SQUARE_AMPLITUDE = 6000
+
+ATTACK_SECONDS = 0.005
+DECAY_SECONDS = 0.08
+SUSTAIN_LEVEL = 0.6
+RELEASE_SECONDS = 0.05
+
+FM_RATIO = 2       # 모듈레이터 주파수 = 캐리어 × FM_RATIO
+FM_INDEX = 2.0     # 시작 변조 지수 (라디안)
+FM_INDEX_DECAY = 0.15  # 변조 지수가 1/e로 줄어드는 시간 (초)
+
+# 오류가 아니라 렌더링할 것이 없는 경우 (render_sounds_wav에서 건너뜀으로 셈)
+SILENT = '무음'
+ADLIB_SFX = 'AdLib 효과음 (음악 트랙 아님)'
+SKIPPED_ERRORS = (SILENT, ADLIB_SFX)
+
+
+def note_frequency(note):
+    return 440.0 * 2 ** ((note - 69) / 12)
+
+
+# ---------------------------------------------------------------------------
+# PC 스피커
+# ---------------------------------------------------------------------------
+
+def speaker_pcm(runs, rate=SAMPLE_RATE):
+    """[[tick 수, PIT 분주값]] → 16-bit mono PCM (array('h'))
+
+    분주값 0이나 나이퀴스트 주파수 이상은 무음
+    """
+    pcm = array('h')
+    samples_per_tick = rate / SPEAKER_TICK_HZ
+    tick = 0
+    phase = 0.0
+
+    for ticks, divisor in runs:
+        start = len(pcm)
+        tick += ticks
+        length = round(tick * samples_per_tick) - start
+        frequency = PIT_HZ / divisor if divisor else 0
+        if not frequency or frequency >= rate / 2:
+            pcm.frombytes(bytes(length * pcm.itemsize))
+            continue
+
+        step = frequency / rate
+        amplitude = SQUARE_AMPLITUDE
+        pcm.extend(amplitude if (phase + i * step) % 1.0 < 0.5 else -amplitude for i in range(length))
+        phase = (phase + length * step) % 1.0
+
+    return pcm
+
+
+# ---------------------------------------------------------------------------
+# AdLib
+# ---------------------------------------------------------------------------
+
+def _envelope(length, sustain_length, rate):
+    """어택 → 디케이 → 서스테인 (sustain_length까지) → 릴리즈, 전체 length 샘플"""
+    attack = max(1, int(ATTACK_SECONDS * rate))
+    decay = max(1, int(DECAY_SECONDS * rate))
+    release = length - sustain_length
+
+    env = [i / attack for i in range(attack)]
+    env += [1.0 - (1.0 - SUSTAIN_LEVEL) * i / decay for i in range(decay)]
+    env += [SUSTAIN_LEVEL] * max(0, sustain_length - len(env))
+    env = env[:sustain_length]
+    level = env[-1] if env else 0.0
+    env += [level * (1.0 - i / release) for i in range(release)]
+    return env
+
+
+def _sine_block(frequency, length, rate):
+    step = frequency * TABLE_SIZE / rate
+    table = SINE_TABLE
+    return [table[int(i * step) & TABLE_MASK] for i in range(length)]
+
+
+# 샘플 레이트별 변조 지수 곡선 (가장 긴 노트까지 늘려서 재사용)
+_fm_index = {}
+
+def fm_index_curve(length, rate):
+    """I(t) = FM_INDEX · e^(-t/FM_INDEX_DECAY) (wavetable 단위), length 샘플 이상"""
+    curve = _fm_index.setdefault(rate, [])
+    if len(curve) < length:
+        scale = FM_INDEX * TABLE_SIZE / (2 * math.pi)
+        decay = math.exp(-1.0 / (FM_INDEX_DECAY * rate))
+        curve.extend(scale * decay ** i for i in range(len(curve), length))
+    return curve
+
+
+def _fm_block(frequency, length, rate):
+    """캐리어 sin(wt + I(t)·sin(r·wt))"""
+    step = frequency * TABLE_SIZE / rate
+    mod_step = step * FM_RATIO
+    table = SINE_TABLE
+    index = fm_index_curve(length, rate)
+    return [table[(int(i * step) + int(index[i] * table[int(i * mod_step) & TABLE_MASK])) & TABLE_MASK]
+            for i in range(length)]
+
+
+def adlib_pcm(notes, seconds, voice=DEFAULT_VOICE, rate=SAMPLE_RATE):
+    """[AdlibNote] → 16-bit mono PCM (array('h'))"""
+    if voice not in ADLIB_VOICES:
+        raise ValueError(f'알 수 없는 음색: {voice}')
+
+    release = int(RELEASE_SECONDS * rate)
+    total = round(seconds * rate) + release
+    mix = [0.0] * total
+    block_func = _fm_block if voice == 'fm' else _sine_block
+
+    for note in notes:
+        start = round(note.start * rate)
+        sustain = round(note.end * rate) - start
+        if sustain <= 0:
+            continue
+
+        length = sustain + release
+        gain = MASTER_GAIN * note.velocity / 127 * note.volume / 127
+        block = map(mul, block_func(note_frequency(note.note), length, rate), _envelope(length, sustain, rate))
+        block = [sample * gain for sample in block]
+
+        end = min(total, start + len(block))
+        mix[start:end] = map(add, mix[start:end], block)
+
+    return array('h', (int(max(-1.0, min(1.0, sample)) * 32767) for sample in mix))
+
+
+# ---------------------------------------------------------------------------
+# WAV
+# ---------------------------------------------------------------------------
+
+def encode_wav(pcm, rate=SAMPLE_RATE):
+    """16-bit mono PCM → WAV bytes"""
+    if sys.byteorder == 'big':
+        pcm = array('h', pcm)
+        pcm.byteswap()
+    out = io.BytesIO()
+    with wave.open(out, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(pcm.tobytes())
+    return out.getvalue()
+
+
+def render_speaker(wa, rate=SAMPLE_RATE):
+    """WA 청크 → (WAV bytes 또는 None, 메타데이터), 스크립트 오류나 무음이면 None"""
+    try:
+        runs, looped = speaker_runs(wa)
+    except ValueError as e:
+        return None, {'error': str(e)}
+    if not any(divisor for _, divisor in runs):
+        return None, {'error': SILENT}
+
+    pcm = speaker_pcm(runs, rate)
+    return encode_wav(pcm, rate), {
+        'voice': 'square',
+        'seconds': round(len(pcm) / rate, 3),
+        'looped': looped,
+    }
+
+
+def render_adlib(ad, voice=DEFAULT_VOICE, rate=SAMPLE_RATE):
+    """AD 청크 → (WAV bytes 또는 None, 메타데이터), 효과음/트랙 오류/무음이면 None"""
+    try:
+        parsed = adlib_notes(ad)
+    except ValueError as e:
+        return None, {'error': str(e)}
+    if parsed is None:
+        return None, {'error': ADLIB_SFX}
+    notes, seconds = parsed
+    if not notes:
+        return None, {'error': SILENT}
+
+    pcm = adlib_pcm(notes, seconds, voice, rate)
+    return encode_wav(pcm, rate), {
+        'voice': voice,
+        'seconds': round(len(pcm) / rate, 3),
+        'notes': len(notes),
+    }